@@ -1,5 +1,9 @@
 import globalPluginHandler
 import logging
+import os
+import sys
+import time
+from contextlib import contextmanager
 import addonHandler
 
 addonHandler.initTranslation()
@@ -13,20 +17,53 @@ except ImportError:
     NVDA_AVAILABLE = False
 
 from .updateChecker import UpdateChecker, CURRENT_VERSION, show_update_dialog
+from . import foregroundTracker
+from . import instrumentation
 
 log = logging.getLogger(__name__)
 
+# Percent added or removed by the foreground volume gestures
+FOREGROUND_VOLUME_STEP = 5
+# Seconds the foreground fade gesture takes to fade out or back in
+FOREGROUND_FADE_DURATION = 2.0
+
+
+def _ensureLibPath():
+    lib_path = os.path.join(os.path.dirname(__file__), 'lib')
+    if os.path.exists(lib_path) and lib_path not in sys.path:
+        sys.path.insert(0, lib_path)
+
+
 class GlobalPlugin(globalPluginHandler.GlobalPlugin):
     scriptCategory = _("Audio Volume Control")
     
     __gestures__ = {
-        "kb:control+NVDA+y": "showVolumeControl"
+        "kb:control+NVDA+y": "showVolumeControl",
+        "kb:control+alt+NVDA+upArrow": "raiseForegroundVolume",
+        "kb:control+alt+NVDA+downArrow": "lowerForegroundVolume",
+        "kb:control+alt+NVDA+m": "toggleForegroundMute",
+        "kb:control+alt+NVDA+d": "toggleDucking",
+        "kb:control+alt+NVDA+f": "fadeForeground",
+        # reportPerformance is left unbound on purpose: it is a diagnostic, and
+        # a default gesture would take a key combination from users who never
+        # need it. It can be assigned under Input gestures.
     }
     
     def __init__(self):
         super().__init__()
         log.info("Audio Volume Control add-on initialized")
         self.updateChecker = None
+        self.snapshotWorker = None
+        self.focusLatencies = []
+        self._gestureTime = None
+        self.ducking = None
+        self._speechHooks = None
+        # Volumes of applications faded out by the fade gesture, by ApplicationGroup.key
+        self._fadedLevels = {}
+        # Timing costs almost nothing while disabled; it starts on with debug logging
+        # or when the performance report is first requested.
+        if log.isEnabledFor(logging.DEBUG):
+            instrumentation.enable()
         if NVDA_AVAILABLE:
             try:
                 self.updateChecker = UpdateChecker(self._on_update_available)
@@ -34,6 +71,13 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
                 log.info("Update checker started")
             except Exception as e:
                 log.error(f"Failed to start update checker: {e}")
+            try:
+                _ensureLibPath()
+                from .sessionSnapshot import SnapshotWorker
+                self.snapshotWorker = SnapshotWorker()
+                self.snapshotWorker.start()
+            except Exception as e:
+                log.error(f"Failed to start session snapshot worker: {e}")
         else:
             log.warning("NVDA environment not detected")
     
@@ -43,9 +87,40 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
                 self.updateChecker.stop()
             except Exception as e:
                 log.error(f"Error stopping update checker: {e}")
+        if self.snapshotWorker:
+            try:
+                self.snapshotWorker.stop()
+            except Exception as e:
+                log.error(f"Error stopping session snapshot worker: {e}")
+        if self.ducking:
+            try:
+                self._speechHooks.unregister()
+                self.ducking.stop()
+            except Exception as e:
+                log.error(f"Error stopping ducking: {e}")
+        if f"{__name__}.volumeRamp" in sys.modules:
+            try:
+                from .volumeRamp import scheduler
+                scheduler.stop()
+            except Exception as e:
+                log.error(f"Error stopping volume fades: {e}")
+        if f"{__name__}.audioSessionManager" in sys.modules:
+            try:
+                from .audioSessionManager import AudioSessionManager
+                AudioSessionManager.shutdown()
+                AudioSessionManager.install_profiles(None)
+            except Exception as e:
+                log.error(f"Error stopping session registry: {e}")
         log.info("Audio Volume Control add-on terminated")
         super().terminate()
     
+    def event_foreground(self, obj, nextHandler):
+        try:
+            foregroundTracker.tracker.update(obj.windowHandle, obj.processID)
+        except Exception as e:
+            log.debug(f"Foreground tracking failed: {e}")
+        nextHandler()
+    
     def _on_update_available(self, version, download_url, release_info):
         log.info(f"Update available: {version}")
         try:
@@ -59,6 +134,7 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
                 log.error("Cannot show dialog - NVDA not available")
                 return
             log.debug("Opening volume control dialog")
+            self._gestureTime = time.perf_counter()
             wx.CallAfter(self._showDialog)
         except Exception as e:
             log.error(f"Failed to show volume control dialog: {e}", exc_info=True)
@@ -69,15 +145,16 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
     
     def _showDialog(self):
         try:
-            import sys
-            import os
-            lib_path = os.path.join(os.path.dirname(__file__), 'lib')
-            if os.path.exists(lib_path) and lib_path not in sys.path:
-                sys.path.insert(0, lib_path)
+            _ensureLibPath()
             from .volumeControlDialog import VolumeControlDialog
-            dialog = VolumeControlDialog(gui.mainFrame)
-            dialog.ShowModal()
-            dialog.Destroy()
+            with self._duckingHeld() as restored:
+                # A snapshot taken while ducked shows the ducked volumes
+                snapshot = self.snapshotWorker.latest() if self.snapshotWorker and not restored else None
+                dialog = VolumeControlDialog(gui.mainFrame, snapshot=snapshot, onFirstFocus=self._onFirstFocus)
+                dialog.ShowModal()
+                dialog.Destroy()
+            if self.snapshotWorker:
+                self.snapshotWorker.schedule()
         except Exception as e:
             log.error(f"Error in dialog: {e}", exc_info=True)
             try:
@@ -85,4 +162,216 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
             except:
                 pass
     
+    def _onFirstFocus(self, fromSnapshot):
+        if self._gestureTime is None:
+            return
+        latency = (time.perf_counter() - self._gestureTime) * 1000.0
+        self._gestureTime = None
+        self.focusLatencies.append(latency)
+        del self.focusLatencies[:-50]
+        instrumentation.record("dialog_first_focus", latency / 1000.0)
+        source = "snapshot" if fromSnapshot else "live enumeration"
+        log.info(f"Volume dialog time to first focus: {latency:.1f} ms ({source})")
+    
+    def _foregroundGroup(self):
+        """Return (application name, ApplicationGroup or None) for the foreground application."""
+        _ensureLibPath()
+        from .audioSessionManager import AudioSessionManager
+        name = AudioSessionManager.get_foreground_app_name()
+        if not name:
+            return None, None
+        return name, AudioSessionManager.find_group(name)
+    
+    @contextmanager
+    def _duckingHeld(self):
+        """Keep applications at their own volume while the user reads or changes it; yields whether any were ducked."""
+        engine = self.ducking
+        if engine is None:
+            yield False
+            return
+        restored = engine.hold()
+        try:
+            yield restored
+        finally:
+            engine.release()
+    
+    def _adjustForeground(self, delta):
+        if not NVDA_AVAILABLE:
+            return
+        with instrumentation.timed("foreground_gesture"), self._duckingHeld():
+            try:
+                name, group = self._foregroundGroup()
+                if group is None:
+                    # Translators: the foreground application is not playing audio
+                    ui.message(_("No audio session for {name}").format(name=name or _("this application")))
+                    return
+                if delta:
+                    from . import volumeRamp
+                    for session in group.sessions:
+                        volumeRamp.scheduler.cancel(session)
+                    self._fadedLevels.pop(group.key, None)
+                    volume = group.adjust_volume(delta)
+                    group.save_profile(volume=volume)
+                    # Translators: announced after changing the foreground application's volume
+                    ui.message(_("{name} {volume:.0f}%").format(name=group.name, volume=volume))
+                else:
+                    muted = group.toggle_mute()
+                    group.save_profile(mute=muted)
+                    if muted:
+                        # Translators: announced after muting the foreground application
+                        ui.message(_("{name} muted").format(name=group.name))
+                    else:
+                        # Translators: announced after unmuting the foreground application
+                        ui.message(_("{name} unmuted").format(name=group.name))
+            except Exception as e:
+                log.error(f"Foreground volume change failed: {e}", exc_info=True)
+                ui.message(_("Error: Could not change the volume"))
+    
+    def script_raiseForegroundVolume(self, gesture):
+        self._adjustForeground(FOREGROUND_VOLUME_STEP)
+    
+    def script_lowerForegroundVolume(self, gesture):
+        self._adjustForeground(-FOREGROUND_VOLUME_STEP)
+    
+    def script_toggleForegroundMute(self, gesture):
+        self._adjustForeground(0)
+    
+    def script_fadeForeground(self, gesture):
+        if not NVDA_AVAILABLE:
+            return
+        with self._duckingHeld():
+            try:
+                name, group = self._foregroundGroup()
+                if group is None:
+                    # Translators: the foreground application is not playing audio
+                    ui.message(_("No audio session for {name}").format(name=name or _("this application")))
+                    return
+                from . import volumeRamp
+                restore = self._fadedLevels.pop(group.key, None)
+                if restore is None:
+                    self._fadedLevels[group.key] = group.get_volume()
+                    group.fade(0.0, FOREGROUND_FADE_DURATION, volumeRamp.CURVE_DB)
+                    # Translators: announced when the foreground application starts fading to silence
+                    ui.message(_("{name} fading out").format(name=group.name))
+                else:
+                    group.fade(restore, FOREGROUND_FADE_DURATION, volumeRamp.CURVE_DB)
+                    # Translators: announced when the foreground application starts fading back to its volume
+                    ui.message(_("{name} fading in").format(name=group.name))
+            except Exception as e:
+                log.error(f"Foreground fade failed: {e}", exc_info=True)
+                ui.message(_("Error: Could not change the volume"))
+    
+    def _getDucking(self):
+        """
+        Create the ducking engine and hook it to speech and the session registry.
+        
+        None if NVDA has no speech hooks or session notifications are
+        unavailable: without the registry, new sessions would never get a
+        restore level and every transition would enumerate sessions on the
+        speech path.
+        """
+        if self.ducking is None:
+            _ensureLibPath()
+            from .audioDucking import DuckingEngine, SpeechHooks
+            from .audioSessionManager import AudioSessionManager
+            registry = AudioSessionManager.get_registry()
+            if registry is None:
+                return None
+            engine = DuckingEngine(AudioSessionManager.get_active_sessions)
+            hooks = SpeechHooks(engine)
+            if not hooks.register():
+                return None
+            registry.add_listener(engine.on_session_change)
+            self.ducking = engine
+            self._speechHooks = hooks
+        return self.ducking
+    
+    def script_toggleDucking(self, gesture):
+        if not NVDA_AVAILABLE:
+            return
+        try:
+            engine = self._getDucking()
+            if engine is None:
+                # Translators: NVDA offers no speech notifications, or audio session notifications failed to start
+                ui.message(_("Ducking is not supported by this version of NVDA or on this system"))
+                return
+            engine.enable(not engine.enabled)
+            if engine.enabled:
+                # Translators: other applications get quieter while NVDA speaks
+                ui.message(_("Duck applications while speaking on"))
+            else:
+                # Translators: other applications keep their volume while NVDA speaks
+                ui.message(_("Duck applications while speaking off"))
+        except Exception as e:
+            log.error(f"Toggling ducking failed: {e}", exc_info=True)
+    
+    def script_reportPerformance(self, gesture):
+        import scriptHandler
+        if scriptHandler.getLastScriptRepeatCount() > 0:
+            instrumentation.enable(False)
+            instrumentation.reset()
+            ui.message(_("Performance timing off"))
+            return
+        if not instrumentation.enabled:
+            instrumentation.enable()
+            ui.message(_("Performance timing on. Use the volume control, then ask for the report again"))
+            return
+        summary = instrumentation.summary()
+        lines = instrumentation.report_lines()
+        if self.focusLatencies:
+            lines.append(f"recent time to first focus (ms): {', '.join(f'{v:.1f}' for v in self.focusLatencies[-10:])}")
+        if f"{__name__}.audioSessionManager" in sys.modules:
+            from .audioSessionManager import AudioSessionManager
+            for label, service in (
+                ("process names", AudioSessionManager.get_process_info()),
+                ("volume profiles", AudioSessionManager.get_profiles()),
+            ):
+                if service is not None:
+                    lines.append(f"{label}: {service.stats()}")
+        lines.append(f"foreground tracker: {foregroundTracker.tracker.stats()}")
+        if self.ducking:
+            lines.append(f"ducking: {self.ducking.stats()}")
+        if f"{__name__}.volumeRamp" in sys.modules:
+            from .volumeRamp import scheduler
+            lines.append(f"fades: {scheduler.stats()}")
+        if self.snapshotWorker:
+            lines.append(f"session snapshots: {self.snapshotWorker.refreshes} refreshes")
+        if f"{__name__}.deltaUpdate" in sys.modules:
+            from .deltaUpdate import last_update
+            if last_update:
+                lines.append(f"last update download: {last_update}")
+        log.info("Audio Volume Control performance report:\n" + "\n".join(lines))
+        
+        comCalls = sum(
+            summary[name]['count']
+            for name in ("GetAllSessions", "GetMasterVolume", "SetMasterVolume", "GetMute", "SetMute")
+            if name in summary
+        )
+        parts = []
+        if self.focusLatencies:
+            ordered = sorted(self.focusLatencies)
+            # Translators: median time between the gesture and focus landing in the dialog
+            parts.append(_("dialog opens in {ms:.0f} ms").format(ms=ordered[len(ordered) // 2]))
+        if "foreground_gesture" in summary:
+            # Translators: typical duration of a foreground volume or mute gesture
+            parts.append(_("volume keys {ms} ms").format(ms=summary["foreground_gesture"]['p50_ms']))
+        if "GetAllSessions" in summary:
+            # Translators: typical duration of one session enumeration
+            parts.append(_("session scan {ms} ms").format(ms=summary["GetAllSessions"]['p50_ms']))
+        if "resolve_pid" in summary:
+            # Translators: 95th percentile duration of a process name lookup
+            parts.append(_("name lookup {ms} ms").format(ms=summary["resolve_pid"]['p95_ms']))
+        # Translators: number of audio engine calls timed since timing started
+        parts.append(_("{count} audio calls").format(count=comCalls))
+        ui.message(", ".join(parts) + ". " + _("Details in the NVDA log"))
+    
     script_showVolumeControl.__doc__ = _("Show the per-application volume control dialog")
+    script_raiseForegroundVolume.__doc__ = _("Raise the volume of the current application")
+    script_lowerForegroundVolume.__doc__ = _("Lower the volume of the current application")
+    script_toggleForegroundMute.__doc__ = _("Mute or unmute the current application")
+    script_fadeForeground.__doc__ = _("Fade the current application out, or back in to its volume")
+    script_toggleDucking.__doc__ = _("Turn on or off lowering other applications while NVDA speaks")
+    # Translators: input gesture description; press twice to turn timing off
+    script_reportPerformance.__doc__ = _(
+        "Report timing of audio calls and of opening the volume dialog. Press twice to stop timing"
+    )
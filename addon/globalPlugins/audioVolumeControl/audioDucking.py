@@ -0,0 +1,331 @@
+"""
+Speech-triggered ducking.
+
+While NVDA speaks, every other application is lowered to a fraction of its
+own volume, and restored once speech has been silent for a short release
+delay. The volume each application returns to is kept up to date from the
+session registry's change notifications ahead of time, so a transition is a
+single batch of writes with no reads. Speech that restarts within the
+release delay leaves the sessions ducked instead of bouncing them.
+
+While the user reads or changes volumes, hold() restores ducked sessions
+and keeps them restored, so the user works on each application's own
+volume rather than the ducked one, which would otherwise be taken as the
+new level to restore and be remembered.
+
+The engine needs those notifications: on_session_change must be registered
+with the session registry, and sessions_source should read the registry
+rather than enumerate sessions.
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .sessionRegistry import SESSION_ADDED, SESSION_REMOVED, SESSION_VOLUME_CHANGED
+from .sessionSnapshot import co_initialize, co_uninitialize
+from .volumeController import VolumeController
+from .volumeWriter import session_key
+
+log = logging.getLogger(__name__)
+
+# Percent of each application's own volume kept while NVDA speaks
+DEFAULT_DUCK_LEVEL = 30.0
+# Seconds of silence before ducked applications are restored
+DEFAULT_RELEASE_DELAY = 0.6
+# Differences smaller than this between a reported and a written volume are our own writes
+VOLUME_TOLERANCE = 0.05
+# Own writes remembered per session while waiting for their change notification
+MAX_ECHOES = 4
+
+
+class DuckingEngine:
+    def __init__(self, sessions_source: Callable[[], Iterable], level: float = DEFAULT_DUCK_LEVEL,
+                 release_delay: float = DEFAULT_RELEASE_DELAY, controller=VolumeController,
+                 exclude_pids: Optional[Iterable[int]] = None):
+        self.sessions_source = sessions_source
+        self.level = level
+        self.release_delay = release_delay
+        self.controller = controller
+        self.exclude_pids = set(exclude_pids) if exclude_pids is not None else {os.getpid()}
+        self.enabled = False
+        # Restore targets, refreshed from volume notifications
+        self._levels: Dict[object, float] = {}
+        # Sessions currently ducked: key -> (session, volume written)
+        self._ducked: Dict[object, Tuple[object, float]] = {}
+        # Volumes we wrote whose change notifications have not arrived yet
+        self._echoes: Dict[object, List[float]] = {}
+        self._is_ducked = False
+        self._needs_seed = True
+        self._speaking = False
+        self._stopped_at = 0.0
+        # Number of hold() calls not yet released; no ducking while above zero
+        self._holds = 0
+        self._cond = threading.Condition()
+        # Held from deciding a transition until its writes are done, so a
+        # hold() restore cannot be overtaken by the worker's duck writes
+        self._transition = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self.ducks = 0
+        self.restores = 0
+        self.writes = 0
+        self.held = 0
+
+    @property
+    def is_ducked(self) -> bool:
+        return self._is_ducked
+
+    def enable(self, state: bool = True):
+        with self._cond:
+            self.enabled = state
+            if state:
+                self._needs_seed = True
+                if self._thread is None and not self._stopping:
+                    self._thread = threading.Thread(target=self._run, name="AudioVolumeControlDucking", daemon=True)
+                    self._thread.start()
+            self._cond.notify_all()
+
+    def speech_started(self, *args, **kwargs):
+        """Called when NVDA starts speaking; cheap enough for the speech path."""
+        with self._cond:
+            if self._is_ducked and not self._speaking:
+                self.held += 1
+            self._speaking = True
+            self._cond.notify_all()
+
+    def speech_stopped(self, *args, **kwargs):
+        with self._cond:
+            if not self._speaking:
+                return
+            self._speaking = False
+            self._stopped_at = time.monotonic()
+            self._cond.notify_all()
+
+    def hold(self) -> bool:
+        """
+        Restore ducked sessions now, on the calling thread, and keep them
+        restored until release(). Returns whether anything was restored.
+        """
+        with self._transition:
+            with self._cond:
+                self._holds += 1
+                if not self._is_ducked:
+                    return False
+                targets = self._restore_targets()
+                self._is_ducked = False
+                self.restores += 1
+            self._write(targets)
+        return True
+
+    def release(self):
+        """End a hold(); ducking resumes if NVDA is still speaking."""
+        with self._cond:
+            self._holds = max(0, self._holds - 1)
+            self._cond.notify_all()
+
+    def on_session_change(self, kind: str, session):
+        """Session registry listener keeping the restore targets current."""
+        key = session_key(session)
+        with self._cond:
+            if kind == SESSION_REMOVED:
+                self._levels.pop(key, None)
+                self._ducked.pop(key, None)
+                self._echoes.pop(key, None)
+                return
+            if kind not in (SESSION_ADDED, SESSION_VOLUME_CHANGED):
+                return
+            volume = session.cached_volume
+            if volume is None:
+                self._needs_seed = True
+                self._cond.notify_all()
+                return
+            if kind == SESSION_VOLUME_CHANGED and self._is_echo(key, volume):
+                return
+            # Changed by the user or the application. While ducked, the new level
+            # is kept and the session is left out of the restore.
+            self._ducked.pop(key, None)
+            self._levels[key] = volume
+
+    def _is_echo(self, key, volume: float) -> bool:
+        """Consume the notification of one of our own writes. Called with the lock held."""
+        echoes = self._echoes.get(key)
+        if not echoes:
+            return False
+        for index, written in enumerate(echoes):
+            if abs(written - volume) <= VOLUME_TOLERANCE:
+                del echoes[:index + 1]
+                return True
+        return False
+
+    def _expect_echo(self, key, volume: float):
+        echoes = self._echoes.setdefault(key, [])
+        echoes.append(volume)
+        del echoes[:-MAX_ECHOES]
+
+    def stop(self, timeout: float = 2.0):
+        """Restore any ducked sessions and stop the worker."""
+        with self._cond:
+            self.enabled = False
+            self._stopping = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        if self.ducks:
+            log.debug(f"Ducking: {self.ducks} ducks, {self.restores} restores, {self.writes} writes, {self.held} held through pauses")
+
+    def stats(self) -> dict:
+        return {
+            'enabled': self.enabled,
+            'ducked': self._is_ducked,
+            'ducks': self.ducks,
+            'restores': self.restores,
+            'writes': self.writes,
+            'held': self.held,
+        }
+
+    def _want_ducked(self, now: float) -> bool:
+        if not self.enabled or self._stopping or self._holds:
+            return False
+        return self._speaking or now < self._stopped_at + self.release_delay
+
+    def _seed(self, sessions):
+        """Fill in restore targets for sessions without one; runs off the speech path."""
+        with self._cond:
+            missing = [
+                session for session in sessions
+                if session_key(session) not in self._levels and session_key(session) not in self._ducked
+            ]
+        for session in missing:
+            volume = self.controller.get_volume(session)
+            with self._cond:
+                self._levels.setdefault(session_key(session), volume)
+
+    def _duck_targets(self, sessions) -> List[tuple]:
+        """Record and return this duck's writes. Called with the lock held."""
+        targets = []
+        for session in sessions:
+            if session.pid in self.exclude_pids:
+                continue
+            key = session_key(session)
+            level = self._levels.get(key)
+            if level is None:
+                continue
+            target = round(level * self.level / 100.0, 1)
+            if target >= level:
+                continue
+            self._ducked[key] = (session, target)
+            self._expect_echo(key, target)
+            targets.append((session, target, None))
+        return targets
+
+    def _restore_targets(self) -> List[tuple]:
+        """Return the writes undoing the current duck. Called with the lock held."""
+        targets = []
+        for key, (session, _) in self._ducked.items():
+            level = self._levels.get(key)
+            if level is not None:
+                self._expect_echo(key, level)
+                targets.append((session, level, None))
+        self._ducked.clear()
+        return targets
+
+    def _write(self, targets):
+        if not targets:
+            return
+        try:
+            results = self.controller.apply_batch(targets, skip_unchanged=False)
+            self.writes += sum(result.writes for result in results)
+        except Exception as e:
+            log.error(f"Ducking write failed: {e}")
+
+    def _run(self):
+        com_initialized = co_initialize()
+        try:
+            while True:
+                with self._cond:
+                    while True:
+                        now = time.monotonic()
+                        want = self._want_ducked(now)
+                        if want != self._is_ducked:
+                            break
+                        if self._needs_seed and self.enabled and not self._is_ducked:
+                            break
+                        if self._stopping:
+                            return
+                        timeout = None
+                        if self._is_ducked and not self._speaking:
+                            timeout = max(0.0, self._stopped_at + self.release_delay - now)
+                        self._cond.wait(timeout)
+                    seed = want == self._is_ducked
+                    if seed:
+                        self._needs_seed = False
+                try:
+                    sessions = list(self.sessions_source())
+                except Exception as e:
+                    log.error(f"Ducking could not list sessions: {e}")
+                    sessions = []
+                if seed:
+                    self._seed(sessions)
+                    continue
+                with self._transition:
+                    with self._cond:
+                        # A hold() may have restored the sessions meanwhile
+                        want = self._want_ducked(time.monotonic())
+                        if want == self._is_ducked:
+                            continue
+                        if want:
+                            targets = self._duck_targets(sessions)
+                            self._is_ducked = True
+                            self.ducks += 1
+                        else:
+                            targets = self._restore_targets()
+                            self._is_ducked = False
+                            self.restores += 1
+                    self._write(targets)
+        finally:
+            if com_initialized:
+                co_uninitialize()
+
+
+class SpeechHooks:
+    """Connects a DuckingEngine to NVDA's speech extension points where they exist."""
+
+    def __init__(self, engine: DuckingEngine):
+        self.engine = engine
+        self._registered = []
+
+    def register(self) -> bool:
+        """Register the speech start and stop handlers; returns False if NVDA offers none."""
+        points = []
+        try:
+            from speech import extensions
+            points.append((getattr(extensions, 'pre_speech', None), self.engine.speech_started))
+            points.append((getattr(extensions, 'speechCanceled', None), self.engine.speech_stopped))
+        except ImportError:
+            pass
+        try:
+            import synthDriverHandler
+            points.append((getattr(synthDriverHandler, 'synthDoneSpeaking', None), self.engine.speech_stopped))
+        except ImportError:
+            pass
+        for point, handler in points:
+            if point is None:
+                continue
+            point.register(handler)
+            self._registered.append((point, handler))
+        starts = any(handler == self.engine.speech_started for _, handler in self._registered)
+        if not starts:
+            self.unregister()
+        return starts
+
+    def unregister(self):
+        for point, handler in self._registered:
+            try:
+                point.unregister(handler)
+            except Exception as e:
+                log.debug(f"Could not unregister speech handler: {e}")
+        self._registered = []
@@ -1,7 +1,10 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 import logging
 import sys
 import os
+import threading
+import addonHandler
+addonHandler.initTranslation()
 
 _current_dir = os.path.dirname(__file__)
 _lib_dir = os.path.join(_current_dir, 'lib')
@@ -14,107 +17,31 @@ except ImportError:
     _psutil_available = False
 
 if os.path.exists(_lib_dir) and not _psutil_available:
-    # Dynamic psutil C extension resolver bootstrap (fallback for older NVDA versions)
+    # Fallback for older NVDA versions: serve the tagged psutil C extension from lib/psutil in place
     try:
-        import struct
-        import shutil
-        _psutil_dir = os.path.join(_lib_dir, 'psutil')
-        if os.path.exists(_psutil_dir):
-            is_64bit = struct.calcsize("P") * 8 == 64
-            plat_tag = "win_amd64" if is_64bit else "win32"
-            py_ver_num = sys.version_info.major * 100 + sys.version_info.minor
-            
-            # CPython 3.7+ use the cp37 stable ABI wheel
-            if py_ver_num >= 307:
-                src_name = f"_psutil_windows.cp37-{plat_tag}.pyd"
-            else:
-                py_tag = f"cp{sys.version_info.major}{sys.version_info.minor}"
-                src_name = f"_psutil_windows.{py_tag}-{plat_tag}.pyd"
-            src_path = os.path.join(_psutil_dir, src_name)
-            dest_path = os.path.join(_psutil_dir, "_psutil_windows.pyd")
-            
-            # Dynamic python3.dll resolver bootstrap for stable ABI support in embedded environments like NVDA
-            dll_src_name = f"python3-{plat_tag}.dll"
-            dll_src_path = os.path.join(_psutil_dir, dll_src_name)
-            dll_dest_path = os.path.join(_psutil_dir, "python3.dll")
-            if os.path.exists(dll_src_path):
-                dll_copy_needed = True
-                if os.path.exists(dll_dest_path):
-                    try:
-                        if os.path.getsize(dll_src_path) == os.path.getsize(dll_dest_path):
-                            dll_copy_needed = False
-                    except:
-                        pass
-                
-                if dll_copy_needed:
-                    try:
-                        if os.path.exists(dll_dest_path):
-                            os.remove(dll_dest_path)
-                        shutil.copy2(dll_src_path, dll_dest_path)
-                        logging.getLogger(__name__).info(f"VolumeControl: Copied stable ABI helper dll {dll_src_name}")
-                    except Exception as copy_err:
-                        logging.getLogger(__name__).error(f"VolumeControl: Failed to copy stable ABI helper dll: {copy_err}")
-            
-            if os.path.exists(src_path):
-                copy_needed = True
-                if os.path.exists(dest_path):
-                    try:
-                        if os.path.getsize(src_path) == os.path.getsize(dest_path):
-                            copy_needed = False
-                    except:
-                        pass
-                
-                if copy_needed:
-                    try:
-                        if os.path.exists(dest_path):
-                            os.remove(dest_path)
-                        shutil.copy2(src_path, dest_path)
-                        logging.getLogger(__name__).info(f"VolumeControl: Copied C extension {src_name}")
-                    except Exception as copy_err:
-                        logging.getLogger(__name__).error(f"VolumeControl: Failed to copy C extension: {copy_err}")
-            else:
-                logging.getLogger(__name__).error(f"VolumeControl: Tagged C extension not found: {src_path}")
+        from .psutilLoader import install_psutil_finder
+        install_psutil_finder(os.path.join(_lib_dir, 'psutil'))
     except Exception as e:
         logging.getLogger(__name__).error(f"VolumeControl: Error during psutil bootstrap: {e}")
 
-    modules_to_remove = [key for key in list(sys.modules.keys()) if key.startswith('psutil')]
-    for mod in modules_to_remove:
-        del sys.modules[mod]
-
 try:
     from avc_pycaw.utils import AudioUtilities
     
-    # Temporarily set DLL path for importing psutil if using the bundled version
-    dll_dir_cookie = None
-    old_path = os.environ.get('PATH', '')
-    if not _psutil_available:
-        if os.path.exists(_lib_dir):
-            if _lib_dir not in sys.path:
-                sys.path.insert(0, _lib_dir)
-        _psutil_dir = os.path.join(_lib_dir, 'psutil')
-        if os.path.exists(_psutil_dir):
-            try:
-                os.environ['PATH'] = _psutil_dir + os.pathsep + old_path
-                if hasattr(os, 'add_dll_directory'):
-                    dll_dir_cookie = os.add_dll_directory(_psutil_dir)
-            except:
-                pass
-            
-    try:
-        import psutil
-        DEPENDENCIES_AVAILABLE = True
-    finally:
-        if not _psutil_available:
-            if dll_dir_cookie:
-                try:
-                    dll_dir_cookie.close()
-                except:
-                    pass
-            os.environ['PATH'] = old_path
+    if not _psutil_available and os.path.exists(_lib_dir) and _lib_dir not in sys.path:
+        sys.path.insert(0, _lib_dir)
+    import psutil
+    DEPENDENCIES_AVAILABLE = True
 except ImportError as e:
     DEPENDENCIES_AVAILABLE = False
     logging.getLogger(__name__).error(f"Failed to import dependencies: {e}")
 
+from . import foregroundTracker, volumeRamp
+from .instrumentation import timed
+from .processInfo import ProcessInfoService, PsutilProcessTable
+from .sessionRegistry import SessionRegistry, PycawSessionBackend, SESSION_STATE_EXPIRED
+from .volumeProfiles import ProfileStore, default_profiles_path
+from .volumeController import VolumeController
+
 log = logging.getLogger(__name__)
 
 
@@ -123,20 +50,211 @@ class AudioSession:
         self.session = session
         self.pid = pid
         self.name = name
+        self.key = None
+        self.state = None
         self.volume_interface = None
+        # Read-through cache of volume (percent) and mute state. Only enabled for
+        # sessions whose volume change notifications are being received.
+        self.cache_enabled = False
+        self.cached_volume: Optional[float] = None
+        self.cached_mute: Optional[bool] = None
         try:
             self.volume_interface = session.SimpleAudioVolume
         except Exception as e:
             log.error(f"Failed to get volume interface for {name}: {e}")
+    
+    def update_cache(self, volume: Optional[float] = None, mute: Optional[bool] = None):
+        if not self.cache_enabled:
+            return
+        if volume is not None:
+            self.cached_volume = round(volume, 1)
+        if mute is not None:
+            self.cached_mute = bool(mute)
+    
+    def invalidate_cache(self):
+        self.cached_volume = None
+        self.cached_mute = None
+
+
+class ApplicationGroup:
+    """All audio sessions owned by one application, controlled together."""
+    
+    def __init__(self, name: str, sessions):
+        self.name = name
+        self.sessions = list(sessions)
+    
+    @property
+    def key(self) -> str:
+        return self.name.casefold()
+    
+    @property
+    def primary(self) -> AudioSession:
+        return self.sessions[0]
+    
+    @property
+    def label(self) -> str:
+        if len(self.sessions) == 1:
+            return self.name
+        return _("{name} ({count} sessions)").format(name=self.name, count=len(self.sessions))
+    
+    def get_volume(self) -> float:
+        return VolumeController.get_volume(self.primary)
+    
+    def get_mute_state(self) -> bool:
+        return VolumeController.get_mute_state(self.primary)
+    
+    def set_volume(self, volume_percent: float):
+        return VolumeController.apply_batch([(s, volume_percent, None) for s in self.sessions])
+    
+    def set_mute(self, mute: bool):
+        return VolumeController.apply_batch([(s, None, mute) for s in self.sessions])
+    
+    def adjust_volume(self, delta_percent: int) -> float:
+        """Move every session by delta_percent from the primary session's volume and return the new level."""
+        if len(self.sessions) == 1:
+            return VolumeController.adjust_volume(self.primary, delta_percent)
+        volume = max(0.0, min(100.0, self.get_volume() + delta_percent))
+        self.set_volume(volume)
+        return volume
+    
+    def fade(self, target_percent: float, duration: float, curve: str = volumeRamp.CURVE_LINEAR):
+        """Fade every session to target_percent over duration seconds on the shared ramp scheduler."""
+        return volumeRamp.scheduler.fade_all(self.sessions, target_percent, duration, curve)
+    
+    def toggle_mute(self) -> bool:
+        if len(self.sessions) == 1:
+            return VolumeController.toggle_mute(self.primary)
+        mute = not self.get_mute_state()
+        self.set_mute(mute)
+        return mute
+    
+    def save_profile(self, volume: Optional[float] = None, mute: Optional[bool] = None):
+        """Remember volume and/or mute for this application; the disk write happens later."""
+        profiles = AudioSessionManager.get_profiles()
+        if profiles is not None:
+            profiles.remember(self.name, volume=volume, mute=mute)
+    
+    def forget_profile(self):
+        profiles = AudioSessionManager.get_profiles()
+        if profiles is not None:
+            profiles.forget(self.name)
+
+
+def _build_session(raw_session, pid: int, name: str) -> Optional[AudioSession]:
+    audio_session = AudioSession(raw_session, pid, name)
+    if not audio_session.volume_interface:
+        log.warning(f"Skipping session for {name} - no volume interface")
+        return None
+    return audio_session
 
 
 class AudioSessionManager:
+    _registry: Optional[SessionRegistry] = None
+    _registry_failed = False
+    # Held while a registry is installed, so threads racing to the first
+    # get_registry() share one registry instead of each registering notifications
+    _registry_lock = threading.RLock()
+    _process_info: Optional[ProcessInfoService] = None
+    _profiles: Optional[ProfileStore] = None
+    
     @staticmethod
     def check_dependencies() -> bool:
-        return DEPENDENCIES_AVAILABLE
+        return DEPENDENCIES_AVAILABLE or AudioSessionManager._registry is not None
+    
+    @staticmethod
+    def install_backend(backend) -> SessionRegistry:
+        """Replace the session registry with one fed by backend and start it."""
+        with AudioSessionManager._registry_lock:
+            AudioSessionManager.shutdown()
+            registry = SessionRegistry(
+                backend,
+                _build_session,
+                AudioSessionManager.get_process_name,
+                AudioSessionManager.get_process_names,
+            )
+            registry.start()
+            AudioSessionManager._registry = registry
+            AudioSessionManager._registry_failed = False
+            profiles = AudioSessionManager.get_profiles()
+            if profiles is not None:
+                registry.add_listener(profiles.on_session_change)
+                profiles.start()
+            return registry
+    
+    @staticmethod
+    def install_profiles(store: Optional[ProfileStore]) -> Optional[ProfileStore]:
+        """Replace the volume profile store, saving and stopping the previous one."""
+        previous = AudioSessionManager._profiles
+        registry = AudioSessionManager._registry
+        if previous is not None:
+            if registry is not None:
+                registry.remove_listener(previous.on_session_change)
+            previous.stop()
+        AudioSessionManager._profiles = store
+        if store is not None and registry is not None:
+            registry.add_listener(store.on_session_change)
+            store.start()
+        return store
+    
+    @staticmethod
+    def get_profiles() -> Optional[ProfileStore]:
+        if AudioSessionManager._profiles is None:
+            path = default_profiles_path()
+            if path:
+                AudioSessionManager._profiles = ProfileStore(path)
+        return AudioSessionManager._profiles
+    
+    @staticmethod
+    def install_process_table(table) -> ProcessInfoService:
+        """Replace the process metadata service with one reading from table."""
+        AudioSessionManager._process_info = ProcessInfoService(table)
+        return AudioSessionManager._process_info
+    
+    @staticmethod
+    def get_process_info() -> Optional[ProcessInfoService]:
+        if AudioSessionManager._process_info is None and DEPENDENCIES_AVAILABLE:
+            AudioSessionManager._process_info = ProcessInfoService(PsutilProcessTable(psutil))
+        return AudioSessionManager._process_info
+    
+    @staticmethod
+    def get_registry() -> Optional[SessionRegistry]:
+        registry = AudioSessionManager._registry
+        if registry is not None:
+            return registry
+        with AudioSessionManager._registry_lock:
+            if AudioSessionManager._registry is not None:
+                return AudioSessionManager._registry
+            if not DEPENDENCIES_AVAILABLE or AudioSessionManager._registry_failed:
+                return None
+            try:
+                return AudioSessionManager.install_backend(PycawSessionBackend())
+            except Exception as e:
+                AudioSessionManager._registry_failed = True
+                log.error(f"Session notifications unavailable, falling back to enumeration: {e}")
+                return None
+    
+    @staticmethod
+    def shutdown():
+        with AudioSessionManager._registry_lock:
+            registry = AudioSessionManager._registry
+            AudioSessionManager._registry = None
+        if registry is not None:
+            registry.stop()
+        VolumeController.shutdown()
     
     @staticmethod
     def get_active_sessions() -> List[AudioSession]:
+        registry = AudioSessionManager.get_registry()
+        if registry is not None:
+            changes = registry.refresh()
+            sessions = list(registry.sessions())
+            log.debug(f"Session registry: {len(sessions)} sessions, {changes} changes since last refresh")
+            return sessions
+        
+        return AudioSessionManager.scan_sessions()
+    
+    @staticmethod
+    def scan_sessions() -> List[AudioSession]:
         if not DEPENDENCIES_AVAILABLE:
             log.error("Required dependencies (pycaw, psutil) are not available")
             return []
@@ -144,24 +262,27 @@ class AudioSessionManager:
         sessions = []
         
         try:
-            all_sessions = AudioUtilities.GetAllSessions()
+            with timed("GetAllSessions"):
+                raw_sessions = AudioUtilities.GetAllSessions()
+            all_sessions = [
+                session for session in raw_sessions
+                if session.Process and session.State != SESSION_STATE_EXPIRED
+            ]
+            names = AudioSessionManager.get_process_names([session.ProcessId for session in all_sessions])
             
             for session in all_sessions:
-                if session.Process and session.State != 2:
-                    try:
-                        pid = session.ProcessId
-                        name = AudioSessionManager.get_process_name(pid)
-                        audio_session = AudioSession(session, pid, name)
-                        if audio_session.volume_interface:
-                            sessions.append(audio_session)
-                        else:
-                            log.warning(f"Skipping session for {name} - no volume interface")
-                    except Exception as e:
-                        log.error(f"Error processing session: {e}")
-                        continue
+                try:
+                    pid = session.ProcessId
+                    audio_session = _build_session(session, pid, names[pid])
+                    if audio_session:
+                        sessions.append(audio_session)
+                except Exception as e:
+                    log.error(f"Error processing session: {e}")
+                    continue
             
             sessions.sort(key=lambda s: s.name.lower())
             log.info(f"Found {len(sessions)} active audio sessions")
+            log.debug(f"Process name cache: {AudioSessionManager.get_process_info().stats()}")
             
         except Exception as e:
             log.error(f"Failed to enumerate audio sessions: {e}")
@@ -169,38 +290,51 @@ class AudioSessionManager:
         
         return sessions
     
+    @staticmethod
+    def group_sessions(sessions: List[AudioSession]) -> List[ApplicationGroup]:
+        """Group sessions by casefolded application name, keeping their order."""
+        groups: Dict[str, ApplicationGroup] = {}
+        for session in sessions:
+            group = groups.get(session.name.casefold())
+            if group is None:
+                groups[session.name.casefold()] = ApplicationGroup(session.name, [session])
+            else:
+                group.sessions.append(session)
+        return list(groups.values())
+    
+    @staticmethod
+    def find_group(name: str) -> Optional[ApplicationGroup]:
+        """Return the group of sessions for the application called name, or None."""
+        registry = AudioSessionManager.get_registry()
+        if registry is not None:
+            sessions = registry.find(name)
+        else:
+            sessions = [s for s in AudioSessionManager.scan_sessions() if s.name.casefold() == name.casefold()]
+        if not sessions:
+            return None
+        return ApplicationGroup(sessions[0].name, sessions)
+    
     @staticmethod
     def get_process_name(pid: int) -> str:
-        if not DEPENDENCIES_AVAILABLE:
-            return f"Process {pid}"
-        
-        try:
-            process = psutil.Process(pid)
-            name = process.name()
-            if name.lower().endswith('.exe'):
-                name = name[:-4]
-            return name
-        except psutil.NoSuchProcess:
-            log.warning(f"Process {pid} no longer exists")
-            return f"Unknown Process ({pid})"
-        except psutil.AccessDenied:
-            log.warning(f"Access denied to process {pid}")
-            return f"System Process ({pid})"
-        except Exception as e:
-            log.error(f"Error getting process name for PID {pid}: {e}")
+        service = AudioSessionManager.get_process_info()
+        if service is None:
             return f"Process {pid}"
+        return service.resolve(pid)
+    
+    @staticmethod
+    def get_process_names(pids: List[int]) -> Dict[int, str]:
+        """Resolve several process names with one pass over the process table."""
+        service = AudioSessionManager.get_process_info()
+        if service is None:
+            return {pid: f"Process {pid}" for pid in pids}
+        return service.resolve_many(pids)
     
     @staticmethod
     def get_foreground_app_name() -> Optional[str]:
+        if foregroundTracker.tracker.name_resolver is None:
+            foregroundTracker.tracker.name_resolver = AudioSessionManager.get_process_name
         try:
-            import win32gui
-            import win32process
-            hwnd = win32gui.GetForegroundWindow()
-            _, pid = win32process.GetWindowThreadProcessId(hwnd)
-            return AudioSessionManager.get_process_name(pid)
-        except ImportError:
-            log.debug("win32gui/win32process not available for foreground detection")
-            return None
+            return foregroundTracker.tracker.app_name()
         except Exception as e:
             log.error(f"Error getting foreground app: {e}")
             return None
@@ -0,0 +1,268 @@
+"""
+Delta updates.
+
+Each release publishes a manifest next to its .nvda-addon bundle, written by
+the build (site_scons/site_tools/NVDATool/addon.py), listing every file in
+the bundle with its SHA-256 and the position of its compressed data. Files
+whose hash matches the installed copy are read from disk, the others are
+fetched from the published bundle with Range requests, and a new bundle is
+assembled locally and checked against the manifest before it is installed.
+Whenever that is not possible the whole bundle is downloaded instead.
+"""
+
+import hashlib
+import http.client
+import json
+import logging
+import os
+import tempfile
+import time
+import zipfile
+import zlib
+from typing import Dict, List, Optional, Tuple
+from urllib.error import URLError
+from urllib.request import Request
+
+from .updateChecker import (
+    ADDON_NAME, DOWNLOAD_DIR_NAME, USER_AGENT, CancelToken, download_addon, open_url, parse_digest,
+)
+
+log = logging.getLogger(__name__)
+
+# Manifest format written by the build
+MANIFEST_FORMAT = 1
+# Larger manifests are refused
+MAX_MANIFEST_SIZE = 4 * 1024 * 1024
+# Changed files closer together than this in the bundle are fetched with one request
+MERGE_GAP = 32 * 1024
+# Upper bound on Range requests per update; the closest ranges are merged to stay under it
+MAX_RANGE_REQUESTS = 16
+# Above this fraction of the bundle size, the whole bundle is downloaded instead
+MAX_DELTA_FRACTION = 0.75
+
+# Transfer figures of the last update, for the performance report
+last_update: Optional[dict] = None
+
+
+class DeltaError(Exception):
+    """The delta update cannot be completed; the caller falls back to a full download."""
+
+
+def installed_addon_dir() -> Optional[str]:
+    """Folder of the running add-on, or None if it cannot be found."""
+    try:
+        import addonHandler
+        return addonHandler.getCodeAddon().path
+    except Exception:
+        path = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        return path if os.path.isfile(os.path.join(path, "manifest.ini")) else None
+
+
+def fetch_manifest(url: str, cancel: CancelToken = None) -> Tuple[dict, int]:
+    """Download and check a bundle manifest; returns it with the bytes received."""
+    with open_url(Request(url, headers={'User-Agent': USER_AGENT}), 30, cancel) as response:
+        body = response.read(MAX_MANIFEST_SIZE + 1)
+    if len(body) > MAX_MANIFEST_SIZE:
+        raise DeltaError(f"manifest larger than {MAX_MANIFEST_SIZE} bytes")
+    manifest = json.loads(body.decode('utf-8'))
+    if manifest.get('format') != MANIFEST_FORMAT:
+        raise DeltaError(f"unsupported manifest format {manifest.get('format')}")
+    return manifest, len(body)
+
+
+def _file_sha256(path: str) -> str:
+    hasher = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+def _local_path(installed_dir: str, entry: dict) -> str:
+    parts = entry['path'].split('/')
+    if any(part in ('', '.', '..') for part in parts):
+        raise DeltaError(f"unsafe path in manifest: {entry['path']}")
+    return os.path.join(installed_dir, *parts)
+
+
+def plan(manifest: dict, installed_dir: str) -> Tuple[List[dict], List[dict]]:
+    """Split the manifest's files into those the installed copy has and those to fetch."""
+    reuse, fetch = [], []
+    for entry in manifest['files']:
+        path = _local_path(installed_dir, entry)
+        try:
+            unchanged = os.path.getsize(path) == entry['size'] and _file_sha256(path) == entry['sha256']
+        except OSError:
+            unchanged = False
+        (reuse if unchanged else fetch).append(entry)
+    return reuse, fetch
+
+
+def merge_ranges(entries: List[dict], gap: int = MERGE_GAP,
+                 max_requests: int = MAX_RANGE_REQUESTS) -> List[Tuple[int, int, List[dict]]]:
+    """Group entries into (start, end, entries) byte ranges of the bundle, end exclusive."""
+    ranges = []
+    for entry in sorted(entries, key=lambda e: e['offset']):
+        start = entry['offset']
+        end = start + entry['compressed_size']
+        if ranges and start - ranges[-1][1] <= gap:
+            ranges[-1][1] = max(ranges[-1][1], end)
+            ranges[-1][2].append(entry)
+        else:
+            ranges.append([start, end, [entry]])
+    while len(ranges) > max(1, max_requests):
+        index = min(range(len(ranges) - 1), key=lambda i: ranges[i + 1][0] - ranges[i][1])
+        following = ranges.pop(index + 1)
+        ranges[index][1] = max(ranges[index][1], following[1])
+        ranges[index][2].extend(following[2])
+    return [(start, end, group) for start, end, group in ranges]
+
+
+def _fetch_range(url: str, start: int, end: int, cancel: CancelToken = None) -> bytes:
+    headers = {'User-Agent': USER_AGENT, 'Range': f"bytes={start}-{end - 1}"}
+    with open_url(Request(url, headers=headers), 30, cancel) as response:
+        content_range = response.headers.get('Content-Range', '')
+        if response.status != 206 or not content_range.startswith(f"bytes {start}-{end - 1}/"):
+            raise DeltaError(f"server did not honour the range request (status {response.status})")
+        data = response.read(end - start)
+    if len(data) != end - start:
+        raise DeltaError(f"range {start}-{end - 1} ended after {len(data)} bytes")
+    return data
+
+
+def _inflate(entry: dict, raw: bytes) -> bytes:
+    """Decompress one file's data from the bundle and check it against the manifest."""
+    if entry['compress_type'] == zipfile.ZIP_STORED:
+        data = raw
+    elif entry['compress_type'] == zipfile.ZIP_DEFLATED:
+        inflater = zlib.decompressobj(-zlib.MAX_WBITS)
+        data = inflater.decompress(raw) + inflater.flush()
+    else:
+        raise DeltaError(f"unsupported compression {entry['compress_type']} for {entry['path']}")
+    if len(data) != entry['size'] or hashlib.sha256(data).hexdigest() != entry['sha256']:
+        raise DeltaError(f"{entry['path']} does not match the manifest")
+    return data
+
+
+def assemble(manifest: dict, installed_dir: str, fetched: Dict[str, bytes], dest: str) -> str:
+    """Write the new bundle from fetched and installed files, verify it and move it to dest."""
+    part_path = dest + '.delta.part'
+    with zipfile.ZipFile(part_path, 'w', zipfile.ZIP_DEFLATED) as z:
+        for entry in manifest['files']:
+            data = fetched.get(entry['path'])
+            if data is None:
+                with open(_local_path(installed_dir, entry), 'rb') as f:
+                    data = f.read()
+                if hashlib.sha256(data).hexdigest() != entry['sha256']:
+                    raise DeltaError(f"{entry['path']} changed on disk during the update")
+            info = zipfile.ZipInfo(entry['path'], date_time=(1980, 1, 1, 0, 0, 0))
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.external_attr = 0o644 << 16
+            z.writestr(info, data)
+    with zipfile.ZipFile(part_path) as z:
+        bad = z.testzip()
+        if bad is not None or z.namelist() != [entry['path'] for entry in manifest['files']]:
+            raise DeltaError(f"assembled bundle failed verification ({bad or 'file list differs'})")
+    os.replace(part_path, dest)
+    return dest
+
+
+def download_delta(release_info: dict, installed_dir: str = None, dest_dir: str = None,
+                   progress=None, cancel: CancelToken = None, stats: dict = None) -> Optional[str]:
+    """
+    Build the release's bundle from the installed files plus the ones that changed.
+
+    Returns the path of the assembled bundle, or None when the release has no
+    manifest, the installed add-on cannot be found, the delta would not be
+    much smaller than the bundle, or anything fails; the caller then
+    downloads the whole bundle. stats, when given, receives the bytes
+    transferred even when the delta is abandoned.
+    """
+    stats = stats if stats is not None else {}
+    stats.update(mode='delta', transferred=0)
+    manifest_url = release_info.get('manifest_url')
+    installed_dir = installed_dir or installed_addon_dir()
+    if not manifest_url or not installed_dir:
+        return None
+    start = time.perf_counter()
+    part_path = None
+    try:
+        manifest, stats['transferred'] = fetch_manifest(manifest_url, cancel)
+        bundle = manifest['bundle']
+        asset_name = release_info.get('asset_name') or bundle['name']
+        expected_hex = parse_digest(release_info.get('asset_digest'))
+        if bundle['name'] != asset_name or (expected_hex and bundle['sha256'] != expected_hex) or (
+                release_info.get('asset_size') is not None and bundle['size'] != release_info['asset_size']):
+            raise DeltaError("manifest describes a different bundle")
+
+        reuse, fetch = plan(manifest, installed_dir)
+        ranges = merge_ranges(fetch)
+        needed = sum(end - begin for begin, end, _ in ranges)
+        if needed > bundle['size'] * MAX_DELTA_FRACTION:
+            log.info(f"Delta update would fetch {needed} of {bundle['size']} bytes; downloading the whole bundle")
+            return None
+
+        fetched: Dict[str, bytes] = {}
+        received = 0
+        for begin, end, group in ranges:
+            data = _fetch_range(release_info['download_url'], begin, end, cancel)
+            received += len(data)
+            stats['transferred'] += len(data)
+            for entry in group:
+                offset = entry['offset'] - begin
+                fetched[entry['path']] = _inflate(entry, data[offset:offset + entry['compressed_size']])
+            if progress:
+                progress(received, needed)
+
+        if dest_dir is None:
+            dest_dir = os.path.join(tempfile.gettempdir(), DOWNLOAD_DIR_NAME)
+        os.makedirs(dest_dir, exist_ok=True)
+        if not asset_name.endswith('.nvda-addon'):
+            asset_name = f"{ADDON_NAME}.nvda-addon"
+        dest = os.path.join(dest_dir, os.path.basename(asset_name))
+        part_path = dest + '.delta.part'
+        assemble(manifest, installed_dir, fetched, dest)
+
+        elapsed = time.perf_counter() - start
+        stats.update(size=bundle['size'], files_fetched=len(fetch), files_reused=len(reuse),
+                     requests=len(ranges) + 1, elapsed=elapsed)
+        log.info(
+            f"Delta update: {len(fetch)} of {len(manifest['files'])} files changed, "
+            f"{stats['transferred']} bytes transferred instead of {bundle['size']} in {elapsed:.2f} s"
+        )
+        return dest
+    except (DeltaError, URLError, OSError, http.client.HTTPException, ValueError, KeyError, TypeError) as e:
+        if cancel is not None and cancel.cancelled:
+            log.info("Delta update cancelled")
+        else:
+            log.warning(f"Delta update failed, downloading the whole bundle: {e}")
+        if part_path and os.path.exists(part_path):
+            os.remove(part_path)
+        return None
+
+
+def fetch_update(release_info: dict, progress=None, cancel: CancelToken = None,
+                 dest_dir: str = None, installed_dir: str = None) -> Optional[str]:
+    """Download the release's bundle, as a delta when possible; returns its path or None."""
+    global last_update
+    start = time.perf_counter()
+    stats: dict = {}
+    path = download_delta(release_info, installed_dir, dest_dir, progress, cancel, stats)
+    if path is None and not (cancel is not None and cancel.cancelled):
+        full: dict = {}
+        path = download_addon(
+            release_info['download_url'],
+            release_info.get('asset_name'),
+            expected_size=release_info.get('asset_size'),
+            expected_digest=release_info.get('asset_digest'),
+            progress=progress,
+            dest_dir=dest_dir,
+            cancel=cancel,
+            stats=full,
+        )
+        stats = dict(full, mode='full', transferred=stats.get('transferred', 0) + full.get('transferred', 0))
+    if path is None:
+        return None
+    stats['elapsed'] = time.perf_counter() - start
+    last_update = stats
+    return path
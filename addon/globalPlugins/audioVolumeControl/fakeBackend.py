@@ -0,0 +1,200 @@
+"""
+In-memory stand-ins for the Windows audio session objects.
+
+FakeSessionBackend emits the same session events as PycawSessionBackend, so
+the registry and everything built on it can be exercised on Linux.
+"""
+
+import itertools
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from .processInfo import ProcessTable, ACCESS_DENIED
+from .sessionRegistry import (
+    SessionBackend,
+    SESSION_STATE_ACTIVE,
+    SESSION_STATE_EXPIRED,
+)
+
+
+class FakeSimpleAudioVolume:
+    """Mimics ISimpleAudioVolume, optionally sleeping for latency seconds per call.
+
+    on_change(volume, mute) is called after every successful Set*, like
+    IAudioSessionEvents.OnSimpleVolumeChanged.
+    """
+
+    def __init__(self, volume: float = 1.0, mute: bool = False, latency: float = 0.0, on_change=None):
+        self._volume = volume
+        self._mute = mute
+        self.latency = latency
+        self.on_change = on_change
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _changed(self):
+        if self.on_change:
+            self.on_change(self._volume, self._mute)
+
+    def set_silently(self, volume: Optional[float] = None, mute: Optional[bool] = None):
+        """Change the state without a call or notification, as if an event had been lost."""
+        if volume is not None:
+            self._volume = volume
+        if mute is not None:
+            self._mute = bool(mute)
+
+    def _call(self):
+        with self._lock:
+            self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def GetMasterVolume(self) -> float:
+        self._call()
+        return self._volume
+
+    def SetMasterVolume(self, level: float, event_context):
+        self._call()
+        if not 0.0 <= level <= 1.0:
+            raise ValueError("E_INVALIDARG")
+        self._volume = level
+        self._changed()
+
+    def GetMute(self) -> bool:
+        self._call()
+        return self._mute
+
+    def SetMute(self, mute: bool, event_context):
+        self._call()
+        self._mute = bool(mute)
+        self._changed()
+
+
+class FakeAudioSession:
+    """Mimics the avc_pycaw AudioSession wrapper."""
+
+    def __init__(self, key: str, pid: int, name: str, volume: float = 1.0,
+                 mute: bool = False, latency: float = 0.0):
+        self.InstanceIdentifier = key
+        self.ProcessId = pid
+        self.name = name
+        self.State = SESSION_STATE_ACTIVE
+        self.SimpleAudioVolume = FakeSimpleAudioVolume(volume, mute, latency)
+
+    @property
+    def Process(self):
+        return self.ProcessId or None
+
+
+class FakeSessionBackend(SessionBackend):
+    """Session backend holding fake sessions in memory."""
+
+    def __init__(self, latency: float = 0.0, provides_names: bool = True):
+        super().__init__()
+        self.latency = latency
+        # When False, names are resolved through the process table like real sessions
+        self.provides_names = provides_names
+        self.sessions: Dict[str, FakeAudioSession] = {}
+        self._pid_names: Dict[int, str] = {}
+        self.enumerations = 0
+        self._ids = itertools.count(1)
+
+    def enumerate(self):
+        self.enumerations += 1
+        return [
+            (key, session, session.ProcessId, session.State)
+            for key, session in self.sessions.items()
+        ]
+
+    def watches_volume(self, key) -> bool:
+        return True
+
+    def process_name(self, pid: int) -> Optional[str]:
+        if not self.provides_names:
+            return None
+        return self._pid_names.get(pid)
+
+    def add_session(self, name: str, pid: Optional[int] = None, volume: float = 1.0,
+                    mute: bool = False) -> str:
+        """Create a session, announce it and return its key."""
+        number = next(self._ids)
+        key = f"fake-session-{number}"
+        if pid is None:
+            pid = 1000 + number
+        session = FakeAudioSession(key, pid, name, volume, mute, self.latency)
+        session.SimpleAudioVolume.on_change = (
+            lambda new_volume, new_mute: self._emit_volume_changed(key, new_volume, new_mute)
+        )
+        self.sessions[key] = session
+        self._pid_names[pid] = name
+        self._emit_added(key, session, pid, session.State)
+        return key
+
+    def set_external_volume(self, key: str, volume: Optional[float] = None, mute: Optional[bool] = None):
+        """Change a session's volume as another application would, with notification."""
+        interface = self.sessions[key].SimpleAudioVolume
+        interface.set_silently(volume, mute)
+        interface._changed()
+
+    def set_state(self, key: str, state: int):
+        session = self.sessions[key]
+        session.State = state
+        if state == SESSION_STATE_EXPIRED:
+            del self.sessions[key]
+        self._emit_state_changed(key, state)
+
+    def remove_session(self, key: str):
+        if self.sessions.pop(key, None) is not None:
+            self._emit_removed(key)
+
+
+class FakeProcessTable(ProcessTable):
+    """Process table backed by a dict of {pid: (create_time, name)}."""
+
+    def __init__(self, latency: float = 0.0):
+        self.processes: Dict[int, Tuple[float, object]] = {}
+        self.latency = latency
+        self.queries = 0
+
+    def add(self, pid: int, name: str, create_time: Optional[float] = None, denied: bool = False):
+        if create_time is None:
+            create_time = time.time()
+        self.processes[pid] = (create_time, ACCESS_DENIED if denied else name)
+
+    def exit(self, pid: int):
+        self.processes.pop(pid, None)
+
+    def _query(self):
+        self.queries += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def identity(self, pid: int):
+        self._query()
+        entry = self.processes.get(pid)
+        return entry[0] if entry else None
+
+    def lookup(self, pid: int):
+        self._query()
+        return self.processes.get(pid)
+
+    def snapshot(self):
+        self._query()
+        return dict(self.processes)
+
+
+class FakeForeground:
+    """Scripted foreground-change source for a ForegroundTracker."""
+
+    def __init__(self, tracker):
+        self.tracker = tracker
+
+    def focus(self, pid: int, hwnd: Optional[int] = None):
+        self.tracker.update(hwnd if hwnd is not None else pid * 16, pid)
+
+    def play(self, pids, interval: float = 0.0):
+        for pid in pids:
+            self.focus(pid)
+            if interval:
+                time.sleep(interval)
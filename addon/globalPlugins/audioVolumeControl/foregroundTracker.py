@@ -0,0 +1,115 @@
+"""
+Foreground application tracking.
+
+The tracker is fed by foreground-change events and keeps the current window
+handle, process ID and application name in memory, so asking which
+application is in front is an attribute read instead of a round of win32
+calls and a process lookup.
+"""
+
+import logging
+import threading
+from typing import Callable, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+
+def query_foreground_window() -> Optional[Tuple[int, int]]:
+    """Ask Windows for the foreground window and its process ID."""
+    try:
+        import ctypes
+        from ctypes import wintypes
+        user32 = ctypes.windll.user32
+    except (ImportError, AttributeError):
+        return None
+    hwnd = user32.GetForegroundWindow()
+    if not hwnd:
+        return None
+    pid = wintypes.DWORD()
+    user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+    return hwnd, pid.value
+
+
+class ForegroundTracker:
+    """
+    Holds the current foreground hwnd, pid and application name.
+
+    update() is called from foreground-change events and does no OS work; the
+    name is resolved through name_resolver once per change, on the first read.
+    """
+
+    def __init__(self, name_resolver: Optional[Callable[[int], str]] = None,
+                 query: Callable[[], Optional[Tuple[int, int]]] = query_foreground_window):
+        self.name_resolver = name_resolver
+        self._query = query
+        self._lock = threading.Lock()
+        self.hwnd: Optional[int] = None
+        self.pid: Optional[int] = None
+        self._name: Optional[str] = None
+        self.events = 0
+        self.changes = 0
+        self.resolves = 0
+        self.polls = 0
+
+    @property
+    def has_events(self) -> bool:
+        return self.events > 0
+
+    def update(self, hwnd: int, pid: int):
+        """Record a foreground change; cheap enough to run inside an event handler."""
+        with self._lock:
+            self.events += 1
+            if hwnd == self.hwnd and pid == self.pid:
+                return
+            self.changes += 1
+            self.hwnd = hwnd
+            if pid != self.pid:
+                self.pid = pid
+                self._name = None
+
+    def app_name(self) -> Optional[str]:
+        """Return the foreground application name, polling Windows only while no events arrive."""
+        if not self.has_events:
+            self.poll()
+        if self.pid is None:
+            return None
+        name = self._name
+        if name is not None:
+            return name
+        with self._lock:
+            pid = self.pid
+        if self.name_resolver is None or not pid:
+            return None
+        name = self.name_resolver(pid)
+        self.resolves += 1
+        with self._lock:
+            if self.pid == pid:
+                self._name = name
+        return name
+
+    def poll(self):
+        self.polls += 1
+        try:
+            result = self._query()
+        except Exception as e:
+            log.error(f"Error getting foreground app: {e}")
+            return
+        if result is not None:
+            hwnd, pid = result
+            with self._lock:
+                if hwnd != self.hwnd or pid != self.pid:
+                    self.hwnd = hwnd
+                    self.pid = pid
+                    self._name = None
+
+    def stats(self) -> dict:
+        return {
+            'events': self.events,
+            'changes': self.changes,
+            'resolves': self.resolves,
+            'polls': self.polls,
+        }
+
+
+# Shared tracker, fed by GlobalPlugin.event_foreground
+tracker = ForegroundTracker()
@@ -0,0 +1,143 @@
+"""
+Lightweight hot-path timing.
+
+Code wraps interesting operations in ``with timed("name"):``. While timing is
+disabled that returns a shared no-op context manager, so instrumented code
+pays for little more than a function call. While enabled, each duration is
+added to a per-operation histogram with fixed, roughly logarithmic buckets.
+"""
+
+import bisect
+import threading
+import time
+from typing import Dict, List, Optional
+
+# Bucket upper bounds in seconds, from 1 microsecond to 10 seconds
+BUCKETS = tuple(
+    base * scale
+    for scale in (1e-6, 1e-5, 1e-4, 1e-3, 1e-2, 1e-1, 1.0)
+    for base in (1, 2, 5)
+) + (10.0,)
+
+enabled = False
+_lock = threading.Lock()
+_histograms: Dict[str, "Histogram"] = {}
+
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = 0.0
+
+    def add(self, seconds: float):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, fraction: float) -> float:
+        """Upper bound of the bucket holding the given fraction of samples."""
+        if not self.count:
+            return 0.0
+        target = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target and count:
+                return min(BUCKETS[index], self.max) if index < len(BUCKETS) else self.max
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class _Timer:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def timed(name: str):
+    """Context manager timing the enclosed block as operation name."""
+    if not enabled:
+        return _NULL_TIMER
+    return _Timer(name)
+
+
+def record(name: str, seconds: float):
+    if not enabled:
+        return
+    with _lock:
+        histogram = _histograms.get(name)
+        if histogram is None:
+            histogram = _histograms[name] = Histogram()
+        histogram.add(seconds)
+
+
+def enable(state: bool = True):
+    global enabled
+    enabled = state
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+
+
+def get(name: str) -> Optional[Histogram]:
+    return _histograms.get(name)
+
+
+def summary() -> Dict[str, dict]:
+    """Per-operation count and latency figures in milliseconds."""
+    with _lock:
+        items = list(_histograms.items())
+    return {
+        name: {
+            'count': h.count,
+            'mean_ms': round(h.mean * 1000, 3),
+            'p50_ms': round(h.percentile(0.50) * 1000, 3),
+            'p95_ms': round(h.percentile(0.95) * 1000, 3),
+            'max_ms': round(h.max * 1000, 3),
+        }
+        for name, h in sorted(items)
+    }
+
+
+def report_lines() -> List[str]:
+    lines = []
+    for name, s in summary().items():
+        lines.append(
+            f"{name}: n={s['count']} mean={s['mean_ms']}ms p50<={s['p50_ms']}ms "
+            f"p95<={s['p95_ms']}ms max={s['max_ms']}ms"
+        )
+    return lines
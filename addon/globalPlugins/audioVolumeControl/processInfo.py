@@ -0,0 +1,232 @@
+"""
+Process metadata service.
+
+Resolves process IDs to display names, one at a time or in bulk, and keeps
+the results in a bounded cache that checks each PID's creation time, so a
+recycled PID can never return the name of the process that used it before.
+"""
+
+import abc
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+from . import instrumentation
+
+log = logging.getLogger(__name__)
+
+# Returned by process tables for processes that exist but cannot be inspected
+ACCESS_DENIED = object()
+
+
+def normalize_process_name(name: str) -> str:
+    if name.lower().endswith('.exe'):
+        name = name[:-4]
+    return name
+
+
+class ProcessTable(abc.ABC):
+    """Source of process identity and names."""
+
+    @abc.abstractmethod
+    def identity(self, pid: int) -> Optional[float]:
+        """Return the creation time of pid, None if it does not exist, or ACCESS_DENIED."""
+
+    @abc.abstractmethod
+    def lookup(self, pid: int) -> Optional[Tuple[float, object]]:
+        """Return (create_time, name) of pid in one query, or None if it does not exist.
+
+        name is ACCESS_DENIED if it cannot be read; create_time is ACCESS_DENIED
+        if the process cannot be inspected at all.
+        """
+
+    @abc.abstractmethod
+    def snapshot(self) -> Dict[int, Tuple[float, object]]:
+        """Return {pid: (create_time, name)} for every running process in one pass.
+
+        name is ACCESS_DENIED for processes whose name cannot be read.
+        """
+
+
+class PsutilProcessTable(ProcessTable):
+    def __init__(self, psutil_module):
+        self._psutil = psutil_module
+
+    def identity(self, pid: int):
+        try:
+            return self._psutil.Process(pid).create_time()
+        except self._psutil.NoSuchProcess:
+            return None
+        except self._psutil.AccessDenied:
+            return ACCESS_DENIED
+
+    def lookup(self, pid: int):
+        try:
+            process = self._psutil.Process(pid)
+        except self._psutil.NoSuchProcess:
+            return None
+        except self._psutil.AccessDenied:
+            return (ACCESS_DENIED, ACCESS_DENIED)
+        try:
+            with process.oneshot():
+                return (process.create_time(), process.name() or ACCESS_DENIED)
+        except self._psutil.NoSuchProcess:
+            return None
+        except self._psutil.AccessDenied:
+            return (process.create_time(), ACCESS_DENIED)
+
+    def snapshot(self):
+        result = {}
+        for process in self._psutil.process_iter(['name', 'create_time']):
+            info = process.info
+            create_time = info.get('create_time')
+            name = info.get('name')
+            result[process.pid] = (create_time, name if name else ACCESS_DENIED)
+        return result
+
+
+class ProcessInfoService:
+    """PID-to-name resolver with a bounded LRU cache of {pid: (create_time, name)}."""
+
+    def __init__(self, table: ProcessTable, max_entries: int = 512):
+        self.table = table
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[int, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.os_queries = 0
+        self.bulk_passes = 0
+        self.evictions = 0
+        self.lookup_time = 0.0
+
+    def resolve(self, pid: int) -> str:
+        """Resolve a single pid, validating any cached name against the process creation time.
+
+        A cached pid costs one creation time query; an unknown or recycled one
+        costs a single process lookup, never a pass over the process table.
+        """
+        start = time.perf_counter()
+        try:
+            with self._lock:
+                cached = self._cache.get(pid)
+            if cached is not None:
+                self.os_queries += 1
+                create_time = self.table.identity(pid)
+                if create_time is None:
+                    log.warning(f"Process {pid} no longer exists")
+                    self.forget(pid)
+                    return f"Unknown Process ({pid})"
+                if create_time is ACCESS_DENIED:
+                    log.warning(f"Access denied to process {pid}")
+                    return f"System Process ({pid})"
+                with self._lock:
+                    if create_time == cached[0] and pid in self._cache:
+                        self._cache.move_to_end(pid)
+                        self.hits += 1
+                        return cached[1]
+            with self._lock:
+                self.misses += 1
+            return self._lookup(pid)
+        except Exception as e:
+            log.error(f"Error getting process name for PID {pid}: {e}")
+            return f"Process {pid}"
+        finally:
+            elapsed = time.perf_counter() - start
+            self.lookup_time += elapsed
+            instrumentation.record("resolve_pid", elapsed)
+
+    def _lookup(self, pid: int) -> str:
+        self.os_queries += 1
+        entry = self.table.lookup(pid)
+        if entry is None:
+            log.warning(f"Process {pid} no longer exists")
+            self.forget(pid)
+            return f"Unknown Process ({pid})"
+        create_time, name = entry
+        if name is ACCESS_DENIED:
+            log.warning(f"Access denied to process {pid}")
+            return f"System Process ({pid})"
+        name = normalize_process_name(name)
+        with self._lock:
+            self._store(pid, create_time, name)
+        return name
+
+    def resolve_many(self, pids: Iterable[int]) -> Dict[int, str]:
+        """Resolve every pid in pids with a single pass over the process table."""
+        pids = list(pids)
+        start = time.perf_counter()
+        try:
+            self.os_queries += 1
+            self.bulk_passes += 1
+            table = self.table.snapshot()
+        except Exception as e:
+            log.error(f"Error reading process table: {e}")
+            return {pid: f"Process {pid}" for pid in pids}
+        finally:
+            elapsed = time.perf_counter() - start
+            self.lookup_time += elapsed
+            instrumentation.record("process_table_snapshot", elapsed)
+
+        result = {}
+        with self._lock:
+            self._evict_exited(table)
+            for pid in pids:
+                entry = table.get(pid)
+                if entry is None:
+                    log.warning(f"Process {pid} no longer exists")
+                    result[pid] = f"Unknown Process ({pid})"
+                    continue
+                create_time, name = entry
+                if name is ACCESS_DENIED:
+                    log.warning(f"Access denied to process {pid}")
+                    result[pid] = f"System Process ({pid})"
+                    continue
+                cached = self._cache.get(pid)
+                if cached is not None and cached[0] == create_time:
+                    self.hits += 1
+                    self._cache.move_to_end(pid)
+                    result[pid] = cached[1]
+                    continue
+                self.misses += 1
+                name = normalize_process_name(name)
+                self._store(pid, create_time, name)
+                result[pid] = name
+        return result
+
+    def forget(self, pid: int):
+        with self._lock:
+            self._evict_pid(pid)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self) -> dict:
+        return {
+            'entries': len(self._cache),
+            'hits': self.hits,
+            'misses': self.misses,
+            'os_queries': self.os_queries,
+            'bulk_passes': self.bulk_passes,
+            'evictions': self.evictions,
+            'lookup_ms': round(self.lookup_time * 1000.0, 3),
+        }
+
+    def _store(self, pid: int, create_time: float, name: str):
+        self._cache[pid] = (create_time, name)
+        self._cache.move_to_end(pid)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+            self.evictions += 1
+
+    def _evict_exited(self, table: dict):
+        for pid in [p for p, (create_time, _) in self._cache.items() if table.get(p, (None,))[0] != create_time]:
+            del self._cache[pid]
+            self.evictions += 1
+
+    def _evict_pid(self, pid: int):
+        if self._cache.pop(pid, None) is not None:
+            self.evictions += 1
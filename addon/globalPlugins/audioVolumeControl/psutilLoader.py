@@ -0,0 +1,174 @@
+"""
+Import hook for the bundled psutil C extension.
+
+The bundle ships one ``_psutil_windows`` extension per interpreter and
+architecture, tagged in its file name. PsutilExtensionFinder maps the running
+interpreter to the matching file and loads it in place, so nothing has to be
+copied or renamed at startup. The resolved file name is remembered in a small
+JSON cache so later starts skip the probing.
+"""
+
+import importlib.machinery
+import importlib.util
+import json
+import logging
+import os
+import struct
+import sys
+from typing import List, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+EXTENSION_MODULE = "psutil._psutil_windows"
+CACHE_FILE_NAME = "_resolution.json"
+# Cache format version, bump when the probing rules change
+CACHE_VERSION = 1
+
+
+def platform_tag() -> str:
+    return "win_amd64" if struct.calcsize("P") * 8 == 64 else "win32"
+
+
+def candidate_names(version_info=None, plat_tag: Optional[str] = None, free_threaded: bool = False) -> List[str]:
+    """Extension file names that can serve the given interpreter, best match first."""
+    if version_info is None:
+        version_info = sys.version_info
+    if plat_tag is None:
+        plat_tag = platform_tag()
+    py_tag = f"cp{version_info[0]}{version_info[1]}"
+    names = []
+    # CPython 3.7+ can use the cp37 stable ABI build, except free-threaded builds
+    if (version_info[0], version_info[1]) >= (3, 7) and not free_threaded:
+        names.append(f"_psutil_windows.cp37-{plat_tag}.pyd")
+    names.append(f"_psutil_windows.{py_tag}-{plat_tag}.pyd")
+    return names
+
+
+def extension_tag(name: str) -> str:
+    """Interpreter and platform tag of an extension file name, such as "cp37-win32"."""
+    return name[len("_psutil_windows."):-len(".pyd")]
+
+
+def _is_free_threaded() -> bool:
+    try:
+        import sysconfig
+        return bool(sysconfig.get_config_var("Py_GIL_DISABLED"))
+    except Exception:
+        return False
+
+
+def _cache_key() -> str:
+    return f"{CACHE_VERSION}|{sys.version}|{platform_tag()}"
+
+
+class _TaggedExtensionLoader(importlib.machinery.ExtensionFileLoader):
+    """Extension loader that makes the stable ABI helper DLL directory visible while loading."""
+
+    def __init__(self, fullname: str, path: str, dll_dir: Optional[str]):
+        super().__init__(fullname, path)
+        self.dll_dir = dll_dir
+
+    def create_module(self, spec):
+        if not self.dll_dir:
+            return super().create_module(spec)
+        cookie = None
+        old_path = os.environ.get('PATH', '')
+        try:
+            if hasattr(os, 'add_dll_directory'):
+                cookie = os.add_dll_directory(self.dll_dir)
+            else:
+                os.environ['PATH'] = self.dll_dir + os.pathsep + old_path
+            return super().create_module(spec)
+        finally:
+            if cookie is not None:
+                cookie.close()
+            else:
+                os.environ['PATH'] = old_path
+
+
+class PsutilExtensionFinder:
+    """Meta path finder serving psutil._psutil_windows from a tagged file in psutil_dir."""
+
+    def __init__(self, psutil_dir: str):
+        self.psutil_dir = psutil_dir
+        self._resolution: Optional[Tuple[str, Optional[str]]] = None
+
+    def find_spec(self, fullname, path=None, target=None):
+        if fullname != EXTENSION_MODULE:
+            return None
+        resolution = self.resolve()
+        if resolution is None:
+            return None
+        extension_path, dll_dir = resolution
+        loader = _TaggedExtensionLoader(fullname, extension_path, dll_dir)
+        return importlib.util.spec_from_file_location(fullname, extension_path, loader=loader)
+
+    def invalidate_caches(self):
+        self._resolution = None
+
+    def resolve(self) -> Optional[Tuple[str, Optional[str]]]:
+        """Return (extension_path, dll_dir) for the running interpreter, or None."""
+        if self._resolution is None:
+            self._resolution = self._load_cached() or self._probe()
+        return self._resolution
+
+    def _cache_path(self) -> str:
+        return os.path.join(self.psutil_dir, CACHE_FILE_NAME)
+
+    def _load_cached(self):
+        try:
+            with open(self._cache_path(), "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get("key") != _cache_key():
+            return None
+        extension_path = os.path.join(self.psutil_dir, data.get("extension", ""))
+        if not os.path.isfile(extension_path):
+            return None
+        dll_dir = data.get("dll_dir")
+        if dll_dir is not None:
+            dll_dir = os.path.join(self.psutil_dir, dll_dir)
+        return (extension_path, dll_dir)
+
+    def _probe(self):
+        plat_tag = platform_tag()
+        extension_name = None
+        for name in candidate_names(plat_tag=plat_tag, free_threaded=_is_free_threaded()):
+            if os.path.isfile(os.path.join(self.psutil_dir, name)):
+                extension_name = name
+                break
+        if extension_name is None:
+            log.error(f"VolumeControl: No tagged psutil C extension for {plat_tag} in {self.psutil_dir}")
+            return None
+
+        # Stable ABI builds link against python3.dll, which embedded interpreters may not ship.
+        dll_dir = None
+        for candidate in (plat_tag, ""):
+            if os.path.isfile(os.path.join(self.psutil_dir, candidate, "python3.dll")):
+                dll_dir = candidate
+                break
+
+        log.info(f"VolumeControl: Resolved psutil C extension {extension_name}")
+        try:
+            with open(self._cache_path(), "w", encoding="utf-8") as f:
+                json.dump({"key": _cache_key(), "extension": extension_name, "dll_dir": dll_dir}, f)
+        except OSError as e:
+            log.debug(f"VolumeControl: Could not write psutil resolution cache: {e}")
+        return (
+            os.path.join(self.psutil_dir, extension_name),
+            os.path.join(self.psutil_dir, dll_dir) if dll_dir is not None else None,
+        )
+
+
+def install_psutil_finder(psutil_dir: str) -> Optional[PsutilExtensionFinder]:
+    """Register a PsutilExtensionFinder for psutil_dir once and return it."""
+    for finder in sys.meta_path:
+        if isinstance(finder, PsutilExtensionFinder):
+            if finder.psutil_dir == psutil_dir:
+                return finder
+    if not os.path.isdir(psutil_dir):
+        return None
+    finder = PsutilExtensionFinder(psutil_dir)
+    sys.meta_path.insert(0, finder)
+    return finder
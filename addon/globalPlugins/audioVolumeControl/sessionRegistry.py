@@ -0,0 +1,412 @@
+"""
+Event-driven registry of audio sessions.
+
+The registry keeps the current list of sessions in memory and updates it from
+session notifications (IAudioSessionNotification / IAudioSessionEvents)
+delivered by a pluggable backend, so reading the list never touches COM and a
+refresh only costs as much as the number of sessions that changed.
+"""
+
+import abc
+import bisect
+import logging
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .instrumentation import timed
+
+log = logging.getLogger(__name__)
+
+# AudioSessionState values from audiopolicy.h
+SESSION_STATE_INACTIVE = 0
+SESSION_STATE_ACTIVE = 1
+SESSION_STATE_EXPIRED = 2
+
+# Change kinds passed to registry listeners
+SESSION_ADDED = "added"
+SESSION_REMOVED = "removed"
+SESSION_CHANGED = "changed"
+SESSION_VOLUME_CHANGED = "volume"
+
+
+class SessionBackend(abc.ABC):
+    """
+    Source of audio session lifecycle events.
+
+    A backend enumerates the sessions that exist when it starts and then
+    reports changes to its listener by calling the ``_emit_*`` helpers.
+    Sessions are identified by a stable, hashable key.
+    """
+
+    # Whether the backend delivers change notifications. Backends that cannot
+    # are resynchronised with a full enumeration on every refresh.
+    supports_notifications = True
+
+    def __init__(self):
+        self._listener = None
+
+    def start(self, listener):
+        """Start delivering events to listener and return the initial sessions.
+
+        Returns a list of (key, raw_session, pid, state) tuples.
+        """
+        self._listener = listener
+        return self.enumerate()
+
+    def stop(self):
+        self._listener = None
+
+    @abc.abstractmethod
+    def enumerate(self) -> List[Tuple[object, object, int, int]]:
+        """Return the (key, raw_session, pid, state) tuple of every current session."""
+
+    def process_name(self, pid: int) -> Optional[str]:
+        """Return a known process name for pid, or None to resolve it from the OS."""
+        return None
+
+    def watches_volume(self, key) -> bool:
+        """Whether volume change notifications are delivered for the session with key."""
+        return False
+
+    def _emit_added(self, key, raw_session, pid: int, state: int):
+        if self._listener is not None:
+            self._listener.on_session_added(key, raw_session, pid, state)
+
+    def _emit_state_changed(self, key, state: int):
+        if self._listener is not None:
+            self._listener.on_session_state_changed(key, state)
+
+    def _emit_removed(self, key):
+        if self._listener is not None:
+            self._listener.on_session_removed(key)
+
+    def _emit_volume_changed(self, key, volume: float, mute: bool):
+        """volume is the scalar (0.0-1.0) reported by OnSimpleVolumeChanged."""
+        if self._listener is not None:
+            self._listener.on_session_volume_changed(key, volume, mute)
+
+
+class PycawSessionBackend(SessionBackend):
+    """Backend driven by Windows Core Audio session notifications through avc_pycaw."""
+
+    def __init__(self):
+        super().__init__()
+        self._manager = None
+        self._notification = None
+        self._session_events = {}
+        self._lock = threading.Lock()
+
+    def start(self, listener):
+        from avc_pycaw.utils import AudioUtilities
+        from avc_pycaw.callbacks import AudioSessionNotification
+
+        self._listener = listener
+        self._manager = AudioUtilities.GetAudioSessionManager()
+        if self._manager is None:
+            raise RuntimeError("No default audio endpoint")
+
+        backend = self
+
+        class _Notification(AudioSessionNotification):
+            def on_session_created(self, new_session):
+                backend._on_session_created(new_session)
+
+        # Session notifications are only delivered once the session list has
+        # been enumerated, so enumerate before registering.
+        initial = self.enumerate()
+        self._notification = _Notification()
+        self._manager.RegisterSessionNotification(self._notification)
+        return initial
+
+    def stop(self):
+        with self._lock:
+            events = list(self._session_events.values())
+            self._session_events.clear()
+        for session, _ in events:
+            try:
+                session.unregister_notification()
+            except Exception as e:
+                log.debug(f"Failed to unregister session events: {e}")
+        if self._manager is not None and self._notification is not None:
+            try:
+                self._manager.UnregisterSessionNotification(self._notification)
+            except Exception as e:
+                log.debug(f"Failed to unregister session notification: {e}")
+        self._notification = None
+        self._manager = None
+        super().stop()
+
+    def watches_volume(self, key) -> bool:
+        with self._lock:
+            return key in self._session_events
+
+    def enumerate(self):
+        from avc_pycaw.utils import AudioUtilities
+
+        result = []
+        with timed("GetAllSessions"):
+            raw_sessions = AudioUtilities.GetAllSessions()
+        for session in raw_sessions:
+            entry = self._track(session)
+            if entry:
+                result.append(entry)
+        return result
+
+    def _track(self, session):
+        try:
+            key = session.InstanceIdentifier
+            pid = session.ProcessId
+            state = session.State
+        except Exception as e:
+            log.error(f"Error reading session identity: {e}")
+            return None
+        with self._lock:
+            known = key in self._session_events
+        if not known:
+            self._register_events(key, session)
+        return (key, session, pid, state)
+
+    def _register_events(self, key, session):
+        from avc_pycaw.callbacks import AudioSessionEvents
+
+        backend = self
+
+        class _Events(AudioSessionEvents):
+            def on_simple_volume_changed(self, new_volume, new_mute, event_context):
+                backend._emit_volume_changed(key, new_volume, new_mute)
+
+            def on_state_changed(self, new_state, new_state_id):
+                backend._emit_state_changed(key, new_state_id)
+
+            def on_session_disconnected(self, disconnect_reason, disconnect_reason_id):
+                backend._forget(key)
+                backend._emit_removed(key)
+
+        events = _Events()
+        try:
+            session.register_notification(events)
+        except Exception as e:
+            log.debug(f"Failed to register session events: {e}")
+            return
+        with self._lock:
+            self._session_events[key] = (session, events)
+
+    def _forget(self, key):
+        with self._lock:
+            entry = self._session_events.pop(key, None)
+        if entry:
+            try:
+                entry[0].unregister_notification()
+            except Exception:
+                pass
+
+    def _on_session_created(self, new_session):
+        try:
+            from avc_pycaw.pycaw import IAudioSessionControl2
+            from avc_pycaw.utils import AudioSession as PycawAudioSession
+
+            session = PycawAudioSession(new_session.QueryInterface(IAudioSessionControl2))
+        except Exception as e:
+            log.error(f"Failed to wrap new audio session: {e}")
+            return
+        entry = self._track(session)
+        if entry:
+            self._emit_added(*entry)
+
+
+class SessionRegistry:
+    """
+    Persistent, name-sorted view of the live audio sessions.
+
+    session_factory(raw_session, pid, name) builds the object stored for a
+    session, or returns None to ignore it. name_resolver(pid) returns the
+    display name for a process; names_resolver(pids), when given, resolves a
+    whole batch at once and is used for full enumerations.
+    """
+
+    def __init__(self, backend: SessionBackend, session_factory: Callable, name_resolver: Callable[[int], str],
+                 names_resolver: Optional[Callable[[List[int]], Dict[int, str]]] = None):
+        self.backend = backend
+        self._session_factory = session_factory
+        self._name_resolver = name_resolver
+        self._names_resolver = names_resolver
+        self._lock = threading.RLock()
+        self._by_key: Dict[object, object] = {}
+        # Casefolded process name -> keys of that application's sessions
+        self._by_name: Dict[str, List[object]] = {}
+        self._order: List[Tuple[str, str]] = []
+        self._snapshot: Optional[Tuple] = ()
+        self._listeners: List[Callable] = []
+        self._started = False
+        self.generation = 0
+        self.pending_changes = 0
+
+    @property
+    def started(self) -> bool:
+        return self._started
+
+    def start(self):
+        with self._lock:
+            if self._started:
+                return
+            initial = self.backend.start(self)
+            names = self._resolve_names(initial)
+            for key, raw_session, pid, state in initial:
+                self._add(key, raw_session, pid, state, names.get(pid))
+            self._started = True
+            log.info(f"Session registry started with {len(self._by_key)} sessions")
+
+    def stop(self):
+        with self._lock:
+            if not self._started:
+                return
+            self._started = False
+        try:
+            self.backend.stop()
+        except Exception as e:
+            log.error(f"Error stopping session backend: {e}")
+
+    def add_listener(self, callback: Callable):
+        """Register callback(kind, session) to be called after each change."""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable):
+        try:
+            self._listeners.remove(callback)
+        except ValueError:
+            pass
+
+    def sessions(self) -> Tuple:
+        """Return the current sessions sorted by name. O(1) when nothing changed."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._lock:
+                if self._snapshot is None:
+                    self._snapshot = tuple(self._by_key[key] for _, key in self._order)
+                snapshot = self._snapshot
+        return snapshot
+
+    def get(self, key):
+        return self._by_key.get(key)
+
+    def find(self, name: str) -> Tuple:
+        """Return the sessions of the application called name, compared case-insensitively."""
+        keys = self._by_name.get(name.casefold(), ())
+        return tuple(self._by_key[key] for key in keys if key in self._by_key)
+
+    def __len__(self):
+        return len(self._by_key)
+
+    def refresh(self) -> int:
+        """Bring the registry up to date and return the number of changes applied
+        since the previous refresh. Only backends without notifications rescan."""
+        if not self.backend.supports_notifications:
+            self.resync()
+        with self._lock:
+            changes = self.pending_changes
+            self.pending_changes = 0
+        return changes
+
+    def resync(self):
+        """Reconcile the registry against a full enumeration of the backend."""
+        current = self.backend.enumerate()
+        with self._lock:
+            added = [entry for entry in current if entry[0] not in self._by_key]
+            names = self._resolve_names(added)
+            seen = set()
+            for key, raw_session, pid, state in current:
+                seen.add(key)
+                if state == SESSION_STATE_EXPIRED:
+                    self._remove(key)
+                elif key not in self._by_key:
+                    self._add(key, raw_session, pid, state, names.get(pid))
+            for key in [k for k in self._by_key if k not in seen]:
+                self._remove(key)
+
+    # Backend listener interface. Called from COM notification threads.
+
+    def on_session_added(self, key, raw_session, pid: int, state: int):
+        with self._lock:
+            self._add(key, raw_session, pid, state)
+
+    def on_session_state_changed(self, key, state: int):
+        with self._lock:
+            if state == SESSION_STATE_EXPIRED:
+                self._remove(key)
+                return
+            session = self._by_key.get(key)
+            if session is not None:
+                session.state = state
+                self._changed(SESSION_CHANGED, session)
+
+    def on_session_removed(self, key):
+        with self._lock:
+            self._remove(key)
+
+    def on_session_volume_changed(self, key, volume: float, mute: bool):
+        session = self._by_key.get(key)
+        if session is None:
+            return
+        session.update_cache(volume * 100.0, mute)
+        # Volume changes do not affect the session list, so the snapshot and
+        # generation are left alone.
+        self._notify(SESSION_VOLUME_CHANGED, session)
+
+    def _resolve_names(self, entries) -> Dict[int, str]:
+        pids = [pid for _, _, pid, _ in entries if pid and self.backend.process_name(pid) is None]
+        if not pids or self._names_resolver is None:
+            return {}
+        try:
+            return self._names_resolver(pids)
+        except Exception as e:
+            log.error(f"Bulk process name resolution failed: {e}")
+            return {}
+
+    def _add(self, key, raw_session, pid: int, state: int, name: Optional[str] = None):
+        if key in self._by_key or not pid or state == SESSION_STATE_EXPIRED:
+            return
+        if name is None:
+            name = self.backend.process_name(pid) or self._name_resolver(pid)
+        try:
+            session = self._session_factory(raw_session, pid, name)
+        except Exception as e:
+            log.error(f"Error processing session: {e}")
+            return
+        if session is None:
+            return
+        session.key = key
+        session.state = state
+        session.cache_enabled = self.backend.watches_volume(key)
+        self._by_key[key] = session
+        self._by_name.setdefault(name.casefold(), []).append(key)
+        bisect.insort(self._order, (name.lower(), key))
+        self._changed(SESSION_ADDED, session)
+
+    def _remove(self, key):
+        session = self._by_key.pop(key, None)
+        if session is None:
+            return
+        entry = (session.name.lower(), key)
+        index = bisect.bisect_left(self._order, entry)
+        if index < len(self._order) and self._order[index] == entry:
+            del self._order[index]
+        name_key = session.name.casefold()
+        keys = self._by_name.get(name_key)
+        if keys is not None:
+            keys.remove(key)
+            if not keys:
+                del self._by_name[name_key]
+        self._changed(SESSION_REMOVED, session)
+
+    def _changed(self, kind: str, session):
+        self._snapshot = None
+        self.generation += 1
+        self.pending_changes += 1
+        self._notify(kind, session)
+
+    def _notify(self, kind: str, session):
+        for callback in list(self._listeners):
+            try:
+                callback(kind, session)
+            except Exception as e:
+                log.error(f"Session registry listener failed: {e}")
@@ -0,0 +1,165 @@
+"""
+Warm snapshot of the audio sessions, their volumes and mute states.
+
+A background worker keeps the snapshot current so the volume dialog can be
+rendered straight from memory when the gesture is pressed, and only
+reconcile with the audio engine once it already has focus.
+"""
+
+import logging
+import threading
+import time
+from collections import namedtuple
+from typing import Optional, Tuple
+
+from .sessionRegistry import SESSION_VOLUME_CHANGED
+
+log = logging.getLogger(__name__)
+
+SnapshotEntry = namedtuple("SnapshotEntry", ("session", "volume", "muted"))
+
+
+class SessionSnapshot:
+    def __init__(self, entries: Tuple[SnapshotEntry, ...], generation: int):
+        self.entries = entries
+        self.generation = generation
+        self.taken_at = time.monotonic()
+
+    def __len__(self):
+        return len(self.entries)
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.taken_at
+
+
+def co_initialize() -> bool:
+    try:
+        import comtypes
+        comtypes.CoInitializeEx(comtypes.COINIT_MULTITHREADED)
+        return True
+    except Exception:
+        return False
+
+
+def co_uninitialize():
+    try:
+        import comtypes
+        comtypes.CoUninitialize()
+    except Exception:
+        pass
+
+
+class SnapshotWorker:
+    """
+    Background thread that rebuilds the session snapshot after startup and
+    whenever the session registry reports a change to the session list.
+    Bursts of change notifications are coalesced into one rebuild. Volume
+    and mute changes only patch the entry of their session.
+    """
+
+    def __init__(self, initial_delay: float = 2.0, coalesce_delay: float = 0.25):
+        self.initial_delay = initial_delay
+        self.coalesce_delay = coalesce_delay
+        self._snapshot: Optional[SessionSnapshot] = None
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._registry = None
+        self.refreshes = 0
+        self.last_refresh_time = 0.0
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="AudioVolumeControlSnapshot", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        self._stopping.set()
+        self._wake.set()
+        if self._registry is not None:
+            self._registry.remove_listener(self._on_registry_change)
+            self._registry = None
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def latest(self) -> Optional[SessionSnapshot]:
+        return self._snapshot
+
+    def schedule(self):
+        """Request a rebuild; safe to call from any thread."""
+        self._wake.set()
+
+    def refresh_now(self) -> Optional[SessionSnapshot]:
+        """Rebuild the snapshot on the calling thread."""
+        from .audioSessionManager import AudioSessionManager
+        from .volumeController import VolumeController
+
+        start = time.perf_counter()
+        sessions = AudioSessionManager.get_active_sessions()
+        registry = AudioSessionManager.get_registry()
+        if registry is not None and registry is not self._registry:
+            if self._registry is not None:
+                self._registry.remove_listener(self._on_registry_change)
+            registry.add_listener(self._on_registry_change)
+            self._registry = registry
+        entries = tuple(
+            SnapshotEntry(
+                session,
+                VolumeController.get_volume(session),
+                VolumeController.get_mute_state(session),
+            )
+            for session in sessions
+        )
+        generation = registry.generation if registry is not None else self.refreshes
+        snapshot = SessionSnapshot(entries, generation)
+        self._snapshot = snapshot
+        self.refreshes += 1
+        self.last_refresh_time = time.perf_counter() - start
+        log.debug(
+            f"Session snapshot refreshed: {len(entries)} sessions in {self.last_refresh_time * 1000:.1f} ms"
+        )
+        return snapshot
+
+    def _on_registry_change(self, kind, session):
+        if kind == SESSION_VOLUME_CHANGED:
+            self._patch(session)
+        else:
+            self._wake.set()
+
+    def _patch(self, session):
+        """Carry the cached volume and mute state of session into the snapshot."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return
+        volume = session.cached_volume
+        muted = session.cached_mute
+        snapshot.entries = tuple(
+            entry._replace(
+                volume=entry.volume if volume is None else volume,
+                muted=entry.muted if muted is None else muted,
+            ) if entry.session is session else entry
+            for entry in snapshot.entries
+        )
+
+    def _run(self):
+        com_initialized = co_initialize()
+        try:
+            if self._stopping.wait(self.initial_delay):
+                return
+            while not self._stopping.is_set():
+                try:
+                    self.refresh_now()
+                except Exception as e:
+                    log.error(f"Failed to refresh session snapshot: {e}")
+                self._wake.wait()
+                if self._stopping.is_set():
+                    break
+                # Let a burst of session events settle before rebuilding.
+                self._stopping.wait(self.coalesce_delay)
+                self._wake.clear()
+        finally:
+            if com_initialized:
+                co_uninitialize()
@@ -12,9 +12,19 @@ import os
 import tempfile
 import shutil
 import gc
-from urllib.request import urlopen, Request
+import functools
+import hashlib
+import http.client
+import random
+import socket
+import time
+import weakref
+from email.utils import parsedate_to_datetime
+from urllib.request import urlopen, build_opener, Request, HTTPHandler, HTTPSHandler
 from urllib.error import URLError, HTTPError
 
+from .instrumentation import timed
+
 try:
     import wx
     import gui
@@ -32,6 +42,33 @@ except ImportError:
 GITHUB_API_URL = "https://api.github.com/repos/JoaoDEVWHADS/nvda-audio-volume-control-application/releases/latest"
 USER_AGENT = "NVDA-AudioVolumeControl-UpdateChecker/1.0"
 
+# Last release response, kept in the NVDA configuration folder
+UPDATE_CACHE_FILE = "audioVolumeControlUpdate.json"
+# Longest wait honoured from Retry-After or the rate limit headers
+MAX_RETRY_DELAY = 24 * 60 * 60
+
+# Downloads go to this folder under the temp directory, so an interrupted one can be resumed
+DOWNLOAD_DIR_NAME = "nvda_addon_update"
+# Bounds of the download read size, which follows the observed throughput
+MIN_CHUNK_SIZE = 8 * 1024
+MAX_CHUNK_SIZE = 1024 * 1024
+# Reads are sized to take about this long, keeping progress reports regular
+TARGET_CHUNK_TIME = 0.1
+# Download attempts in a row without progress before giving up
+DOWNLOAD_RETRIES = 5
+
+# Suffix of the release asset listing the files in the bundle, see deltaUpdate
+MANIFEST_SUFFIX = ".files.json"
+# Marks bundles carrying only one interpreter's psutil extension, followed by its tag
+SLIM_MARKER = ".slim-"
+
+# Seconds between periodic update checks
+DEFAULT_CHECK_INTERVAL = 24 * 60 * 60
+# Seconds after NVDA starts before the first check that is due
+FIRST_CHECK_DELAY = 3.0
+# Retry delay after the first failed check, doubled for each further failure
+RETRY_BASE_DELAY = 60.0
+
 # Current version - must match buildVars.py addon_version
 try:
     import addonHandler
@@ -97,84 +134,394 @@ def compare_versions(current: str, remote: str) -> int:
     return 0
 
 
-def fetch_latest_release() -> dict:
+class CancelToken:
+    """
+    Cancels network requests made with it from another thread.
+    
+    Sockets opened through open_url register with the token, and cancel()
+    shuts them down, so a blocked read returns at once instead of running
+    into its timeout.
+    """
+    
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        # urllib hands the socket over to the response, so track sockets
+        # rather than connections; they drop out once closed and collected.
+        self._sockets = weakref.WeakSet()
+    
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+    
+    def wait(self, timeout: float) -> bool:
+        """Sleep for timeout seconds or until cancelled; returns True if cancelled."""
+        return self._event.wait(timeout)
+    
+    def cancel(self):
+        self._event.set()
+        with self._lock:
+            sockets = list(self._sockets)
+        for sock in sockets:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+    
+    def attach(self, sock):
+        with self._lock:
+            self._sockets.add(sock)
+        if self.cancelled:
+            raise URLError("request cancelled")
+
+
+class _CancellableConnection:
+    def __init__(self, *args, cancel_token: CancelToken = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cancel_token = cancel_token
+    
+    def connect(self):
+        if self.cancel_token.cancelled:
+            raise URLError("request cancelled")
+        super().connect()
+        try:
+            self.cancel_token.attach(self.sock)
+        except URLError:
+            self.close()
+            raise
+
+
+class _CancellableHTTPConnection(_CancellableConnection, http.client.HTTPConnection):
+    pass
+
+
+class _CancellableHTTPSConnection(_CancellableConnection, http.client.HTTPSConnection):
+    pass
+
+
+class _CancellableHTTPHandler(HTTPHandler):
+    def __init__(self, cancel_token: CancelToken):
+        super().__init__()
+        self.cancel_token = cancel_token
+    
+    def http_open(self, req):
+        return self.do_open(functools.partial(_CancellableHTTPConnection, cancel_token=self.cancel_token), req)
+
+
+class _CancellableHTTPSHandler(HTTPSHandler):
+    def __init__(self, cancel_token: CancelToken):
+        super().__init__()
+        self.cancel_token = cancel_token
+    
+    def https_open(self, req):
+        return self.do_open(
+            functools.partial(_CancellableHTTPSConnection, cancel_token=self.cancel_token),
+            req,
+            context=self._context,
+        )
+
+
+def open_url(request: Request, timeout: float, cancel: CancelToken = None):
+    """urlopen, cancellable through cancel when one is given."""
+    if cancel is None:
+        return urlopen(request, timeout=timeout)
+    opener = build_opener(_CancellableHTTPHandler(cancel), _CancellableHTTPSHandler(cancel))
+    return opener.open(request, timeout=timeout)
+
+
+def slim_tag(asset_name: str) -> str:
+    """Extension tag of a slim bundle name such as 'x-1.0.slim-cp37-win32.nvda-addon', or None."""
+    match = re.search(re.escape(SLIM_MARKER) + r'([A-Za-z0-9_]+-[A-Za-z0-9_]+)\.nvda-addon$', asset_name)
+    return match.group(1) if match else None
+
+
+def installable_bundles(assets: list) -> list:
+    """
+    Release assets the updater may install: every asset except slim bundles.
+    
+    A slim bundle only loads under the interpreter it was built for, so
+    installing one would break psutil once NVDA moves to another Python
+    version or architecture (such as the 64-bit NVDA 2026.1). Slim bundles
+    are manual downloads; updates always install the universal bundle.
+    """
+    return [asset for asset in assets if slim_tag(asset.get('name', '')) is None]
+
+
+def parse_release(data: dict) -> dict:
+    """
+    Extract the update information from a GitHub release JSON object.
+    
+    Returns:
+        dict with keys: 'version', 'download_url', 'release_name', 'body'
+        or None if the release has no .nvda-addon asset
+    """
+    # Find the .nvda-addon asset
+    download_url = None
+    version = None
+    asset_name = None
+    
+    for asset in installable_bundles(data.get('assets', [])):
+        asset_name = asset.get('name', '')
+        if asset_name.endswith('.nvda-addon'):
+            download_url = asset.get('browser_download_url')
+            # Extract version from asset name
+            version_tuple = parse_version(asset_name)
+            if version_tuple == (0, 0, 0) or version_tuple[0] < 2000:
+                tag_name = data.get('tag_name', '')
+                version_tuple_tag = parse_version(tag_name)
+                if version_tuple_tag != (0, 0, 0):
+                    version_tuple = version_tuple_tag
+            if version_tuple[0] >= 2000:
+                if len(version_tuple) >= 4:
+                    version = f"{version_tuple[0]}.{version_tuple[1]:02d}.{version_tuple[2]:02d}.{version_tuple[3]}"
+                else:
+                    version = f"{version_tuple[0]}.{version_tuple[1]:02d}.{version_tuple[2]:02d}"
+            else:
+                if len(version_tuple) >= 4:
+                    version = f"{version_tuple[0]}.{version_tuple[1]}.{version_tuple[2]}.{version_tuple[3]}"
+                else:
+                    version = f"{version_tuple[0]}.{version_tuple[1]}.{version_tuple[2]}"
+            break
+    
+    if not download_url:
+        log.warning("AudioVolumeControl: No .nvda-addon asset found in latest release")
+        return None
+    
+    # File list published by the build for delta updates, when the release has one
+    manifest_name = asset_name[:-len('.nvda-addon')] + MANIFEST_SUFFIX
+    manifest = next((a for a in data.get('assets', []) if a.get('name') == manifest_name), {})
+    
+    return {
+        'version': version,
+        'download_url': download_url,
+        'release_name': data.get('name', 'Unknown'),
+        'body': data.get('body', ''),
+        'tag_name': data.get('tag_name', ''),
+        'asset_name': asset_name,
+        'asset_size': asset.get('size'),
+        'asset_digest': asset.get('digest'),
+        'manifest_url': manifest.get('browser_download_url'),
+        'manifest_size': manifest.get('size'),
+    }
+
+
+def default_update_cache_path() -> str:
+    try:
+        return os.path.join(globalVars.appArgs.configPath, UPDATE_CACHE_FILE)
+    except Exception:
+        return None
+
+
+class ReleaseCache:
+    """
+    The last release response, persisted between NVDA sessions.
+    
+    Holds the URL, ETag, Last-Modified, raw body and parsed release of the
+    last successful response, plus the time before which GitHub asked us
+    not to call again. The last entry saved is also kept in memory, so it
+    is known even when it could not be written.
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.last_saved = {}
+    
+    def load(self, url: str) -> dict:
+        """Return the cached entry for url, or an empty dict."""
+        if not self.path:
+            return {}
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            log.warning(f"AudioVolumeControl: Ignoring unreadable update cache: {e}")
+            return {}
+        if entry.get('url') != url:
+            return {}
+        return entry
+    
+    def save(self, entry: dict):
+        self.last_saved = entry
+        if not self.path:
+            return
+        temp_path = self.path + '.tmp'
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(temp_path, self.path)
+        except Exception as e:
+            log.warning(f"AudioVolumeControl: Could not save update cache: {e}")
+
+
+def retry_delay(headers, now: float) -> float:
+    """
+    Seconds GitHub asks us to wait, from Retry-After or the rate limit headers.
+    
+    Returns 0 when the headers do not ask for a delay.
+    """
+    if headers is None:
+        return 0.0
+    delay = 0.0
+    retry_after = headers.get('Retry-After')
+    if retry_after:
+        retry_after = retry_after.strip()
+        if retry_after.isdigit():
+            delay = float(retry_after)
+        else:
+            try:
+                delay = parsedate_to_datetime(retry_after).timestamp() - now
+            except (TypeError, ValueError):
+                pass
+    if headers.get('X-RateLimit-Remaining') == '0':
+        try:
+            delay = max(delay, float(headers.get('X-RateLimit-Reset', 0)) - now)
+        except ValueError:
+            pass
+    return max(0.0, min(delay, MAX_RETRY_DELAY))
+
+
+def fetch_latest_release(url: str = GITHUB_API_URL, cache: ReleaseCache = None,
+                         cancel: CancelToken = None) -> dict:
     """
     Fetch the latest release information from GitHub API.
     
+    The request is conditional on the ETag and Last-Modified of the cached
+    response, so an unchanged release costs a 304 and no parsing. While
+    GitHub's Retry-After or rate limit reset has not passed, the cached
+    release is returned without a request. Cancelling cancel aborts the
+    request.
+    
     Returns:
         dict with keys: 'version', 'download_url', 'release_name', 'body'
         or None if request fails
     """
+    if cache is None:
+        cache = ReleaseCache(default_update_cache_path())
+    entry = cache.load(url)
+    now = time.time()
+    
+    if entry.get('not_before', 0) > now:
+        log.info(f"AudioVolumeControl: Skipping update check, GitHub asked to wait {entry['not_before'] - now:.0f} s")
+        return entry.get('release')
+    
+    headers = {'User-Agent': USER_AGENT, 'Accept': 'application/vnd.github+json'}
+    if entry.get('etag'):
+        headers['If-None-Match'] = entry['etag']
+    if entry.get('last_modified'):
+        headers['If-Modified-Since'] = entry['last_modified']
+    
     try:
         log.info("AudioVolumeControl: Checking for updates from GitHub...")
         
-        request = Request(GITHUB_API_URL, headers={'User-Agent': USER_AGENT})
-        
-        with urlopen(request, timeout=15) as response:
-            data = json.loads(response.read().decode('utf-8'))
-        
-        # Find the .nvda-addon asset
-        download_url = None
-        version = None
-        asset_name = None
-        
-        for asset in data.get('assets', []):
-            asset_name = asset.get('name', '')
-            if asset_name.endswith('.nvda-addon'):
-                download_url = asset.get('browser_download_url')
-                # Extract version from asset name
-                version_tuple = parse_version(asset_name)
-                if version_tuple == (0, 0, 0) or version_tuple[0] < 2000:
-                    tag_name = data.get('tag_name', '')
-                    version_tuple_tag = parse_version(tag_name)
-                    if version_tuple_tag != (0, 0, 0):
-                        version_tuple = version_tuple_tag
-                if version_tuple[0] >= 2000:
-                    if len(version_tuple) >= 4:
-                        version = f"{version_tuple[0]}.{version_tuple[1]:02d}.{version_tuple[2]:02d}.{version_tuple[3]}"
-                    else:
-                        version = f"{version_tuple[0]}.{version_tuple[1]:02d}.{version_tuple[2]:02d}"
-                else:
-                    if len(version_tuple) >= 4:
-                        version = f"{version_tuple[0]}.{version_tuple[1]}.{version_tuple[2]}.{version_tuple[3]}"
-                    else:
-                        version = f"{version_tuple[0]}.{version_tuple[1]}.{version_tuple[2]}"
-                break
+        request = Request(url, headers=headers)
         
-        if not download_url:
-            log.warning("AudioVolumeControl: No .nvda-addon asset found in latest release")
-            return None
+        with open_url(request, 15, cancel) as response:
+            body = response.read().decode('utf-8')
+            response_headers = response.headers
         
-        return {
-            'version': version,
-            'download_url': download_url,
-            'release_name': data.get('name', 'Unknown'),
-            'body': data.get('body', ''),
-            'tag_name': data.get('tag_name', ''),
-            'asset_name': asset_name
+        release = parse_release(json.loads(body))
+        entry = {
+            'url': url,
+            'etag': response_headers.get('ETag'),
+            'last_modified': response_headers.get('Last-Modified'),
+            'body': body,
+            'release': release,
+            'checked_at': now,
         }
+        delay = retry_delay(response_headers, now)
+        if delay:
+            entry['not_before'] = now + delay
+        cache.save(entry)
+        return release
     
     except HTTPError as e:
+        if e.code == 304:
+            log.info("AudioVolumeControl: Latest release unchanged since last check")
+            entry['checked_at'] = now
+            delay = retry_delay(e.headers, now)
+            if delay:
+                entry['not_before'] = now + delay
+            else:
+                entry.pop('not_before', None)
+            cache.save(entry)
+            return entry.get('release')
+        delay = retry_delay(e.headers, now) if e.code in (403, 429) else 0.0
+        if delay:
+            log.warning(f"AudioVolumeControl: GitHub rate limit reached, next check in {delay:.0f} s")
+            entry = dict(entry, url=url, not_before=now + delay)
+            cache.save(entry)
+            return entry.get('release')
         log.error(f"AudioVolumeControl: HTTP error fetching release info: {e.code} {e.reason}")
         return None
-    except URLError as e:
-        log.error(f"AudioVolumeControl: URL error fetching release info: {e.reason}")
-        return None
     except json.JSONDecodeError as e:
         log.error(f"AudioVolumeControl: JSON decode error: {e}")
         return None
     except Exception as e:
-        log.error(f"AudioVolumeControl: Unexpected error fetching release info: {e}")
+        if cancel is not None and cancel.cancelled:
+            log.info("AudioVolumeControl: Update check cancelled")
+        elif isinstance(e, URLError):
+            log.error(f"AudioVolumeControl: URL error fetching release info: {e.reason}")
+        else:
+            log.error(f"AudioVolumeControl: Unexpected error fetching release info: {e}")
         return None
 
 
-def download_addon(download_url: str, asset_name: str = None) -> str:
+def parse_digest(digest: str) -> str:
+    """Return the hex SHA-256 from a GitHub asset digest such as 'sha256:ab12...', or None."""
+    if digest and digest.lower().startswith('sha256:'):
+        return digest[7:].lower()
+    return None
+
+
+def _next_chunk_size(chunk_size: int, elapsed: float, received: int) -> int:
+    """Grow the chunk size while reads are quick and shrink it while they are slow."""
+    if received < chunk_size:
+        return chunk_size
+    if elapsed < TARGET_CHUNK_TIME / 2:
+        return min(MAX_CHUNK_SIZE, chunk_size * 2)
+    if elapsed > TARGET_CHUNK_TIME * 2:
+        return max(MIN_CHUNK_SIZE, chunk_size // 2)
+    return chunk_size
+
+
+def _hash_existing(path: str):
+    """SHA-256 and size of a partial download, so it can be resumed."""
+    hasher = hashlib.sha256()
+    size = 0
+    try:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(MAX_CHUNK_SIZE), b''):
+                hasher.update(block)
+                size += len(block)
+    except FileNotFoundError:
+        pass
+    return hasher, size
+
+
+def download_addon(download_url: str, asset_name: str = None, expected_size: int = None,
+                   expected_digest: str = None, progress=None, dest_dir: str = None,
+                   retries: int = DOWNLOAD_RETRIES, cancel: CancelToken = None,
+                   stats: dict = None) -> str:
     """
     Download the .nvda-addon file to a temporary location.
     
+    The file is written to a .part file and hashed while it streams. After a
+    dropped connection the download resumes with a Range request, and a
+    partial file left by an earlier attempt is resumed too. The read size
+    follows the observed throughput.
+    
     Args:
         download_url: URL to download from
         asset_name: Optional filename for the downloaded file
+        expected_size: Size in bytes from the release metadata, verified when given
+        expected_digest: 'sha256:<hex>' digest from the release metadata, verified when given
+        progress: Optional callback(downloaded_bytes, total_bytes or None)
+        dest_dir: Folder for the download; defaults to a fixed folder under the temp directory
+        retries: Attempts in a row without progress before giving up
+        cancel: Optional CancelToken aborting the download; the part file is kept
+        stats: Optional dict receiving 'transferred' (bytes received by this call) and 'size'
     
     Returns:
         Path to downloaded file, or None if failed
@@ -182,35 +529,102 @@ def download_addon(download_url: str, asset_name: str = None) -> str:
     try:
         log.info(f"AudioVolumeControl: Downloading update from {download_url}")
         
-        # Create temp directory
-        temp_dir = tempfile.mkdtemp(prefix="nvda_addon_update_")
-        
         # Determine filename
         if not asset_name:
             asset_name = download_url.split('/')[-1]
         if not asset_name.endswith('.nvda-addon'):
             asset_name = f"{ADDON_NAME}.nvda-addon"
         
-        download_path = os.path.join(temp_dir, asset_name)
-        
-        # Download the file
-        request = Request(download_url, headers={'User-Agent': USER_AGENT})
-        
-        with urlopen(request, timeout=60) as response:
-            with open(download_path, 'wb') as f:
-                # Read in chunks to show progress
-                total_size = int(response.headers.get('Content-Length', 0))
-                downloaded = 0
-                chunk_size = 8192
-                
-                while True:
-                    chunk = response.read(chunk_size)
-                    if not chunk:
-                        break
-                    f.write(chunk)
-                    downloaded += len(chunk)
-        
-        log.info(f"AudioVolumeControl: Download complete: {download_path} ({downloaded} bytes)")
+        if dest_dir is None:
+            dest_dir = os.path.join(tempfile.gettempdir(), DOWNLOAD_DIR_NAME)
+        os.makedirs(dest_dir, exist_ok=True)
+        download_path = os.path.join(dest_dir, asset_name)
+        part_path = download_path + '.part'
+        
+        hasher, downloaded = _hash_existing(part_path)
+        if downloaded:
+            log.info(f"AudioVolumeControl: Resuming download at {downloaded} bytes")
+        total_size = expected_size
+        chunk_size = MIN_CHUNK_SIZE * 2
+        failures = 0
+        transferred = 0
+        start = time.perf_counter()
+        
+        while True:
+            if total_size is not None and downloaded >= total_size:
+                break
+            headers = {'User-Agent': USER_AGENT}
+            if downloaded:
+                headers['Range'] = f"bytes={downloaded}-"
+            received = 0
+            try:
+                with open_url(Request(download_url, headers=headers), 30, cancel) as response:
+                    if downloaded and response.status != 206:
+                        # The server ignored the range; start over.
+                        hasher, downloaded = hashlib.sha256(), 0
+                    if total_size is None:
+                        content_range = response.headers.get('Content-Range', '')
+                        length = response.headers.get('Content-Length')
+                        if '/' in content_range and content_range.rsplit('/', 1)[1].isdigit():
+                            total_size = int(content_range.rsplit('/', 1)[1])
+                        elif length is not None:
+                            total_size = downloaded + int(length)
+                    with open(part_path, 'ab' if downloaded else 'wb') as f:
+                        while True:
+                            read_start = time.perf_counter()
+                            chunk = response.read(chunk_size)
+                            if not chunk:
+                                break
+                            f.write(chunk)
+                            hasher.update(chunk)
+                            downloaded += len(chunk)
+                            received += len(chunk)
+                            transferred += len(chunk)
+                            chunk_size = _next_chunk_size(chunk_size, time.perf_counter() - read_start, len(chunk))
+                            if progress:
+                                progress(downloaded, total_size)
+                if total_size is None or downloaded >= total_size:
+                    break
+                raise ConnectionError(f"connection closed at {downloaded} of {total_size} bytes")
+            except HTTPError as e:
+                if e.code != 416:
+                    raise
+                # Range not satisfiable: the part file is complete or bogus.
+                if total_size is not None and downloaded == total_size:
+                    break
+                hasher, downloaded = hashlib.sha256(), 0
+                open(part_path, 'wb').close()
+            except (URLError, OSError, http.client.HTTPException) as e:
+                if cancel is not None and cancel.cancelled:
+                    log.info(f"AudioVolumeControl: Download cancelled at {downloaded} bytes")
+                    return None
+                failures = 0 if received else failures + 1
+                if failures >= retries:
+                    log.error(f"AudioVolumeControl: Download failed after {retries} attempts without progress: {e}")
+                    return None
+                log.warning(f"AudioVolumeControl: Download interrupted at {downloaded} bytes, resuming: {e}")
+                delay = min(8.0, 0.5 * 2 ** failures)
+                if cancel is not None:
+                    if cancel.wait(delay):
+                        return None
+                else:
+                    time.sleep(delay)
+        
+        if expected_size is not None and downloaded != expected_size:
+            log.error(f"AudioVolumeControl: Downloaded {downloaded} bytes, release lists {expected_size}")
+            os.remove(part_path)
+            return None
+        expected_hex = parse_digest(expected_digest)
+        if expected_hex and hasher.hexdigest() != expected_hex:
+            log.error(f"AudioVolumeControl: Download digest {hasher.hexdigest()} does not match release digest {expected_hex}")
+            os.remove(part_path)
+            return None
+        os.replace(part_path, download_path)
+        if stats is not None:
+            stats.update(transferred=transferred, size=downloaded)
+        
+        elapsed = time.perf_counter() - start
+        log.info(f"AudioVolumeControl: Download complete: {download_path} ({downloaded} bytes in {elapsed:.1f} s, sha256 {hasher.hexdigest()})")
         return download_path
     
     except Exception as e:
@@ -285,84 +699,139 @@ def install_addon(addon_path: str) -> bool:
 
 class UpdateChecker:
     """
-    Manages update checking at NVDA startup.
+    Checks for updates periodically from a background thread.
+    
+    The first check waits until the last successful check, persisted in the
+    release cache, is interval seconds old. Check times are also kept in
+    memory, so checks stay interval seconds apart when the cache cannot be
+    saved. Failed checks are retried after
+    an exponentially growing, jittered delay. stop() cancels a request in
+    progress and ends the thread promptly.
     
     Usage:
         checker = UpdateChecker(on_update_callback)
-        checker.start()  # Checks once at startup
+        checker.start()
+        ...
+        checker.stop()
     """
     
-    def __init__(self, on_update_available_callback=None):
+    def __init__(self, on_update_available_callback=None, interval: float = DEFAULT_CHECK_INTERVAL,
+                 url: str = GITHUB_API_URL, cache: ReleaseCache = None,
+                 first_delay: float = FIRST_CHECK_DELAY):
         """
         Initialize the update checker.
         
         Args:
             on_update_available_callback: Function to call when update is available.
                                           Signature: callback(version: str, download_url: str, release_info: dict)
+            interval: Seconds between checks
+            url: Release API URL
+            cache: ReleaseCache holding the last response and check time
+            first_delay: Minimum seconds between start() and the first check
         """
         self.callback = on_update_available_callback
-        self._check_lock = threading.Lock()
-        self._checked = False
+        self.interval = interval
+        self.url = url
+        self.cache = cache if cache is not None else ReleaseCache(default_update_cache_path())
+        self.first_delay = first_delay
+        self._cancel = CancelToken()
+        self._thread = None
+        self._notified_version = None
+        # Last successful check and GitHub's not-before time, as recorded by this checker
+        self._checked_at = 0.0
+        self._not_before = 0.0
+        self.checks = 0
+        self.failures = 0
     
     def start(self):
-        """Start the update checker - checks once at startup."""
+        """Start the periodic checks."""
         if not WX_AVAILABLE:
             log.warning("AudioVolumeControl: wx not available, update checker disabled")
             return
-        
-        if self._checked:
-            log.debug("AudioVolumeControl: Update already checked this session")
+        if self._thread is not None:
             return
         
-        # Do check after a short delay (3 seconds after NVDA starts)
-        wx.CallLater(3000, self._start_check)
+        self._thread = threading.Thread(target=self._run, name="AudioVolumeControlUpdates", daemon=True)
+        self._thread.start()
         
-        log.info("AudioVolumeControl: Update checker initialized (will check in 3 seconds)")
+        log.info(f"AudioVolumeControl: Update checker started (next check in {self.initial_delay():.0f} seconds)")
     
-    def stop(self):
-        """Stop the update checker (no-op since we only check once)."""
+    def stop(self, timeout: float = 2.0):
+        """Cancel any check in progress and stop the checker."""
+        self._cancel.cancel()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                log.warning("AudioVolumeControl: Update checker did not stop in time")
+            self._thread = None
         log.debug("AudioVolumeControl: Update checker stopped")
     
-    def _start_check(self):
-        """Start the check in a background thread."""
-        thread = threading.Thread(target=self._do_check, daemon=True)
-        thread.start()
+    def initial_delay(self, now: float = None) -> float:
+        """Seconds until the next check, honouring the latest recorded or persisted check time and rate limit."""
+        now = time.time() if now is None else now
+        entry = self.cache.load(self.url)
+        checked_at = max(entry.get('checked_at', 0), self._checked_at)
+        not_before = max(entry.get('not_before', 0), self._not_before)
+        due = max(checked_at + self.interval, not_before)
+        return max(self.first_delay, due - now)
     
-    def _do_check(self):
-        """Perform the actual update check (runs in background thread)."""
-        with self._check_lock:
-            if self._checked:
-                return
-            self._checked = True
-            
-            log.info("AudioVolumeControl: Checking for updates...")
-            
-            release_info = fetch_latest_release()
-            
-            if not release_info:
-                log.info("AudioVolumeControl: Could not fetch release info from GitHub")
-                return
-            
-            remote_version = release_info['version']
-            comparison = compare_versions(CURRENT_VERSION, remote_version)
-            
-            if comparison < 0:
-                # Update available
-                log.info(f"AudioVolumeControl: UPDATE AVAILABLE! Current: {CURRENT_VERSION} -> New: {remote_version}")
-                log.info(f"AudioVolumeControl: Release: {release_info.get('release_name', 'Unknown')}")
-                log.info(f"AudioVolumeControl: Download URL: {release_info['download_url']}")
-                
-                # Call callback on main thread to show dialog
-                if self.callback:
-                    wx.CallAfter(
-                        self.callback,
-                        remote_version,
-                        release_info['download_url'],
-                        release_info
-                    )
+    def retry_delay(self) -> float:
+        """Exponential backoff with jitter for the current number of failures."""
+        base = min(self.interval, RETRY_BASE_DELAY * 2 ** max(0, self.failures - 1))
+        return random.uniform(base / 2, base)
+    
+    def _run(self):
+        delay = self.initial_delay()
+        while not self._cancel.wait(delay):
+            succeeded = self._do_check()
+            if self._cancel.cancelled:
+                break
+            if succeeded:
+                self.failures = 0
+                delay = self.initial_delay()
             else:
-                # No update available
-                log.info(f"AudioVolumeControl: No update available. Current version ({CURRENT_VERSION}) is up to date.")
+                self.failures += 1
+                delay = self.retry_delay()
+                log.info(f"AudioVolumeControl: Update check failed, retrying in {delay:.0f} seconds")
+    
+    def _do_check(self) -> bool:
+        """Perform one update check (runs in the background thread); returns False on failure."""
+        log.info("AudioVolumeControl: Checking for updates...")
+        self.checks += 1
+        
+        with timed("update_check"):
+            release_info = fetch_latest_release(self.url, self.cache, self._cancel)
+        saved = self.cache.last_saved
+        if saved.get('url') == self.url:
+            self._not_before = saved.get('not_before', 0)
+        
+        if not release_info:
+            log.info("AudioVolumeControl: Could not fetch release info from GitHub")
+            return False
+        self._checked_at = time.time()
+        
+        remote_version = release_info['version']
+        comparison = compare_versions(CURRENT_VERSION, remote_version)
+        
+        if comparison < 0:
+            # Update available
+            log.info(f"AudioVolumeControl: UPDATE AVAILABLE! Current: {CURRENT_VERSION} -> New: {remote_version}")
+            log.info(f"AudioVolumeControl: Release: {release_info.get('release_name', 'Unknown')}")
+            log.info(f"AudioVolumeControl: Download URL: {release_info['download_url']}")
+            
+            # Call callback on main thread to show dialog, once per version
+            if self.callback and remote_version != self._notified_version:
+                self._notified_version = remote_version
+                wx.CallAfter(
+                    self.callback,
+                    remote_version,
+                    release_info['download_url'],
+                    release_info
+                )
+        else:
+            # No update available
+            log.info(f"AudioVolumeControl: No update available. Current version ({CURRENT_VERSION}) is up to date.")
+        return True
 
 
 class UpdateNotificationDialog(wx.Dialog):
@@ -380,6 +849,7 @@ class UpdateNotificationDialog(wx.Dialog):
         self.new_version = new_version
         self.release_info = release_info
         self.current_version = current_version
+        self._announced_quarter = 0
         
         self._init_ui(current_version, new_version, release_info)
         self.CenterOnScreen()
@@ -445,9 +915,13 @@ class UpdateNotificationDialog(wx.Dialog):
     def _do_download_install(self):
         """Perform download and installation in background."""
         try:
-            # Download
-            asset_name = self.release_info.get('asset_name') if self.release_info else None
-            download_path = download_addon(self.download_url, asset_name)
+            from . import deltaUpdate
+            
+            # Download only the changed files when the release allows it
+            start = time.perf_counter()
+            release_info = dict(self.release_info or {}, download_url=self.download_url)
+            with timed("update_download"):
+                download_path = deltaUpdate.fetch_update(release_info, progress=self._on_progress)
             
             if not download_path:
                 wx.CallAfter(ui.message, _("Error: Failed to download update"))
@@ -456,6 +930,13 @@ class UpdateNotificationDialog(wx.Dialog):
             # Install
             success = install_addon(download_path)
             
+            stats = deltaUpdate.last_update or {}
+            stats['update_seconds'] = time.perf_counter() - start
+            log.info(
+                f"AudioVolumeControl: Update to {self.new_version} took {stats['update_seconds']:.1f} s, "
+                f"{stats.get('mode')} download, {stats.get('transferred')} of {stats.get('size')} bytes transferred"
+            )
+            
             if success:
                 # Notify user and ask to restart
                 wx.CallAfter(self._prompt_restart)
@@ -466,6 +947,15 @@ class UpdateNotificationDialog(wx.Dialog):
             log.error(f"AudioVolumeControl: Download/install failed: {e}")
             wx.CallAfter(ui.message, _("Error: Update failed. Check NVDA log for details."))
     
+    def _on_progress(self, downloaded: int, total: int):
+        """Announce each quarter of the download."""
+        if not total:
+            return
+        quarter = downloaded * 4 // total
+        if self._announced_quarter < quarter < 4:
+            self._announced_quarter = quarter
+            wx.CallAfter(ui.message, _("Downloading update, {percent}%").format(percent=quarter * 25))
+    
     def _prompt_restart(self):
         """Prompt user to restart NVDA."""
         ui.message(_("Update installed successfully! NVDA needs to restart."))
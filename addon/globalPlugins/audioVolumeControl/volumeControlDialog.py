@@ -1,5 +1,6 @@
 import wx
 import logging
+import time
 import addonHandler
 addonHandler.initTranslation()
 
@@ -13,13 +14,22 @@ except ImportError:
         def message(msg):
             print(f"NVDA: {msg}")
 
+from . import instrumentation, volumeRamp
 from .audioSessionManager import AudioSessionManager
 from .volumeController import VolumeController
+from .volumeWriter import VolumeWriteScheduler
 
 log = logging.getLogger(__name__)
 
+
+def _session_identity(session):
+    """What must match for a snapshot row to stand for a live session."""
+    return (session.key, session.pid, session.name)
+
+
 class VolumeControlDialog(wx.Dialog):
-    def __init__(self, parent):
+    def __init__(self, parent, snapshot=None, onFirstFocus=None):
+        constructStart = time.perf_counter()
         super().__init__(
             parent,
             title=_("Application Volume Control"),
@@ -27,13 +37,31 @@ class VolumeControlDialog(wx.Dialog):
         )
         
         self.sessions = []
+        # One row per application; _rowByName maps casefolded names to rows
+        self.groups = []
+        self._rowByName = {}
         self.current_selection = -1
+        # Volume and mute values shown before the first reconcile, keyed by session
+        self._snapshotState = {}
+        self.writer = VolumeWriteScheduler()
         
         self.InitUI()
-        self.LoadSessions()
+        fromSnapshot = bool(snapshot and snapshot.entries)
+        if fromSnapshot:
+            self.LoadSnapshot(snapshot)
+        else:
+            self.LoadSessions()
         self.AutoSelectForeground()
         
         self.appList.SetFocus()
+        instrumentation.record("dialog_construct", time.perf_counter() - constructStart)
+        if onFirstFocus:
+            try:
+                onFirstFocus(fromSnapshot)
+            except Exception as e:
+                log.error(f"First focus callback failed: {e}")
+        if fromSnapshot:
+            wx.CallAfter(self.Reconcile)
     
     def InitUI(self):
         mainSizer = wx.BoxSizer(wx.VERTICAL)
@@ -129,17 +157,13 @@ class VolumeControlDialog(wx.Dialog):
                 self.DisableControls()
                 return
             
-            self.sessions = AudioSessionManager.get_active_sessions()
-            self.appList.Clear()
+            self.SetSessions(AudioSessionManager.get_active_sessions())
             
             if not self.sessions:
-                self.appList.Append(_("No applications found"))
+                self.appList.Set([_("No applications found")])
                 self.DisableControls()
                 return
             
-            for session in self.sessions:
-                self.appList.Append(session.name)
-            
             self.EnableControls()
             
             if self.appList.GetCount() > 0:
@@ -152,6 +176,64 @@ class VolumeControlDialog(wx.Dialog):
             self.appList.Append(_("Error: {}").format(str(e)))
             self.DisableControls()
 
+    def SetSessions(self, sessions):
+        """Show sessions in the list, one row per application."""
+        self.sessions = sessions
+        self.groups = AudioSessionManager.group_sessions(sessions)
+        self._rowByName = {group.key: row for row, group in enumerate(self.groups)}
+        self.appList.Set([group.label for group in self.groups])
+    
+    def GetSelectedGroup(self):
+        selection = self.appList.GetSelection()
+        if selection == wx.NOT_FOUND or selection >= len(self.groups):
+            return None
+        return self.groups[selection]
+    
+    def SelectGroup(self, name) -> bool:
+        """Select the row for the application called name; O(1) through the name index."""
+        row = self._rowByName.get(name.casefold()) if name else None
+        if row is None:
+            return False
+        self.appList.SetSelection(row)
+        self.OnSelectionChange(None)
+        return True
+    
+    def LoadSnapshot(self, snapshot):
+        """Render the list from a prewarmed snapshot without touching the audio engine."""
+        self._snapshotState = {
+            id(entry.session): (entry.volume, entry.muted) for entry in snapshot.entries
+        }
+        self.SetSessions([entry.session for entry in snapshot.entries])
+        self.EnableControls()
+        self.appList.SetSelection(0)
+        self.OnSelectionChange(None)
+    
+    def Reconcile(self):
+        """Bring a snapshot-rendered list in line with the live session list."""
+        self._snapshotState = {}
+        if not self:
+            return
+        try:
+            sessions = AudioSessionManager.get_active_sessions()
+        except Exception as e:
+            log.error(f"Failed to reconcile sessions: {e}")
+            return
+        if [_session_identity(s) for s in sessions] == [_session_identity(s) for s in self.sessions]:
+            self.sessions = sessions
+            self.groups = AudioSessionManager.group_sessions(sessions)
+            self.OnSelectionChange(None)
+            return
+        previous = self.GetSelectedGroup()
+        self.SetSessions(sessions)
+        if not sessions:
+            self.appList.Set([_("No applications found")])
+            self.DisableControls()
+            return
+        self.EnableControls()
+        if previous is not None and self.SelectGroup(previous.name):
+            return
+        self.AutoSelectForeground()
+    
     def DisableControls(self):
         self.volSlider.Disable()
         self.muteChk.Disable()
@@ -166,30 +248,35 @@ class VolumeControlDialog(wx.Dialog):
         
         fg_name = AudioSessionManager.get_foreground_app_name()
         
-        if fg_name:
-            for i, session in enumerate(self.sessions):
-                if session.name.lower() == fg_name.lower():
-                    self.appList.SetSelection(i)
-                    self.OnSelectionChange(None)
-                    return
+        if self.SelectGroup(fg_name):
+            return
         
         if self.appList.GetSelection() == wx.NOT_FOUND and self.sessions:
             self.appList.SetSelection(0)
             self.OnSelectionChange(None)
 
     def OnSelectionChange(self, event):
-        selection = self.appList.GetSelection()
+        group = self.GetSelectedGroup()
         
-        if selection == wx.NOT_FOUND or selection >= len(self.sessions):
+        if group is None:
             self.DisableControls()
             return
         
+        self.current_selection = self.appList.GetSelection()
         self.EnableControls()
-        session = self.sessions[selection]
+        session = group.primary
         
+        cached = self._snapshotState.get(id(session))
+        if cached is not None:
+            self.volSlider.SetValue(int(cached[0]))
+            self.muteChk.SetValue(cached[1])
+            return
+        
+        pending = self.writer.pending_volume(session)
         try:
-            vol = int(VolumeController.get_volume(session))
-            self.volSlider.SetValue(vol)
+            if pending is None:
+                pending = VolumeController.get_volume(session)
+            self.volSlider.SetValue(int(pending))
         except:
              pass
 
@@ -200,48 +287,47 @@ class VolumeControlDialog(wx.Dialog):
              pass
     
     def OnSliderChange(self, event):
-        selection = self.appList.GetSelection()
-        if selection == wx.NOT_FOUND or selection >= len(self.sessions):
+        group = self.GetSelectedGroup()
+        if group is None:
             return
             
-        session = self.sessions[selection]
         vol = self.volSlider.GetValue()
         
         try:
-            VolumeController.set_volume_absolute(session, vol)
+            for session in group.sessions:
+                self._snapshotState.pop(id(session), None)
+                volumeRamp.scheduler.cancel(session)
+                self.writer.submit(session, float(vol))
+            group.save_profile(volume=float(vol))
         except Exception as e:
             log.error(f"Slider change failed: {e}")
 
     def OnMuteChange(self, event):
-        selection = self.appList.GetSelection()
-        if selection == wx.NOT_FOUND or selection >= len(self.sessions):
+        group = self.GetSelectedGroup()
+        if group is None:
             return
             
-        session = self.sessions[selection]
         is_muted = self.muteChk.GetValue()
         
         try:
-            current_state = VolumeController.get_mute_state(session)
-            if current_state != is_muted:
-                VolumeController.toggle_mute(session)
-                
+            for session in group.sessions:
+                self._snapshotState.pop(id(session), None)
+            # Writes that would not change anything are skipped by the batch.
+            group.set_mute(is_muted)
+            group.save_profile(mute=is_muted)
         except Exception as e:
             log.error(f"Mute change failed: {e}")
 
     def OnRefresh(self, event):
         old_selection_name = None
         
-        if self.current_selection >= 0 and self.current_selection < len(self.sessions):
-            old_selection_name = self.sessions[self.current_selection].name
+        if self.current_selection >= 0 and self.current_selection < len(self.groups):
+            old_selection_name = self.groups[self.current_selection].name
         
         self.LoadSessions()
         
-        if old_selection_name and self.sessions:
-            for i, session in enumerate(self.sessions):
-                if session.name == old_selection_name:
-                    self.appList.SetSelection(i)
-                    self.OnSelectionChange(None)
-                    return
+        if self.SelectGroup(old_selection_name):
+            return
         
         self.AutoSelectForeground()
 
@@ -249,11 +335,14 @@ class VolumeControlDialog(wx.Dialog):
         if not self.sessions:
             return
         
-        count = 0
-        for session in self.sessions:
-            VolumeController.set_volume(session, 100.0)
-            VolumeController.set_mute(session, False)
-            count += 1
+        self.writer.flush()
+        volumeRamp.scheduler.cancel_all()
+        VolumeController.apply_batch(
+            [(session, 100.0, False) for session in self.sessions]
+        )
+        count = len(self.groups)
+        for group in self.groups:
+            group.forget_profile()
         
         self.OnSelectionChange(None)
         
@@ -262,6 +351,13 @@ class VolumeControlDialog(wx.Dialog):
         except:
             pass
 
+    def Destroy(self):
+        try:
+            self.writer.stop()
+        except Exception as e:
+            log.error(f"Failed to stop volume writer: {e}")
+        return super().Destroy()
+
     def OnCharHook(self, event):
         """Handle key presses"""
         if event.GetKeyCode() == wx.WXK_ESCAPE:
@@ -1,22 +1,106 @@
 import logging
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Optional, Tuple
+
+from .instrumentation import timed
 
 log = logging.getLogger(__name__)
 
+# Upper bound on concurrent COM calls issued by apply_batch
+MAX_BATCH_WORKERS = 8
+
+# Outcome of one target in VolumeController.apply_batch
+BatchResult = namedtuple("BatchResult", ("session", "volume", "muted", "writes", "error"))
+
+
+class CacheConsistencyError(AssertionError):
+    """Raised in consistency check mode when a cached value differs from the audio engine."""
+
 class VolumeController:
+    # When enabled, every cached read is compared against the audio engine and
+    # a mismatch raises CacheConsistencyError. Meant for tests and diagnostics.
+    check_cache = False
+    
+    # Threads shared by every apply_batch call, created on first use with COM
+    # initialized once per thread, so batches do not start threads of their own
+    _pool: Optional[ThreadPoolExecutor] = None
+    _pool_lock = threading.Lock()
+    
+    @staticmethod
+    def _batch_pool() -> ThreadPoolExecutor:
+        with VolumeController._pool_lock:
+            if VolumeController._pool is None:
+                from .sessionSnapshot import co_initialize
+                VolumeController._pool = ThreadPoolExecutor(
+                    max_workers=MAX_BATCH_WORKERS,
+                    thread_name_prefix="AudioVolumeControlBatch",
+                    initializer=co_initialize,
+                )
+            return VolumeController._pool
+    
+    @staticmethod
+    def shutdown():
+        """Stop the batch threads; the next batch starts them again."""
+        with VolumeController._pool_lock:
+            pool = VolumeController._pool
+            VolumeController._pool = None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+    
+    @staticmethod
+    def _read_volume(session) -> float:
+        with timed("GetMasterVolume"):
+            volume = session.volume_interface.GetMasterVolume()
+        return round(volume * 100.0, 1)
+    
+    @staticmethod
+    def _read_mute(session) -> bool:
+        with timed("GetMute"):
+            return bool(session.volume_interface.GetMute())
+    
     @staticmethod
     def get_volume(session) -> float:
         if not session or not session.volume_interface:
             log.error("Invalid session or volume interface")
             return 0.0
         
+        cached = session.cached_volume
+        if cached is not None:
+            if VolumeController.check_cache:
+                VolumeController.verify_cache(session, raise_on_mismatch=True)
+            return cached
+        
         try:
-            volume = session.volume_interface.GetMasterVolume()
-            volume_percent = volume * 100.0
-            return round(volume_percent, 1)
+            volume_percent = VolumeController._read_volume(session)
+            session.update_cache(volume=volume_percent)
+            return volume_percent
         except Exception as e:
             log.error(f"Failed to get volume for {session.name}: {e}")
             return 0.0
     
+    @staticmethod
+    def verify_cache(session, raise_on_mismatch: bool = False) -> List[str]:
+        """Compare the cached volume and mute state of session with the audio engine.
+        
+        Returns a list of mismatch descriptions, empty when the cache is consistent.
+        """
+        mismatches = []
+        cached_volume = session.cached_volume
+        cached_mute = session.cached_mute
+        if cached_volume is not None:
+            actual = VolumeController._read_volume(session)
+            if actual != cached_volume:
+                mismatches.append(f"{session.name}: cached volume {cached_volume}, actual {actual}")
+        if cached_mute is not None:
+            actual = VolumeController._read_mute(session)
+            if actual != cached_mute:
+                mismatches.append(f"{session.name}: cached mute {cached_mute}, actual {actual}")
+        if mismatches and raise_on_mismatch:
+            raise CacheConsistencyError("; ".join(mismatches))
+        return mismatches
+    
     @staticmethod
     def set_volume(session, volume_percent: float) -> float:
         if not session or not session.volume_interface:
@@ -27,7 +111,9 @@ class VolumeController:
         
         try:
             volume_scalar = volume_percent / 100.0
-            session.volume_interface.SetMasterVolume(volume_scalar, None)
+            with timed("SetMasterVolume"):
+                session.volume_interface.SetMasterVolume(volume_scalar, None)
+            session.update_cache(volume=volume_percent)
             log.debug(f"Set volume for {session.name} to {volume_percent}%")
             return volume_percent
         except Exception as e:
@@ -53,8 +139,16 @@ class VolumeController:
         if not session or not session.volume_interface:
             return False
         
+        cached = session.cached_mute
+        if cached is not None:
+            if VolumeController.check_cache:
+                VolumeController.verify_cache(session, raise_on_mismatch=True)
+            return cached
+        
         try:
-            return session.volume_interface.GetMute()
+            mute = VolumeController._read_mute(session)
+            session.update_cache(mute=mute)
+            return mute
         except Exception as e:
             log.error(f"Failed to get mute state for {session.name}: {e}")
             return False
@@ -65,7 +159,9 @@ class VolumeController:
             return False
         
         try:
-            session.volume_interface.SetMute(mute, None)
+            with timed("SetMute"):
+                session.volume_interface.SetMute(mute, None)
+            session.update_cache(mute=mute)
             log.debug(f"Set mute for {session.name} to {mute}")
             return mute
         except Exception as e:
@@ -76,3 +172,68 @@ class VolumeController:
     def toggle_mute(session) -> bool:
         current_mute = VolumeController.get_mute_state(session)
         return VolumeController.set_mute(session, not current_mute)
+    
+    @staticmethod
+    def _apply_target(session, volume: Optional[float], mute: Optional[bool],
+                      skip_unchanged: bool = True) -> BatchResult:
+        if not session or not session.volume_interface:
+            return BatchResult(session, 0.0, False, 0, "Invalid session or volume interface")
+        writes = 0
+        error = None
+        current_volume = None
+        current_mute = None
+        try:
+            if volume is not None:
+                volume = max(0.0, min(100.0, float(volume)))
+                if skip_unchanged:
+                    current_volume = VolumeController.get_volume(session)
+                if not skip_unchanged or current_volume != round(volume, 1):
+                    with timed("SetMasterVolume"):
+                        session.volume_interface.SetMasterVolume(volume / 100.0, None)
+                    current_volume = volume
+                    session.update_cache(volume=volume)
+                    writes += 1
+            if mute is not None:
+                if skip_unchanged:
+                    current_mute = bool(VolumeController.get_mute_state(session))
+                if not skip_unchanged or current_mute != bool(mute):
+                    with timed("SetMute"):
+                        session.volume_interface.SetMute(bool(mute), None)
+                    current_mute = bool(mute)
+                    session.update_cache(mute=current_mute)
+                    writes += 1
+        except Exception as e:
+            log.error(f"Batch update failed for {session.name}: {e}")
+            error = str(e)
+        return BatchResult(session, current_volume, current_mute, writes, error)
+    
+    @staticmethod
+    def apply_batch(targets: Iterable[Tuple[object, Optional[float], Optional[bool]]],
+                    max_workers: int = MAX_BATCH_WORKERS, skip_unchanged: bool = True) -> List[BatchResult]:
+        """
+        Apply (session, volume_percent, mute) targets to many sessions at once.
+        
+        None leaves that property unchanged, and writes that would not change
+        anything are skipped. With skip_unchanged=False every target is
+        written without reading the current values first, for callers that
+        already know them. Sessions are updated concurrently on at most
+        max_workers threads, so the batch takes about as long as the slowest
+        session. The threads are shared between batches; targets are split
+        into at most max_workers runs, each applied in order on one thread.
+        Results are returned in target order.
+        """
+        targets = list(targets)
+        
+        def apply_run(run):
+            return [VolumeController._apply_target(*target, skip_unchanged) for target in run]
+        
+        workers = min(max_workers, MAX_BATCH_WORKERS, len(targets))
+        if workers <= 1:
+            results = apply_run(targets)
+        else:
+            size = -(-len(targets) // workers)
+            runs = [targets[start:start + size] for start in range(0, len(targets), size)]
+            results = [result for run in VolumeController._batch_pool().map(apply_run, runs) for result in run]
+        writes = sum(result.writes for result in results)
+        log.debug(f"Batch update: {len(targets)} sessions, {writes} writes")
+        return results
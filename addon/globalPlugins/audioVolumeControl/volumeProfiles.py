@@ -0,0 +1,303 @@
+"""
+Persistent per-application volume and mute profiles.
+
+Profiles are keyed by the casefolded process name, as produced by
+AudioSessionManager.get_process_name, and are read from disk the first time
+they are needed. Changes update the in-memory index at once and reach disk
+from a background thread: after a quiet period the latest record per
+application is appended to a journal, and the journal is folded into the
+main file once it grows long. A session that appears for an application
+with a profile gets the stored volume and mute state applied.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+from .sessionRegistry import SESSION_ADDED
+from .sessionSnapshot import co_initialize, co_uninitialize
+from .volumeController import VolumeController
+
+log = logging.getLogger(__name__)
+
+PROFILES_FILE = "audioVolumeControlProfiles.json"
+FORMAT_VERSION = 1
+# Seconds without changes before pending records are written
+DEFAULT_DEBOUNCE = 1.0
+# Pending records are written after this long even while changes keep coming
+MAX_WRITE_DELAY = 5.0
+# Journal records after which the journal is folded into the main file
+DEFAULT_COMPACT_AFTER = 256
+
+
+def default_profiles_path() -> Optional[str]:
+    try:
+        import globalVars
+        return os.path.join(globalVars.appArgs.configPath, PROFILES_FILE)
+    except Exception:
+        return None
+
+
+def profile_key(name: str) -> str:
+    return name.casefold()
+
+
+class ProfileStore:
+    """In-memory profile index with debounced, journaled write-behind."""
+
+    def __init__(self, path: str, debounce: float = DEFAULT_DEBOUNCE,
+                 compact_after: int = DEFAULT_COMPACT_AFTER, controller=VolumeController):
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.debounce = debounce
+        self.compact_after = compact_after
+        self.controller = controller
+        self._profiles: Optional[Dict[str, dict]] = None
+        self._pending: Dict[str, dict] = {}
+        self._first_change = 0.0
+        self._last_change = 0.0
+        self._arrivals: List[object] = []
+        self._force = False
+        self._writing = False
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self._journal_records = 0
+        self.loads = 0
+        self.journal_writes = 0
+        self.compactions = 0
+        self.applied = 0
+
+    def _ensure_loaded(self) -> Dict[str, dict]:
+        """Load the main file and replay the journal. Called with the lock held."""
+        if self._profiles is not None:
+            return self._profiles
+        profiles: Dict[str, dict] = {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            profiles.update(data.get("profiles", {}))
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            log.error(f"Could not read volume profiles from {self.path}: {e}")
+        records = 0
+        try:
+            with open(self.journal_path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # A torn last line from an interrupted write
+                        continue
+                    self._replay(profiles, record)
+                    records += 1
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            log.error(f"Could not read volume profile journal {self.journal_path}: {e}")
+        self._journal_records = records
+        self._profiles = profiles
+        self.loads += 1
+        return profiles
+
+    @staticmethod
+    def _replay(profiles: Dict[str, dict], record: dict):
+        # Journal records hold the whole profile, so the last one wins.
+        key = profile_key(record["name"])
+        if record.get("forget"):
+            profiles.pop(key, None)
+        else:
+            profiles[key] = {field: record[field] for field in ("name", "volume", "mute") if field in record}
+
+    def get(self, name: str) -> Optional[dict]:
+        with self._cond:
+            profile = self._ensure_loaded().get(profile_key(name))
+            return dict(profile) if profile else None
+
+    def names(self) -> List[str]:
+        with self._cond:
+            return [profile["name"] for profile in self._ensure_loaded().values()]
+
+    def remember(self, name: str, volume: Optional[float] = None, mute: Optional[bool] = None):
+        """Store the volume and/or mute state for name; returns without touching the disk."""
+        if volume is None and mute is None:
+            return
+        with self._cond:
+            profiles = self._ensure_loaded()
+            profile = dict(profiles.get(profile_key(name), {}), name=name)
+            if volume is not None:
+                profile["volume"] = round(float(volume), 1)
+            if mute is not None:
+                profile["mute"] = bool(mute)
+            if profile == profiles.get(profile_key(name)):
+                return
+            profiles[profile_key(name)] = profile
+            self._queue(dict(profile))
+
+    def forget(self, name: str):
+        with self._cond:
+            if self._ensure_loaded().pop(profile_key(name), None) is None:
+                return
+            self._queue({"name": name, "forget": True})
+
+    def _queue(self, record: dict):
+        """Replace any pending record for the same application. Called with the lock held."""
+        key = profile_key(record["name"])
+        now = time.monotonic()
+        if not self._pending:
+            self._first_change = now
+        self._pending[key] = record
+        self._last_change = now
+        self._wake()
+
+    def on_session_change(self, kind: str, session):
+        """Session registry listener; hands new sessions to the worker thread."""
+        if kind != SESSION_ADDED:
+            return
+        with self._cond:
+            if self._profiles is not None and profile_key(session.name) not in self._profiles:
+                return
+            self._arrivals.append(session)
+            self._wake()
+
+    def _apply(self, sessions):
+        with self._cond:
+            profiles = self._ensure_loaded()
+            targets = []
+            for session in sessions:
+                profile = profiles.get(profile_key(session.name))
+                if profile:
+                    targets.append((session, profile.get("volume"), profile.get("mute")))
+        if not targets:
+            return
+        results = self.controller.apply_batch(targets)
+        self.applied += sum(1 for result in results if not result.error)
+        log.debug(f"Applied volume profiles to {len(targets)} new sessions")
+
+    def _due_in(self, now: float) -> Optional[float]:
+        if not self._pending:
+            return None
+        if self._force or self._stopping:
+            return 0.0
+        return max(0.0, min(self._last_change + self.debounce, self._first_change + MAX_WRITE_DELAY) - now)
+
+    def _write(self, records: List[dict]):
+        try:
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                for record in records:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self.journal_writes += 1
+            self._journal_records += len(records)
+        except Exception as e:
+            log.error(f"Could not write volume profile journal {self.journal_path}: {e}")
+            return
+        if self._journal_records >= self.compact_after:
+            self._compact()
+
+    def _compact(self):
+        with self._cond:
+            data = {"version": FORMAT_VERSION, "profiles": dict(self._ensure_loaded())}
+        temp_path = self.path + ".tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=1, sort_keys=True)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+            # Replaying the old journal over the new file is harmless, so a
+            # crash before this truncation loses nothing.
+            open(self.journal_path, "w").close()
+            self._journal_records = 0
+            self.compactions += 1
+        except Exception as e:
+            log.error(f"Could not save volume profiles to {self.path}: {e}")
+
+    def start(self):
+        """Start the worker, which loads the index in the background."""
+        with self._cond:
+            self._wake()
+
+    def _wake(self):
+        """Start the worker if needed and wake it. Called with the lock held."""
+        if self._stopping:
+            return
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="AudioVolumeControlProfiles", daemon=True)
+            self._thread.start()
+        self._cond.notify_all()
+
+    def flush(self, timeout: float = 2.0) -> bool:
+        """Write pending records now and wait for them to reach the journal."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            self._force = True
+            self._cond.notify_all()
+            try:
+                while self._pending or self._writing:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or self._thread is None:
+                        return False
+                    self._cond.wait(remaining)
+            finally:
+                self._force = False
+        return True
+
+    def stop(self, timeout: float = 2.0):
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        elif self._pending:
+            self._write(list(self._pending.values()))
+            self._pending.clear()
+
+    def stats(self) -> dict:
+        return {
+            'profiles': len(self._profiles) if self._profiles is not None else None,
+            'pending': len(self._pending),
+            'journal_writes': self.journal_writes,
+            'compactions': self.compactions,
+            'applied': self.applied,
+        }
+
+    def _run(self):
+        com_initialized = co_initialize()
+        try:
+            with self._cond:
+                self._ensure_loaded()
+            while True:
+                with self._cond:
+                    while True:
+                        wait = self._due_in(time.monotonic())
+                        if self._arrivals or wait == 0.0:
+                            break
+                        if self._stopping:
+                            return
+                        self._cond.wait(wait)
+                    arrivals, self._arrivals = self._arrivals, []
+                    records = []
+                    if self._due_in(time.monotonic()) == 0.0:
+                        records = list(self._pending.values())
+                        self._pending.clear()
+                        self._writing = True
+                if arrivals:
+                    try:
+                        self._apply(arrivals)
+                    except Exception as e:
+                        log.error(f"Applying volume profiles failed: {e}")
+                if records:
+                    self._write(records)
+                    with self._cond:
+                        self._writing = False
+                        self._cond.notify_all()
+        finally:
+            if com_initialized:
+                co_uninitialize()
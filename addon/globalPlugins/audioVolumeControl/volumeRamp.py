@@ -0,0 +1,249 @@
+"""
+Timed volume fades.
+
+Every running fade is advanced by one shared worker thread. On each tick the
+scheduler computes the level of every ramp, drops steps that would not
+change the rounded volume, and sends what is left to the audio engine as one
+batch, capped so the number of writes per second stays bounded however many
+fades are running.
+"""
+
+import logging
+import math
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from .sessionSnapshot import co_initialize, co_uninitialize
+from .volumeController import VolumeController
+from .volumeWriter import session_key
+
+log = logging.getLogger(__name__)
+
+CURVE_LINEAR = "linear"
+# Interpolates in decibels, which sounds even to the ear
+CURVE_DB = "db"
+
+# Ticks per second of the shared scheduler
+DEFAULT_TICK_RATE = 30.0
+# Upper bound on volume writes per second across all fades
+DEFAULT_MAX_WRITES_PER_SECOND = 240
+# Level treated as silence by the dB curve
+MIN_DB = -60.0
+
+
+def percent_to_db(percent: float) -> float:
+    if percent <= 0:
+        return MIN_DB
+    return max(MIN_DB, 20.0 * math.log10(percent / 100.0))
+
+
+def db_to_percent(db: float) -> float:
+    if db <= MIN_DB:
+        return 0.0
+    return 100.0 * 10.0 ** (db / 20.0)
+
+
+class Ramp:
+    """One session moving from start to target percent over duration seconds."""
+
+    def __init__(self, session, start: float, target: float, duration: float,
+                 curve: str = CURVE_LINEAR, started: Optional[float] = None):
+        if curve not in (CURVE_LINEAR, CURVE_DB):
+            raise ValueError(f"Unknown fade curve: {curve}")
+        self.session = session
+        self.start = max(0.0, min(100.0, float(start)))
+        self.target = max(0.0, min(100.0, float(target)))
+        self.duration = max(0.0, float(duration))
+        self.curve = curve
+        self.started = time.monotonic() if started is None else started
+        self.written: Optional[float] = None
+        self.last_write = 0.0
+
+    def progress(self, now: float) -> float:
+        if self.duration <= 0:
+            return 1.0
+        return max(0.0, min(1.0, (now - self.started) / self.duration))
+
+    def value_at(self, now: float) -> float:
+        fraction = self.progress(now)
+        if fraction >= 1.0:
+            return self.target
+        if self.curve == CURVE_DB:
+            start_db = percent_to_db(self.start)
+            target_db = percent_to_db(self.target)
+            return db_to_percent(start_db + (target_db - start_db) * fraction)
+        return self.start + (self.target - self.start) * fraction
+
+    def done(self, now: float) -> bool:
+        return self.progress(now) >= 1.0
+
+
+class RampScheduler:
+    """Runs every active fade from a single tick loop."""
+
+    def __init__(self, tick_rate: float = DEFAULT_TICK_RATE,
+                 max_writes_per_second: int = DEFAULT_MAX_WRITES_PER_SECOND,
+                 controller=VolumeController):
+        self.tick_rate = tick_rate
+        self.max_writes_per_second = max_writes_per_second
+        self.controller = controller
+        self._ramps: Dict[object, Ramp] = {}
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self.ticks = 0
+        self.writes = 0
+        self.deferred = 0
+
+    @property
+    def interval(self) -> float:
+        return 1.0 / self.tick_rate
+
+    @property
+    def writes_per_tick(self) -> int:
+        return max(1, int(self.max_writes_per_second / self.tick_rate))
+
+    def fade(self, session, target: float, duration: float, curve: str = CURVE_LINEAR) -> Ramp:
+        """
+        Fade session to target percent over duration seconds.
+
+        A fade already running on the session is replaced, and the new one
+        starts from the level the old one had reached.
+        """
+        key = session_key(session)
+        now = time.monotonic()
+        with self._cond:
+            previous = self._ramps.get(key)
+        if previous is not None:
+            start = previous.value_at(now)
+        else:
+            start = self.controller.get_volume(session)
+        ramp = Ramp(session, start, target, duration, curve, started=now)
+        with self._cond:
+            if self._stopping:
+                return ramp
+            if previous is not None and self._ramps.get(key) is previous:
+                ramp.written = previous.written
+                ramp.last_write = previous.last_write
+            self._ramps[key] = ramp
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="AudioVolumeControlFader", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return ramp
+
+    def fade_all(self, sessions: Iterable, target: float, duration: float,
+                 curve: str = CURVE_LINEAR) -> List[Ramp]:
+        return [self.fade(session, target, duration, curve) for session in sessions]
+
+    def cancel(self, session) -> Optional[float]:
+        """Stop the fade on session where it is; returns the last level written, if any."""
+        with self._cond:
+            ramp = self._ramps.pop(session_key(session), None)
+        return ramp.written if ramp else None
+
+    def cancel_all(self):
+        with self._cond:
+            self._ramps.clear()
+
+    def is_fading(self, session) -> bool:
+        return session_key(session) in self._ramps
+
+    def target_of(self, session) -> Optional[float]:
+        ramp = self._ramps.get(session_key(session))
+        return ramp.target if ramp else None
+
+    @property
+    def active(self) -> int:
+        return len(self._ramps)
+
+    def wait(self, timeout: float = 5.0) -> bool:
+        """Wait until every fade has finished."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._ramps:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._thread is None:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def stop(self, timeout: float = 2.0):
+        with self._cond:
+            self._stopping = True
+            self._ramps.clear()
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        if self.ticks:
+            log.debug(f"Fades: {self.ticks} ticks, {self.writes} writes, {self.deferred} steps deferred")
+
+    def stats(self) -> dict:
+        return {'active': self.active, 'ticks': self.ticks, 'writes': self.writes, 'deferred': self.deferred}
+
+    def _plan(self, now: float):
+        """Pick this tick's writes and drop finished ramps. Called with the lock held."""
+        steps = []
+        for key, ramp in list(self._ramps.items()):
+            value = round(ramp.value_at(now), 1)
+            if value != ramp.written:
+                steps.append((ramp, value))
+            elif ramp.done(now):
+                del self._ramps[key]
+        budget = self.writes_per_tick
+        if len(steps) > budget:
+            # Final steps first so fades land on their target, then the ramps
+            # that have waited longest since their last write.
+            steps.sort(key=lambda step: (not step[0].done(now), step[0].last_write))
+            self.deferred += len(steps) - budget
+            steps = steps[:budget]
+        return steps
+
+    def _run(self):
+        com_initialized = co_initialize()
+        try:
+            next_tick = time.monotonic()
+            while True:
+                with self._cond:
+                    while not self._ramps and not self._stopping:
+                        self._cond.wait()
+                        next_tick = time.monotonic()
+                    if self._stopping:
+                        return
+                    now = time.monotonic()
+                    steps = self._plan(now)
+                    self.ticks += 1
+                if steps:
+                    try:
+                        # _plan already dropped steps that change nothing, so there is nothing to read first
+                        self.controller.apply_batch(
+                            [(ramp.session, value, None) for ramp, value in steps], skip_unchanged=False
+                        )
+                    except Exception as e:
+                        log.error(f"Fade step failed: {e}")
+                    with self._cond:
+                        for ramp, value in steps:
+                            ramp.written = value
+                            ramp.last_write = now
+                            key = session_key(ramp.session)
+                            if ramp.done(now) and value == ramp.target and self._ramps.get(key) is ramp:
+                                del self._ramps[key]
+                        self.writes += len(steps)
+                with self._cond:
+                    self._cond.notify_all()
+                    # New fades wake the loop, but never make it tick early.
+                    next_tick = max(next_tick + self.interval, time.monotonic())
+                    while self._ramps and not self._stopping:
+                        delay = next_tick - time.monotonic()
+                        if delay <= 0:
+                            break
+                        self._cond.wait(delay)
+        finally:
+            if com_initialized:
+                co_uninitialize()
+
+
+# Shared scheduler used by the plugin; its thread starts with the first fade
+scheduler = RampScheduler()
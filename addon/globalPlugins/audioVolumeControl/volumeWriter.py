@@ -0,0 +1,143 @@
+"""
+Coalescing volume write scheduler.
+
+Slider drags and held arrow keys produce a burst of volume changes. The
+scheduler keeps only the latest requested volume per session and issues the
+COM writes from a worker thread at no more than max_rate writes per second
+per session, so the GUI thread never waits on the audio engine.
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from .sessionSnapshot import co_initialize, co_uninitialize
+from .volumeController import VolumeController
+
+log = logging.getLogger(__name__)
+
+# Maximum writes per second per session
+DEFAULT_MAX_RATE = 20.0
+
+
+def session_key(session):
+    key = getattr(session, 'key', None)
+    return key if key is not None else id(session)
+
+
+class VolumeWriteScheduler:
+    def __init__(self, max_rate: float = DEFAULT_MAX_RATE, controller=VolumeController):
+        self.max_rate = max_rate
+        self.controller = controller
+        self._pending: Dict[object, Tuple[object, float]] = {}
+        self._next_allowed: Dict[object, float] = {}
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self._in_flight = 0
+        self.submitted = 0
+        # Queued volumes handed to apply_batch, and the writes and failures it reported for them
+        self.dispatched = 0
+        self.issued = 0
+        self.failed = 0
+
+    @property
+    def interval(self) -> float:
+        return 1.0 / self.max_rate if self.max_rate > 0 else 0.0
+
+    @property
+    def saved(self) -> int:
+        return self.submitted - self.dispatched - len(self._pending)
+
+    def submit(self, session, volume_percent: float):
+        """Queue a volume write; a later submit for the same session replaces it."""
+        with self._cond:
+            if self._stopping:
+                return
+            self._pending[session_key(session)] = (session, volume_percent)
+            self.submitted += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="AudioVolumeControlWriter", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def pending_volume(self, session) -> Optional[float]:
+        entry = self._pending.get(session_key(session))
+        return entry[1] if entry else None
+
+    def flush(self, timeout: float = 2.0) -> bool:
+        """Wait until every queued write has been issued, ignoring the rate limit."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            self._next_allowed.clear()
+            self._cond.notify_all()
+            while self._pending or self._in_flight:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._thread is None:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def stop(self, timeout: float = 2.0):
+        self.flush(timeout)
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        if self.submitted:
+            log.debug(
+                f"Volume writes: {self.submitted} submitted, {self.issued} issued, "
+                f"{self.failed} failed, {self.saved} coalesced"
+            )
+
+    def stats(self) -> dict:
+        return {'submitted': self.submitted, 'issued': self.issued, 'failed': self.failed, 'coalesced': self.saved}
+
+    def _take_due(self):
+        now = time.monotonic()
+        due = [
+            key for key in self._pending
+            if self._next_allowed.get(key, 0.0) <= now
+        ]
+        if due:
+            return [(key,) + self._pending.pop(key) for key in due], None
+        return [], min(self._next_allowed[key] for key in self._pending) - now
+
+    def _run(self):
+        com_initialized = co_initialize()
+        try:
+            while True:
+                with self._cond:
+                    while not self._pending and not self._stopping:
+                        self._cond.wait()
+                    if not self._pending and self._stopping:
+                        return
+                    due, wait = self._take_due()
+                    if not due:
+                        self._cond.wait(wait)
+                        continue
+                    self._in_flight = len(due)
+                writes = failures = 0
+                try:
+                    # Writes due together, e.g. every session of an application, go out as one batch.
+                    results = self.controller.apply_batch([(session, volume, None) for _, session, volume in due])
+                    writes = sum(result.writes for result in results)
+                    failures = sum(1 for result in results if result.error)
+                except Exception as e:
+                    log.error(f"Scheduled volume write failed: {e}")
+                    failures = len(due)
+                with self._cond:
+                    next_allowed = time.monotonic() + self.interval
+                    for key, _, _ in due:
+                        self._next_allowed[key] = next_allowed
+                    self.dispatched += len(due)
+                    self.issued += writes
+                    self.failed += failures
+                    self._in_flight = 0
+                    self._cond.notify_all()
+        finally:
+            if com_initialized:
+                co_uninitialize()
@@ -0,0 +1,227 @@
+"""
+Benchmarks for session enumeration and volume operations.
+
+Runs on any platform against the in-memory fake audio backend with a
+configurable per-call latency standing in for COM round trips, and writes
+per-operation latency percentiles and throughput as JSON.
+
+Usage:
+	python benchmarks/benchmark.py [--sessions 1,10,100,1000,5000] [--latency-us 20]
+		[--output results.json] [--only get_volume,reset_batch]
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from collections.abc import Callable
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import nvdaStubs  # noqa: E402
+
+plugin_package = nvdaStubs.install()
+
+from globalPlugins.audioVolumeControl import audioSessionManager, foregroundTracker  # noqa: E402
+from globalPlugins.audioVolumeControl.audioSessionManager import AudioSessionManager  # noqa: E402
+from globalPlugins.audioVolumeControl.fakeBackend import FakeForeground, FakeProcessTable, FakeSessionBackend  # noqa: E402
+from globalPlugins.audioVolumeControl.volumeController import VolumeController  # noqa: E402
+
+DEFAULT_SESSION_COUNTS = (1, 10, 100, 1000, 5000)
+# Upper bound on the time spent sampling one operation at one session count
+TIME_BUDGET = 2.0
+
+
+def percentile(sortedSamples: list[float], fraction: float) -> float:
+	if not sortedSamples:
+		return 0.0
+	index = min(len(sortedSamples) - 1, int(round(fraction * (len(sortedSamples) - 1))))
+	return sortedSamples[index]
+
+
+def summarize(name: str, sessions: int, samples: list[float], itemsPerSample: int) -> dict:
+	ordered = sorted(samples)
+	total = sum(samples)
+	return {
+		"operation": name,
+		"sessions": sessions,
+		"samples": len(samples),
+		"p50_ms": round(percentile(ordered, 0.50) * 1000, 4),
+		"p90_ms": round(percentile(ordered, 0.90) * 1000, 4),
+		"p99_ms": round(percentile(ordered, 0.99) * 1000, 4),
+		"max_ms": round(ordered[-1] * 1000, 4) if ordered else 0.0,
+		"ops_per_sec": round(len(samples) * itemsPerSample / total, 1) if total else None,
+	}
+
+
+def sample(func: Callable[[], object], iterations: int, setup: Callable[[], object] | None = None) -> list[float]:
+	samples = []
+	deadline = time.perf_counter() + TIME_BUDGET
+	for _ in range(iterations):
+		if setup:
+			setup()
+		start = time.perf_counter()
+		func()
+		samples.append(time.perf_counter() - start)
+		if time.perf_counter() > deadline and len(samples) >= 3:
+			break
+	return samples
+
+
+class Scenario:
+	"""A fake backend and process table populated with count sessions."""
+
+	def __init__(self, count: int, latency: float):
+		self.count = count
+		self.latency = latency
+		self.table = FakeProcessTable(latency=latency)
+		self.backend = FakeSessionBackend(latency=latency, provides_names=False)
+		for i in range(count):
+			pid = 10000 + i
+			name = f"app{i % max(1, count // 3)}"
+			self.table.add(pid, f"{name}.exe", create_time=1.0)
+			self.backend.add_session(name, pid=pid, volume=0.5, mute=bool(i % 2))
+		# The legacy enumeration path reads the same sessions through AudioUtilities.
+		nvdaStubs.all_sessions[:] = list(self.backend.sessions.values())
+		nvdaStubs.enumeration_latency = latency
+		AudioSessionManager.install_process_table(self.table)
+		self.registry = AudioSessionManager.install_backend(self.backend)
+		self.sessions = list(self.registry.sessions())
+
+	def uncache(self):
+		for session in self.sessions:
+			session.invalidate_cache()
+
+
+def make_plugin():
+	"""A GlobalPlugin instance without its background workers."""
+	plugin = plugin_package.GlobalPlugin()
+	if plugin.snapshotWorker:
+		plugin.snapshotWorker.stop()
+		plugin.snapshotWorker = None
+	return plugin
+
+
+def run(counts: list[int], latency: float, only: set[str] | None) -> list[dict]:
+	results = []
+	plugin = make_plugin()
+	foreground = FakeForeground(foregroundTracker.tracker)
+
+	def bench(name: str, func, iterations: int, itemsPerSample: int = 1, setup=None):
+		if only and name not in only:
+			return
+		results.append(summarize(name, scenario.count, sample(func, iterations, setup), itemsPerSample))
+
+	for count in counts:
+		scenario = Scenario(count, latency)
+		sessions = scenario.sessions
+		first = sessions[0]
+		iterations = max(5, min(200, 20000 // count))
+
+		bench("get_active_sessions", AudioSessionManager.get_active_sessions, iterations)
+		bench(
+			"get_active_sessions_cold",
+			lambda: AudioSessionManager.install_backend(scenario.backend),
+			max(3, iterations // 10),
+		)
+		bench(
+			"scan_sessions",
+			AudioSessionManager.scan_sessions,
+			max(3, iterations // 10),
+			setup=lambda: AudioSessionManager.get_process_info().clear(),
+		)
+		pids = [session.pid for session in sessions]
+		bench(
+			"get_process_name",
+			lambda: [AudioSessionManager.get_process_name(pid) for pid in pids],
+			max(3, iterations // 10),
+			itemsPerSample=count,
+		)
+		bench(
+			"get_process_names_bulk",
+			lambda: AudioSessionManager.get_process_names(pids),
+			max(3, iterations // 10),
+			itemsPerSample=count,
+		)
+		bench("get_volume_cached", lambda: VolumeController.get_volume(first), 200)
+		bench(
+			"get_volume_uncached",
+			lambda: VolumeController.get_volume(first),
+			200,
+			setup=first.invalidate_cache,
+		)
+		bench("set_volume", lambda: VolumeController.set_volume(first, 42.0), 200)
+		bench("adjust_volume", lambda: VolumeController.adjust_volume(first, 1), 200)
+		bench("toggle_mute", lambda: VolumeController.toggle_mute(first), 200)
+
+		def resetSetup():
+			for session in sessions:
+				session.volume_interface.set_silently(0.5, True)
+			scenario.uncache()
+
+		def resetSequential():
+			# The reset loop as it was before the batch API
+			for session in sessions:
+				VolumeController.set_volume(session, 100.0)
+				VolumeController.set_mute(session, False)
+
+		# Keypress to announcement for the foreground gestures, with the
+		# foreground application already known from a focus event.
+		foreground.focus(sessions[-1].pid)
+		bench("foreground_raise", lambda: plugin.script_raiseForegroundVolume(None), 200, setup=nvdaStubs.spoken.clear)
+		bench("foreground_mute", lambda: plugin.script_toggleForegroundMute(None), 200, setup=nvdaStubs.spoken.clear)
+
+		resetIterations = max(3, min(20, 2000 // count))
+		bench("reset_sequential", resetSequential, resetIterations, itemsPerSample=count, setup=resetSetup)
+		bench(
+			"reset_batch",
+			lambda: VolumeController.apply_batch([(s, 100.0, False) for s in sessions]),
+			resetIterations,
+			itemsPerSample=count,
+			setup=resetSetup,
+		)
+		AudioSessionManager.shutdown()
+	return results
+
+
+def main(argv: list[str] | None = None) -> int:
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument(
+		"--sessions",
+		default=",".join(str(c) for c in DEFAULT_SESSION_COUNTS),
+		help="Comma separated session counts",
+	)
+	parser.add_argument("--latency-us", type=float, default=20.0, help="Simulated latency per COM call")
+	parser.add_argument("--only", default="", help="Comma separated operation names to run")
+	parser.add_argument("--output", help="Write JSON results to this file instead of stdout")
+	args = parser.parse_args(argv)
+
+	counts = [int(c) for c in args.sessions.split(",") if c.strip()]
+	only = {name.strip() for name in args.only.split(",") if name.strip()} or None
+	latency = args.latency_us / 1_000_000
+	# Keep the per-session warnings of the fake backend out of the report.
+	audioSessionManager.log.disabled = True
+
+	report = {
+		"meta": {
+			"python": platform.python_version(),
+			"platform": platform.platform(),
+			"latency_us": args.latency_us,
+			"session_counts": counts,
+			"timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+		},
+		"results": run(counts, latency, only),
+	}
+	text = json.dumps(report, indent=2)
+	if args.output:
+		with open(args.output, "w", encoding="utf-8") as f:
+			f.write(text + "\n")
+	else:
+		print(text)
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
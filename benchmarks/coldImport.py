@@ -0,0 +1,134 @@
+"""
+Cold import time of the plugin with and without bundled bytecode.
+
+Bundles the add-on folder twice with the build's own code, once with
+bytecode compiled by this interpreter and once with sources only, extracts
+both as NVDA would on install, then imports the plugin package from each in
+fresh interpreters started with -B, so nothing is cached between runs and,
+as when NVDA cannot write to the add-on folder, no bytecode is written.
+Both the plugin package alone and every plugin module are timed. Prints
+per-variant timings and the speedups as JSON.
+
+Usage:
+	python benchmarks/coldImport.py [--runs 20] [--output results.json]
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import zipfile
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCHMARKS_DIR)
+TOOL_DIR = os.path.join(REPO_ROOT, "site_scons", "site_tools", "NVDATool")
+
+# Run in each child: time importing the plugin package against the NVDA stubs,
+# then every other plugin module, as a session that opens the dialog does
+CHILD = """
+import importlib, pkgutil, sys, time
+sys.path.insert(0, sys.argv[1])
+import nvdaStubs
+nvdaStubs.ADDON_DIR = sys.argv[2]
+start = time.perf_counter()
+package = nvdaStubs.install()
+loaded = time.perf_counter()
+for module in pkgutil.iter_modules(package.__path__):
+	importlib.import_module(package.__name__ + "." + module.name)
+print(loaded - start, time.perf_counter() - start)
+"""
+
+
+def loadTool(name: str):
+	spec = importlib.util.spec_from_file_location(f"nvdaTool_{name}", os.path.join(TOOL_DIR, f"{name}.py"))
+	module = importlib.util.module_from_spec(spec)
+	spec.loader.exec_module(module)
+	return module
+
+
+def buildVariant(workDir: str, name: str, withBytecode: bool) -> str:
+	"""Bundle and extract the add-on; returns the extracted folder."""
+	addon = loadTool("addon")
+	sourceDir = os.path.join(REPO_ROOT, "addon")
+	excludes = ("__pycache__", "*.pyc")
+	extraFiles = []
+	if withBytecode:
+		bytecode = loadTool("bytecode")
+		stagingDir = os.path.join(workDir, "bytecode")
+		files = addon.collectFiles(addon.Path(sourceDir), addon.compilePatterns(excludes))
+		for result in bytecode.compileBytecode(files, stagingDir, [sys.executable]):
+			extraFiles.extend((pyc, os.path.join(stagingDir, pyc)) for pyc in result["files"])
+	bundle = os.path.join(workDir, f"{name}.nvda-addon")
+	addon.createAddonBundleFromPath(sourceDir, bundle, excludes, extraFiles=extraFiles)
+	extracted = os.path.join(workDir, name)
+	with zipfile.ZipFile(bundle) as z:
+		z.extractall(extracted)
+	return extracted
+
+
+def coldImport(addonDir: str) -> tuple[float, float]:
+	"""Seconds to import the plugin package, and to import every plugin module, in a fresh interpreter."""
+	completed = subprocess.run(
+		[sys.executable, "-B", "-c", CHILD, BENCHMARKS_DIR, addonDir],
+		capture_output=True, text=True, check=True,
+	)
+	package, everything = completed.stdout.strip().splitlines()[-1].split()
+	return float(package), float(everything)
+
+
+def summarize(samples: list[float]) -> dict:
+	ordered = sorted(samples)
+	return {
+		"median_ms": round(statistics.median(ordered) * 1000, 2),
+		"p90_ms": round(ordered[int(0.9 * (len(ordered) - 1))] * 1000, 2),
+		"min_ms": round(ordered[0] * 1000, 2),
+	}
+
+
+def run(runs: int) -> dict:
+	with tempfile.TemporaryDirectory(prefix="avc-cold-import-") as workDir:
+		variants = {
+			"sources": buildVariant(workDir, "sources", False),
+			"bytecode": buildVariant(workDir, "bytecode", True),
+		}
+		results = {
+			"python": sys.version.split()[0],
+			"cache_tag": sys.implementation.cache_tag,
+			"runs": runs,
+		}
+		# Alternate the variants so drift in machine load affects both alike
+		samples = {name: ([], []) for name in variants}
+		for _ in range(runs):
+			for name, addonDir in variants.items():
+				package, everything = coldImport(addonDir)
+				samples[name][0].append(package)
+				samples[name][1].append(everything)
+		for name, (package, everything) in samples.items():
+			results[name] = {"package": summarize(package), "all_modules": summarize(everything)}
+		results["speedup"] = {
+			metric: round(results["sources"][metric]["median_ms"] / results["bytecode"][metric]["median_ms"], 2)
+			for metric in ("package", "all_modules")
+		}
+		return results
+
+
+def main(argv: list[str] | None = None) -> int:
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument("--runs", type=int, default=20, help="Cold imports per variant")
+	parser.add_argument("--output", help="Also write the results to this JSON file")
+	args = parser.parse_args(argv)
+	results = run(args.runs)
+	text = json.dumps(results, indent=1)
+	print(text)
+	if args.output:
+		with open(args.output, "w", encoding="utf-8") as f:
+			f.write(text + "\n")
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,123 @@
+"""
+Stub NVDA environment for running the add-on outside NVDA.
+
+install() registers minimal stand-ins for the NVDA, wx, avc_pycaw and psutil
+modules the add-on imports, then puts the add-on folder on sys.path so the
+plugin package can be imported as ``globalPlugins.audioVolumeControl``.
+The stand-ins only provide what is needed to import the plugin and drive
+it against the fake audio backend; they never touch the real system.
+"""
+
+import builtins
+import os
+import sys
+import tempfile
+import types
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ADDON_DIR = os.path.join(REPO_ROOT, "addon")
+PLUGIN_PACKAGE = "globalPlugins.audioVolumeControl"
+
+# Sessions returned by the stub AudioUtilities.GetAllSessions
+all_sessions = []
+# Seconds slept per simulated GetAllSessions call
+enumeration_latency = 0.0
+
+spoken = []
+
+
+def _module(name, **attrs):
+	module = types.ModuleType(name)
+	module.__dict__.update(attrs)
+	sys.modules[name] = module
+	return module
+
+
+def _stubNvda():
+	class GlobalPlugin:
+		def __init__(self):
+			pass
+
+		def terminate(self):
+			pass
+
+	def initTranslation():
+		builtins._ = lambda text: text
+		builtins.ngettext = lambda singular, plural, n: singular if n == 1 else plural
+
+	class AddonBundle:
+		def __init__(self, path):
+			self.path = path
+
+	_module("globalPluginHandler", GlobalPlugin=GlobalPlugin)
+	_module(
+		"addonHandler",
+		initTranslation=initTranslation,
+		AddonBundle=AddonBundle,
+		getAvailableAddons=lambda: [],
+		installAddonBundle=lambda bundle: None,
+	)
+	_module("ui", message=spoken.append)
+	_module("scriptHandler", getLastScriptRepeatCount=lambda: 0)
+	_module("gui", mainFrame=None, messageBox=lambda *a, **k: None, ExecAndPump=lambda f, *a: f(*a))
+	_module("core", restart=lambda: None)
+	# A throwaway configuration folder, so profiles and update metadata never land in the repository
+	_module("globalVars", appArgs=types.SimpleNamespace(configPath=tempfile.mkdtemp(prefix="avc-nvda-config-")))
+	initTranslation()
+
+
+def _stubWx():
+	class _Window:
+		def __init__(self, *args, **kwargs):
+			pass
+
+		def __bool__(self):
+			return True
+
+	class CallLater:
+		def __init__(self, millis, callableObj, *args, **kwargs):
+			self.callableObj = callableObj
+
+		def Stop(self):
+			pass
+
+	_module(
+		"wx",
+		Dialog=_Window,
+		CallAfter=lambda func, *args, **kwargs: func(*args, **kwargs),
+		CallLater=CallLater,
+		NOT_FOUND=-1,
+	)
+
+
+def _stubAudio():
+	import time
+
+	class AudioUtilities:
+		@staticmethod
+		def GetAllSessions():
+			if enumeration_latency:
+				time.sleep(enumeration_latency)
+			return list(all_sessions)
+
+	class NoSuchProcess(Exception):
+		pass
+
+	class AccessDenied(Exception):
+		pass
+
+	_module("avc_pycaw")
+	_module("avc_pycaw.utils", AudioUtilities=AudioUtilities)
+	_module("psutil", NoSuchProcess=NoSuchProcess, AccessDenied=AccessDenied)
+
+
+def install():
+	"""Install the stubs once and return the plugin package."""
+	if "globalPluginHandler" not in sys.modules:
+		_stubNvda()
+		_stubWx()
+		_stubAudio()
+	if ADDON_DIR not in sys.path:
+		sys.path.insert(0, ADDON_DIR)
+	import importlib
+	return importlib.import_module(PLUGIN_PACKAGE)
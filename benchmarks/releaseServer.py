@@ -0,0 +1,235 @@
+"""
+Local stand-in for the GitHub releases API.
+
+Serves a "latest release" JSON document and its assets over http.server,
+with the behaviour the update checker relies on: ETag and Last-Modified
+validators answered with 304, an optional rate limit that answers 403 with
+Retry-After and X-RateLimit headers, and asset downloads with Range support
+that can be throttled and made to drop the connection part way. The request
+log and byte count let scripts check what the updater sent and received.
+build_assets() makes a release from a folder with the add-on build code,
+bundle manifest included, for exercising delta updates.
+
+Usage:
+	python benchmarks/releaseServer.py [--port 8765] [--version 2026.02.01] [--rate-limit 5]
+		[--throttle 65536] [--drop-after 100000]
+
+Then point the updater at http://127.0.0.1:8765/repos/test/test/releases/latest.
+"""
+
+import argparse
+import hashlib
+import importlib.util
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+RELEASE_PATH = "/repos/test/test/releases/latest"
+ASSET_PREFIX = "/download/"
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ADDON_TOOL = os.path.join(REPO_ROOT, "site_scons", "site_tools", "NVDATool", "addon.py")
+
+
+class ReleaseState:
+	"""What the server publishes, and what it has been asked."""
+
+	def __init__(self, version: str = "2026.02.01", assets: dict[str, bytes] | None = None):
+		self.lock = threading.Lock()
+		self.requests: list[dict] = []
+		self.rate_limit: int | None = None
+		self.retry_after = 60
+		# Asset bytes per second, None for unthrottled
+		self.throttle: int | None = None
+		# Close asset connections after sending this many bytes
+		self.drop_after: int | None = None
+		self.drops = 0
+		# Asset bytes written to clients
+		self.bytes_sent = 0
+		self.base_url = ""
+		self.publish(version, assets or {f"audioVolumeControl-{version}.nvda-addon": b"PK\x05\x06" + bytes(18)})
+
+	def publish(self, version: str, assets: dict[str, bytes]):
+		with self.lock:
+			self.version = version
+			self.assets = dict(assets)
+			self.modified = time.time()
+			self._document = None
+
+	def document(self) -> bytes:
+		with self.lock:
+			if self._document is None:
+				release = {
+					"tag_name": f"v{self.version}",
+					"name": f"Version {self.version}",
+					"body": "Local test release",
+					"assets": [
+						{
+							"name": name,
+							"size": len(data),
+							"digest": f"sha256:{hashlib.sha256(data).hexdigest()}",
+							"browser_download_url": f"{self.base_url}{ASSET_PREFIX}{name}",
+						}
+						for name, data in self.assets.items()
+					],
+				}
+				self._document = json.dumps(release).encode("utf-8")
+			return self._document
+
+	def etag(self) -> str:
+		return '"' + hashlib.sha1(self.document()).hexdigest() + '"'
+
+	def last_modified(self) -> str:
+		return formatdate(self.modified, usegmt=True)
+
+
+class ReleaseHandler(BaseHTTPRequestHandler):
+	state: ReleaseState
+
+	def log_message(self, format, *args):
+		pass
+
+	def do_GET(self):
+		state = self.state
+		with state.lock:
+			state.requests.append({"path": self.path, "headers": dict(self.headers)})
+			count = len(state.requests)
+		if state.rate_limit is not None and count > state.rate_limit:
+			self.send_response(403)
+			self.send_header("Retry-After", str(state.retry_after))
+			self.send_header("X-RateLimit-Remaining", "0")
+			self.send_header("X-RateLimit-Reset", str(int(time.time() + state.retry_after)))
+			self.end_headers()
+			return
+		if self.path == RELEASE_PATH:
+			self._sendRelease()
+		elif self.path.startswith(ASSET_PREFIX):
+			self._sendAsset(self.path[len(ASSET_PREFIX):])
+		else:
+			self.send_error(404)
+
+	def _sendRelease(self):
+		state = self.state
+		etag = state.etag()
+		if self.headers.get("If-None-Match") == etag:
+			self.send_response(304)
+			self.send_header("ETag", etag)
+			self.end_headers()
+			return
+		body = state.document()
+		self.send_response(200)
+		self.send_header("Content-Type", "application/json")
+		self.send_header("Content-Length", str(len(body)))
+		self.send_header("ETag", etag)
+		self.send_header("Last-Modified", state.last_modified())
+		self.end_headers()
+		self.wfile.write(body)
+
+	def _sendAsset(self, name: str):
+		state = self.state
+		data = state.assets.get(name)
+		if data is None:
+			self.send_error(404)
+			return
+		start, end = 0, len(data)
+		match = re.fullmatch(r"bytes=(\d+)-(\d*)", self.headers.get("Range", ""))
+		if match:
+			start = int(match.group(1))
+			if match.group(2):
+				end = min(end, int(match.group(2)) + 1)
+			if start >= len(data) or start >= end:
+				self.send_response(416)
+				self.send_header("Content-Range", f"bytes */{len(data)}")
+				self.end_headers()
+				return
+			self.send_response(206)
+			self.send_header("Content-Range", f"bytes {start}-{end - 1}/{len(data)}")
+		else:
+			self.send_response(200)
+		self.send_header("Content-Type", "application/octet-stream")
+		self.send_header("Content-Length", str(end - start))
+		self.end_headers()
+		sent = 0
+		block = 16 * 1024
+		for offset in range(start, end, block):
+			piece = data[offset:min(end, offset + block)]
+			if state.drop_after is not None and sent + len(piece) > state.drop_after:
+				self.wfile.write(piece[:state.drop_after - sent])
+				with state.lock:
+					state.drops += 1
+					state.bytes_sent += state.drop_after - sent
+				self.close_connection = True
+				return
+			self.wfile.write(piece)
+			sent += len(piece)
+			with state.lock:
+				state.bytes_sent += len(piece)
+			if state.throttle:
+				time.sleep(len(piece) / state.throttle)
+
+
+def _addonTool():
+	spec = importlib.util.spec_from_file_location("nvdaToolAddon", ADDON_TOOL)
+	module = importlib.util.module_from_spec(spec)
+	spec.loader.exec_module(module)
+	return module
+
+
+def build_assets(sourceDir: str, name: str = "audioVolumeControl", version: str = "2026.02.01") -> dict[str, bytes]:
+	"""Bundle sourceDir and write its manifest as the build does; returns the release assets."""
+	tool = _addonTool()
+	with tempfile.TemporaryDirectory(prefix="avc-release-") as workDir:
+		bundlePath = os.path.join(workDir, f"{name}-{version}.nvda-addon")
+		manifestPath = os.path.join(workDir, f"{name}-{version}.files.json")
+		tool.createAddonBundleFromPath(sourceDir, bundlePath, ())
+		tool.createBundleManifest(bundlePath, manifestPath)
+		with open(bundlePath, "rb") as f:
+			bundle = f.read()
+		with open(manifestPath, "rb") as f:
+			manifest = f.read()
+	return {os.path.basename(bundlePath): bundle, os.path.basename(manifestPath): manifest}
+
+
+def start(state: ReleaseState | None = None, port: int = 0) -> tuple[ThreadingHTTPServer, ReleaseState]:
+	"""Serve state from a background thread; returns the server and the state."""
+	state = state or ReleaseState()
+	handler = type("Handler", (ReleaseHandler,), {"state": state})
+	server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+	state.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+	state._document = None
+	threading.Thread(target=server.serve_forever, daemon=True).start()
+	return server, state
+
+
+def release_url(state: ReleaseState) -> str:
+	return state.base_url + RELEASE_PATH
+
+
+def main(argv: list[str] | None = None) -> int:
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument("--port", type=int, default=8765)
+	parser.add_argument("--version", default="2026.02.01", help="Version of the published release")
+	parser.add_argument("--rate-limit", type=int, help="Answer 403 after this many requests")
+	parser.add_argument("--throttle", type=int, help="Asset bytes per second")
+	parser.add_argument("--drop-after", type=int, help="Drop asset connections after this many bytes")
+	args = parser.parse_args(argv)
+	server, state = start(ReleaseState(args.version), args.port)
+	state.rate_limit = args.rate_limit
+	state.throttle = args.throttle
+	state.drop_after = args.drop_after
+	print(f"Serving {release_url(state)}")
+	try:
+		while True:
+			time.sleep(1)
+	except KeyboardInterrupt:
+		server.shutdown()
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,129 @@
+"""
+End-to-end check of delta updates against the local release server.
+
+Bundles the add-on folder twice, the second time with some modules edited,
+"installs" the first bundle by extracting it, serves the second with its
+manifest from releaseServer, and runs the updater's download both as a delta
+and as a full download. Prints the bytes transferred and the time taken by
+each as JSON, after checking that the assembled bundle holds exactly the
+files of the published one.
+
+Usage:
+	python benchmarks/updateTransfer.py [--changed 2] [--lib-kb 2048] [--throttle 1048576]
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import nvdaStubs  # noqa: E402
+import releaseServer  # noqa: E402
+
+nvdaStubs.install()
+
+from globalPlugins.audioVolumeControl import deltaUpdate, updateChecker  # noqa: E402
+
+PLUGIN_DIR = os.path.join("globalPlugins", "audioVolumeControl")
+
+
+def makeSource(root: str, libKb: int) -> str:
+	"""Copy the add-on folder, adding stand-in binaries when lib/ has not been built."""
+	shutil.copytree(nvdaStubs.ADDON_DIR, root, ignore=shutil.ignore_patterns("__pycache__", "*.pyc"))
+	if not os.path.isfile(os.path.join(root, "manifest.ini")):
+		with open(os.path.join(root, "manifest.ini"), "w", encoding="utf-8") as f:
+			f.write("name = audioVolumeControl\nversion = 2026.01.01\n")
+	libDir = os.path.join(root, PLUGIN_DIR, "lib")
+	if not os.path.isdir(libDir) and libKb:
+		os.makedirs(os.path.join(libDir, "psutil"))
+		rng = random.Random(0)
+		with open(os.path.join(libDir, "psutil", "_psutil_windows.cp311-win32.pyd"), "wb") as f:
+			f.write(rng.randbytes(libKb * 1024))
+	return root
+
+
+def editModules(root: str, count: int) -> list[str]:
+	"""Change count plugin modules, as a release would."""
+	pluginDir = os.path.join(root, PLUGIN_DIR)
+	names = sorted(name for name in os.listdir(pluginDir) if name.endswith(".py"))[:count]
+	for name in names:
+		with open(os.path.join(pluginDir, name), "a", encoding="utf-8") as f:
+			f.write("\n# Changed in the next release\n")
+	with open(os.path.join(root, "manifest.ini"), "a", encoding="utf-8") as f:
+		f.write("# next release\n")
+	return names
+
+
+def run(changed: int, libKb: int, throttle: int | None) -> dict:
+	with tempfile.TemporaryDirectory(prefix="avc-update-") as workDir:
+		oldSource = makeSource(os.path.join(workDir, "old"), libKb)
+		newSource = os.path.join(workDir, "new")
+		shutil.copytree(oldSource, newSource)
+		edited = editModules(newSource, changed)
+
+		installed = os.path.join(workDir, "installed")
+		oldAssets = releaseServer.build_assets(oldSource, version="2026.01.01")
+		oldBundle = next(data for name, data in oldAssets.items() if name.endswith(".nvda-addon"))
+		bundlePath = os.path.join(workDir, "old.nvda-addon")
+		with open(bundlePath, "wb") as f:
+			f.write(oldBundle)
+		with zipfile.ZipFile(bundlePath) as z:
+			z.extractall(installed)
+
+		server, state = releaseServer.start(releaseServer.ReleaseState("2026.02.01", releaseServer.build_assets(newSource)))
+		state.throttle = throttle
+		try:
+			release = updateChecker.parse_release(json.loads(state.document()))
+			results = {"changed_modules": edited, "bundle_size": release["asset_size"]}
+			for mode, info in (("delta", release), ("full", dict(release, manifest_url=None))):
+				sentBefore = state.bytes_sent
+				requestsBefore = len(state.requests)
+				start = time.perf_counter()
+				path = deltaUpdate.fetch_update(info, dest_dir=os.path.join(workDir, mode), installed_dir=installed)
+				elapsed = time.perf_counter() - start
+				if path is None:
+					raise SystemExit(f"{mode} update failed")
+				with zipfile.ZipFile(path) as got, zipfile.ZipFile(publishedBundle(state, workDir)) as want:
+					if sorted(got.namelist()) != sorted(want.namelist()) or any(
+						got.read(name) != want.read(name) for name in want.namelist()
+					):
+						raise SystemExit(f"{mode} update produced a different bundle")
+				results[mode] = {
+					"mode": deltaUpdate.last_update["mode"],
+					"bytes_reported": deltaUpdate.last_update["transferred"],
+					"bytes_served": state.bytes_sent - sentBefore,
+					"requests": len(state.requests) - requestsBefore,
+					"seconds": round(elapsed, 4),
+				}
+			return results
+		finally:
+			server.shutdown()
+
+
+def publishedBundle(state: releaseServer.ReleaseState, workDir: str) -> str:
+	name, data = next((name, data) for name, data in state.assets.items() if name.endswith(".nvda-addon"))
+	path = os.path.join(workDir, "published-" + name)
+	with open(path, "wb") as f:
+		f.write(data)
+	return path
+
+
+def main(argv: list[str] | None = None) -> int:
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument("--changed", type=int, default=2, help="Plugin modules edited in the new release")
+	parser.add_argument("--lib-kb", type=int, default=2048, help="Size of stand-in binaries when lib/ is not built")
+	parser.add_argument("--throttle", type=int, help="Asset bytes per second served")
+	args = parser.parse_args(argv)
+	print(json.dumps(run(args.changed, args.lib_kb, args.throttle), indent=1))
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
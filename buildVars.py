@@ -35,7 +35,24 @@ pythonSources: list[str] = [
 
 i18nSources: list[str] = pythonSources + ["buildVars.py"]
 
-excludedFiles: list[str] = []
+# Bytecode left in the source tree is not bundled; the build compiles its own (see bytecodeInterpreters).
+# The fake audio backend only serves the tests and benchmarks.
+excludedFiles: list[str] = ["__pycache__", "*.pyc", "globalPlugins/audioVolumeControl/fakeBackend.py"]
+
+# Interpreters compiling the bytecode shipped in the bundle, one per Python version NVDA uses:
+# 3.7 for NVDA 2019.3 to 2023.3, 3.11 for 2024.1 to 2025.x and 3.13 from 2026.1.
+# Interpreters that are not installed are skipped; build with `scons bytecode=0` to ship sources only.
+bytecodeInterpreters: list[str] = ["python3.7", "python3.11", "python3.13"]
+# Optimization levels to compile for; NVDA runs without -O, so level 0 is the one it loads
+bytecodeOptimizeLevels: list[int] = [0]
+
+# Interpreters to build slim bundles for with `scons slim=1`, as (Python tag, platform tag).
+# A slim bundle carries only the psutil extension that interpreter loads; targets resolving
+# to the same extension share one bundle.
+slimBundleTargets: list[tuple[str, str]] = [
+	("cp311", "win32"),
+	("cp313", "win_amd64"),
+]
 
 baseLanguage: str = "en"
 
@@ -4,110 +4,14 @@ set -e
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 cd "$SCRIPT_DIR"
 
-ADDON_DIR=$(find . -type d -name "globalPlugins" -print -quit 2>/dev/null)
-if [ -z "$ADDON_DIR" ]; then
-    echo "Error: globalPlugins directory not found"
-    exit 1
-fi
+# Fetches the dependencies missing from .vendorcache and updates only the files
+# of the plugin's lib folder that changed. Arguments are passed on, so
+# ./build_linux.sh --offline --from DIR builds without network access.
+python3 vendor.py "$@"
 
-PLUGIN_DIR=$(find "$ADDON_DIR" -mindepth 1 -maxdepth 1 -type d -print -quit)
-if [ -z "$PLUGIN_DIR" ]; then
-    echo "Error: Plugin directory not found inside globalPlugins"
-    exit 1
-fi
-
-LIB_DIR="$PLUGIN_DIR/lib"
-mkdir -p "$LIB_DIR"
-
-echo "Installing dependencies to $LIB_DIR..."
-
-rm -rf "$LIB_DIR/psutil" "$LIB_DIR/avc_pycaw" "$LIB_DIR/pycaw"
-
-TMP_DIR=$(mktemp -d)
-mkdir -p "$LIB_DIR/psutil"
-
-echo "Downloading psutil wheels..."
-for pyver in 37 38 39 310 311 312 313; do
-    if [ "$pyver" = "37" ]; then
-        pip3 download psutil --platform win32 --python-version "37" --abi "abi3" --only-binary=:all: --implementation cp -d "$TMP_DIR" --quiet || true
-        abi="cp37m"
-    elif [ "$pyver" = "313" ]; then
-        abi="cp313t"
-    else
-        abi="abi3"
-    fi
-    pip3 download psutil --platform win32 --python-version "$pyver" --abi "$abi" --only-binary=:all: --implementation cp -d "$TMP_DIR" --quiet || true
-done
-for pyver in 311 312 313; do
-    if [ "$pyver" = "313" ]; then
-        abi="cp313t"
-    else
-        abi="abi3"
-    fi
-    pip3 download psutil --platform win_amd64 --python-version "$pyver" --abi "$abi" --only-binary=:all: --implementation cp -d "$TMP_DIR" --quiet || true
-done
-# Ensure we fetch the stable ABI cp37 wheel for AMD64
-pip3 download psutil --platform win_amd64 --python-version "37" --abi "abi3" --only-binary=:all: --implementation cp -d "$TMP_DIR" --quiet || true
-
-ANY_WHL=$(find "$TMP_DIR" -name "psutil*.whl" -print -quit)
-if [ -n "$ANY_WHL" ]; then
-    unzip -q "$ANY_WHL" -d "$TMP_DIR/psutil_extracted"
-    cp -r "$TMP_DIR/psutil_extracted/psutil/"* "$LIB_DIR/psutil/"
-    rm -f "$LIB_DIR/psutil/"*.pyd
-    echo "psutil pure Python files copied"
-fi
-
-for whl in "$TMP_DIR"/psutil*.whl; do
-    if [ -f "$whl" ]; then
-        WHL_NAME=$(basename "$whl" .whl)
-        IFS='-' read -ra PARTS <<< "$WHL_NAME"
-        LEN=${#PARTS[@]}
-        PY_TAG="${PARTS[$((LEN-3))]}"
-        PLAT_TAG="${PARTS[$((LEN-1))]}"
-        
-        EXT_DIR="$TMP_DIR/extract_${WHL_NAME}"
-        mkdir -p "$EXT_DIR"
-        unzip -q "$whl" -d "$EXT_DIR"
-        
-        for pyd in "$EXT_DIR/psutil/"*.pyd; do
-            if [ -f "$pyd" ]; then
-                TARGET_NAME="_psutil_windows.${PY_TAG}-${PLAT_TAG}.pyd"
-                cp "$pyd" "$LIB_DIR/psutil/$TARGET_NAME"
-                echo "  ✓ Extracted and renamed to $TARGET_NAME"
-            fi
-        done
-    fi
-done
-
-echo "Downloading stable ABI python3.dll helpers..."
-curl -sL https://www.python.org/ftp/python/3.13.1/python-3.13.1-embed-win32.zip -o "$TMP_DIR/embed-win32.zip"
-curl -sL https://www.python.org/ftp/python/3.13.1/python-3.13.1-embed-amd64.zip -o "$TMP_DIR/embed-amd64.zip"
-
-unzip -q -j "$TMP_DIR/embed-win32.zip" python3.dll -d "$TMP_DIR/extracted-win32"
-cp "$TMP_DIR/extracted-win32/python3.dll" "$LIB_DIR/psutil/python3-win32.dll"
-
-unzip -q -j "$TMP_DIR/embed-amd64.zip" python3.dll -d "$TMP_DIR/extracted-amd64"
-cp "$TMP_DIR/extracted-amd64/python3.dll" "$LIB_DIR/psutil/python3-win_amd64.dll"
-
-echo "python3.dll helpers packaged successfully"
-
-pip3 install pycaw -t "$TMP_DIR/pycaw_tmp" --quiet --no-compile
-if [ -d "$TMP_DIR/pycaw_tmp/pycaw" ]; then
-    mv "$TMP_DIR/pycaw_tmp/pycaw" "$LIB_DIR/avc_pycaw"
-    find "$LIB_DIR/avc_pycaw" -name "*.py" -exec sed -i 's/from pycaw\./from avc_pycaw./g; s/import pycaw/import avc_pycaw/g' {} \;
-    find "$LIB_DIR/avc_pycaw" -name "*.py" -exec sed -i 's/import comtypes/import comtypes/g' {} \;
-    echo "pycaw vendorized as avc_pycaw"
-fi
-
-rm -rf "$TMP_DIR"
-
-find "$LIB_DIR" -type d -name "tests" -exec rm -rf {} + 2>/dev/null || true
-find "$LIB_DIR" -type d -name "__pycache__" -exec rm -rf {} + 2>/dev/null || true
-find "$LIB_DIR" -name "*.pyc" -delete 2>/dev/null || true
-
-rm -f ./*.nvda-addon
-scons -c
-scons
+# Outputs of earlier versions would otherwise be published with this one
+rm -f ./*.nvda-addon ./*.files.json ./*.sizes.txt
+scons slim=1
 
 echo "Build complete!"
-ls -la ./*.nvda-addon 2>/dev/null || echo "No addon file found"
+ls -la ./*.nvda-addon ./*.files.json 2>/dev/null || echo "No addon file found"
@@ -0,0 +1,154 @@
+"""
+Build outputs cached by the hash of their inputs, and the process pool they are built in.
+
+Shared by the site tools; SCons puts this folder on the module path before
+loading them.
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import shutil
+import site
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+
+CACHE_DIR = Path(__file__).resolve().parent.parent / ".buildcache"
+# Bumped when the layout of the cache or the meaning of its keys changes
+CACHE_FORMAT = 1
+
+
+def _fileDigest(path: str | Path | None) -> str | None:
+	if path is None:
+		return None
+	return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def inputKey(builder: str, files: Iterable[str | Path | None], values: object) -> str:
+	"""
+	Hash of everything an output is built from: the builder, the content of
+	each input file (None standing for a missing optional input) and any other
+	values, which must be JSON serializable.
+	"""
+	document = json.dumps(
+		{
+			"format": CACHE_FORMAT,
+			"builder": builder,
+			"files": [_fileDigest(path) for path in files],
+			"values": values,
+		},
+		sort_keys=True,
+		ensure_ascii=False,
+	)
+	return hashlib.sha256(document.encode("utf-8")).hexdigest()
+
+
+class BuildCache:
+	"""Built outputs stored by input key, kept across builds and cleans."""
+
+	def __init__(self, directory: str | Path = CACHE_DIR):
+		self.directory = Path(directory)
+
+	def _entry(self, builder: str, key: str) -> Path:
+		return self.directory / builder / key
+
+	def restore(self, builder: str, key: str, dest: str | Path) -> bool:
+		"""Copies the cached output for key to dest; returns whether there was one."""
+		try:
+			shutil.copyfile(self._entry(builder, key), dest)
+		except FileNotFoundError:
+			return False
+		return True
+
+	def store(self, builder: str, key: str, dest: str | Path):
+		entry = self._entry(builder, key)
+		entry.parent.mkdir(parents=True, exist_ok=True)
+		# Several builds may share the cache; readers only ever see complete entries
+		part = entry.with_name(f"{key}.{os.getpid()}.{threading.get_ident()}.part")
+		shutil.copyfile(dest, part)
+		os.replace(part, entry)
+
+
+class BuilderTimings:
+	"""Outputs built and restored from the cache, and the seconds spent, per builder."""
+
+	def __init__(self):
+		self._lock = threading.Lock()
+		self.builders: dict[str, dict[str, float]] = {}
+
+	def record(self, builder: str, cached: bool, seconds: float):
+		with self._lock:
+			counts = self.builders.setdefault(builder, {"built": 0, "cached": 0, "seconds": 0.0})
+			counts["cached" if cached else "built"] += 1
+			counts["seconds"] += seconds
+
+	def summary(self) -> str:
+		lines = []
+		for builder, counts in sorted(self.builders.items()):
+			lines.append(
+				f"{builder}: {counts['built']} built, {counts['cached']} from cache"
+				f" in {counts['seconds']:.3f} s"
+			)
+		return "\n".join(lines)
+
+
+cache = BuildCache()
+timings = BuilderTimings()
+_pool: Executor | None = None
+_poolLock = threading.Lock()
+
+
+def _buildPool() -> Executor:
+	"""
+	The process pool outputs are built in, started on the first cache miss.
+	Workers import the site tools by name, so their folder is put on their path.
+	"""
+	global _pool
+	with _poolLock:
+		if _pool is None:
+			_pool = ProcessPoolExecutor(
+				initializer=site.addsitedir,
+				initargs=(str(Path(__file__).resolve().parent / "site_tools"),),
+			)
+			atexit.register(_pool.shutdown)
+		return _pool
+
+
+def _printSummary():
+	if timings.builders:
+		print(timings.summary())
+
+
+atexit.register(_printSummary)
+
+
+def buildCached(
+		builder: str,
+		build: Callable[..., object],
+		dest: str | Path,
+		inputs: Iterable[str | Path | None],
+		values: object,
+		**kwargs,
+	):
+	"""
+	Writes dest with build(dest=dest, **kwargs) unless an output built from
+	the same inputs and values is cached. Builds run in the process pool, so
+	outputs requested from parallel SCons jobs are built in parallel.
+	"""
+	start = time.perf_counter()
+	key = inputKey(builder, inputs, values)
+	cached = cache.restore(builder, key, dest)
+	if not cached:
+		try:
+			_buildPool().submit(build, dest=str(dest), **kwargs).result()
+		except BrokenProcessPool:
+			print(f"Build pool unavailable, building {dest} in the build process")
+			build(dest=str(dest), **kwargs)
+		cache.store(builder, key, dest)
+	timings.record(builder, cached, time.perf_counter() - start)
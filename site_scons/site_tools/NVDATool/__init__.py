@@ -4,10 +4,20 @@ This tool generates NVDA extensions.
 Builders:
 
 - NVDAAddon: Creates a .nvda-addon zip file. Requires the `excludePatterns` environment variable.
+  Rebuilds reuse unchanged entries of the previous bundle, recorded in a `.index.json` file next to it.
+  When `bytecodeInterpreters` lists interpreters, each one compiles checked hash-based .pyc files
+  (at the `bytecodeOptimizeLevels`) into `bytecodeDir`, and they are added to the bundle.
+- NVDABundleManifest: Creates the JSON list of files in a .nvda-addon, with their hashes, used by delta updates.
+- NVDABundleSizeReport: Writes and prints a table comparing the sizes of several .nvda-addon files.
 - NVDAManifest: Creates the manifest.ini file.
 - NVDATranslatedManifest: Creates the manifest.ini file with only translated information.
 - md2html: Build HTML from Markdown
 
+Manifests and HTML are rendered in a process pool, so that with parallel jobs independent
+locales render in parallel. They are cached in `.buildcache`, kept across cleans, by the hash
+of everything they are rendered from; unchanged outputs are copied from the cache. The outputs
+rendered and the time spent per builder are printed after the build (see site_scons/buildCache.py).
+
 The following environment variables are required to create the manifest:
 
 - addon_info: .typing.AddonInfo
@@ -22,22 +32,106 @@ The following environment variables are required to build the HTML:
 
 """
 
+from pathlib import Path
+
+import markdown
+from buildCache import buildCached
 from SCons.Script import Environment, Builder
 
-from .addon import createAddonBundleFromPath
+from . import docs, manifests, utils
+
+from .addon import collectFiles, compilePatterns, createAddonBundleFromPath, createBundleManifest, reportBundleSizes
+from .bytecode import compileBytecode
 from .manifests import generateManifest, generateTranslatedManifest
 from .docs import md2html
 
 
 
+def buildAddon(target, source, env):
+	sourceDir = Path(source[0].abspath)
+	extraFiles = []
+	if env["bytecodeInterpreters"]:
+		stagingDir = Path(env.Dir("$bytecodeDir").abspath)
+		results = compileBytecode(
+			collectFiles(sourceDir, compilePatterns(env["excludePatterns"])),
+			stagingDir,
+			env["bytecodeInterpreters"],
+			env["bytecodeOptimizeLevels"],
+		)
+		for result in results:
+			print(f"Bytecode for {result['tag']}: {result['compiled']} compiled, {result['reused']} reused")
+			extraFiles.extend((name, stagingDir / name) for name in result["files"])
+	createAddonBundleFromPath(sourceDir, target[0].abspath, env["excludePatterns"], extraFiles=extraFiles)
+
+
+# Modules whose code renders the outputs, so that changing them invalidates the cache
+RENDERERS = (docs.__file__, manifests.__file__, utils.__file__)
+
+
+def buildManifest(target, source, env):
+	buildCached(
+		"NVDAManifest",
+		generateManifest,
+		target[0].abspath,
+		[source[0].abspath, *RENDERERS],
+		[env["addon_info"], env["brailleTables"], env["symbolDictionaries"]],
+		source=source[0].abspath,
+		addon_info=dict(env["addon_info"]),
+		brailleTables=env["brailleTables"],
+		symbolDictionaries=env["symbolDictionaries"],
+	)
+
+
+def buildTranslatedManifest(target, source, env):
+	addon_info = env["addon_info"]
+	translated = {var: addon_info[var] for var in ("addon_summary", "addon_description", "addon_changelog")}
+	buildCached(
+		"NVDATranslatedManifest",
+		generateTranslatedManifest,
+		target[0].abspath,
+		[source[0].abspath, source[1].abspath, *RENDERERS],
+		[translated, env["brailleTables"], env["symbolDictionaries"]],
+		source=source[1].abspath,
+		mo=source[0].abspath,
+		addon_info=dict(addon_info),
+		brailleTables=env["brailleTables"],
+		symbolDictionaries=env["symbolDictionaries"],
+	)
+
+
+def buildHtml(target, source, env):
+	addon_info = env["addon_info"]
+	moFile = env["moFile"].abspath if env["moFile"] else None
+	mdExtensions = list(env["mdExtensions"])
+	buildCached(
+		"md2html",
+		md2html,
+		target[0].abspath,
+		[source[0].abspath, moFile, *RENDERERS],
+		{
+			"lang": source[0].dir.name,
+			"addon_info": {var: addon_info[var] for var in ("addon_summary", "addon_version")},
+			"mdExtensions": mdExtensions,
+			"markdown": markdown.__version__,
+		},
+		source=source[0].abspath,
+		moFile=moFile,
+		mdExtensions=mdExtensions,
+		addon_info=dict(addon_info),
+	)
+
+
 def generate(env: Environment):
 	env.SetDefault(excludePatterns=tuple())
+	env.SetDefault(bytecodeInterpreters=tuple())
+	env.SetDefault(bytecodeOptimizeLevels=(0,))
+	env.SetDefault(bytecodeDir=".bytecode")
 
+	# Which files are bundled, and which bytecode with them, depends on these
 	addonAction = env.Action(
-		lambda target, source, env: createAddonBundleFromPath(
-			source[0].abspath, target[0].abspath, env["excludePatterns"]
-		) and None,
+		buildAddon,
 		lambda target, source, env: f"Generating Addon {target[0]}",
+		varlist=["bytecodeInterpreters", "bytecodeOptimizeLevels", "excludePatterns"],
 	)
 	env["BUILDERS"]["NVDAAddon"] = Builder(
 		action=addonAction,
@@ -45,18 +139,36 @@ def generate(env: Environment):
 		src_suffix="/"
 	)
 
+	bundleManifestAction = env.Action(
+		lambda target, source, env: createBundleManifest(source[0].abspath, target[0].abspath) and None,
+		lambda target, source, env: f"Generating bundle manifest {target[0]}",
+	)
+	env["BUILDERS"]["NVDABundleManifest"] = Builder(
+		action=bundleManifestAction,
+		suffix=".files.json",
+		src_suffix=".nvda-addon"
+	)
+
+	sizeReportAction = env.Action(
+		lambda target, source, env: print(
+			reportBundleSizes([s.abspath for s in source], target[0].abspath), end=""
+		),
+		lambda target, source, env: f"Comparing bundle sizes in {target[0]}",
+	)
+	env["BUILDERS"]["NVDABundleSizeReport"] = Builder(
+		action=sizeReportAction,
+		suffix=".txt",
+	)
+
 	env.SetDefault(brailleTables={})
 	env.SetDefault(symbolDictionaries={})
 
+	# The values outputs are rendered from are part of the action signatures,
+	# so that changing them in buildVars or on the command line rebuilds the outputs
 	manifestAction = env.Action(
-		lambda target, source, env: generateManifest(
-			source[0].abspath,
-			target[0].abspath,
-			addon_info=env["addon_info"],
-			brailleTables=env["brailleTables"],
-			symbolDictionaries=env["symbolDictionaries"],
-		) and None,
+		buildManifest,
 		lambda target, source, env: f"Generating manifest {target[0]}",
+		varlist=["addon_info", "brailleTables", "symbolDictionaries"],
 	)
 	env["BUILDERS"]["NVDAManifest"] = Builder(
 		action=manifestAction,
@@ -65,15 +177,9 @@ def generate(env: Environment):
 	)
 
 	translatedManifestAction = env.Action(
-		lambda target, source, env: generateTranslatedManifest(
-			source[1].abspath,
-			target[0].abspath,
-			mo=source[0].abspath,
-			addon_info=env["addon_info"],
-			brailleTables=env["brailleTables"],
-			symbolDictionaries=env["symbolDictionaries"],
-		) and None,
+		buildTranslatedManifest,
 		lambda target, source, env: f"Generating translated manifest {target[0]}",
+		varlist=["addon_info", "brailleTables", "symbolDictionaries"],
 	)
 
 	env["BUILDERS"]["NVDATranslatedManifest"] = Builder(
@@ -85,14 +191,9 @@ def generate(env: Environment):
 	env.SetDefault(mdExtensions = {})
 
 	mdAction = env.Action(
-		lambda target, source, env: md2html(
-			source[0].path,
-			target[0].path,
-			moFile=env["moFile"].path if env["moFile"] else None,
-			mdExtensions=env["mdExtensions"],
-			addon_info=env["addon_info"],
-		) and None,
+		buildHtml,
 		lambda target, source, env: f"Generating {target[0]}",
+		varlist=["addon_info", "mdExtensions"],
 	)
 	env["BUILDERS"]["md2html"] = env.Builder(
 		action=mdAction,
@@ -1,24 +1,265 @@
+import hashlib
+import json
+import os
+import re
+import struct
 import zipfile
-from collections.abc import Iterable
-from pathlib import Path
+import zlib
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path, PurePosixPath
 
 
+# Version of the bundle manifest format written by createBundleManifest
+BUNDLE_MANIFEST_FORMAT = 1
+# zlib level used for bundle entries, the same as zipfile's default
+COMPRESS_LEVEL = 6
+# Every entry gets this timestamp (1980-01-01 00:00) so unchanged inputs give identical bundles
+_DOS_DATE = (0 << 9) | (1 << 5) | 1
+_DOS_TIME = 0
+# Regular file, rw-r--r--
+_EXTERNAL_ATTR = 0o100644 << 16
+_VERSION = 20
+_UTF8_FLAG = 0x800
+# Fixed part of a zip local file header, before the file name and extra field
+_LOCAL_HEADER = struct.Struct("<4s5H3L2H")
+_CENTRAL_HEADER = struct.Struct("<4s4B4HL2L5H2L")
+_END_RECORD = struct.Struct("<4s4H2LH")
+# Sidecar file next to the bundle recording each entry's hash, so the next build can reuse it
+INDEX_SUFFIX = ".index.json"
+
 
 def matchesNoPatterns(path: Path, patterns: Iterable[str]) -> bool:
 	"""Checks if the path, the first argument, does not match any of the patterns passed as the second argument."""
 	return not any((path.match(pattern) for pattern in patterns))
 
 
-def createAddonBundleFromPath(path: str | Path, dest: str, excludePatterns: Iterable[str]):
-	"""Creates a bundle from a directory that contains an addon manifest file."""
+def _globPart(part: str) -> str:
+	"""Regex for one path component of a glob pattern."""
+	out = []
+	i = 0
+	while i < len(part):
+		c = part[i]
+		if c == "*":
+			out.append("[^/]*")
+		elif c == "?":
+			out.append("[^/]")
+		elif c == "[" and (close := part.find("]", i + 2)) != -1:
+			body = part[i + 1:close].replace("\\", "\\\\")
+			if body.startswith("!"):
+				body = "^" + body[1:]
+			out.append(f"[{body}]")
+			i = close
+		else:
+			out.append(re.escape(c))
+		i += 1
+	return "".join(out)
+
+
+def compilePatterns(patterns: Iterable[str]) -> Callable[[str], bool]:
+	"""
+	Compiles exclude patterns once into a function telling whether a bundle path matches any of them.
+
+	Paths are relative and use forward slashes. Like Path.match, a pattern
+	matches from the right, so "*.pyc" matches at any depth.
+	"""
+	regexes = [
+		"/".join(_globPart(part) for part in pattern.strip("/").split("/"))
+		for pattern in patterns
+		if pattern.strip("/")
+	]
+	if not regexes:
+		return lambda path: False
+	flags = re.IGNORECASE if os.name == "nt" else 0
+	matcher = re.compile(f"(?:^|.*/)(?:{'|'.join(regexes)})$", flags)
+	return lambda path: matcher.match(path) is not None
+
+
+def collectFiles(basedir: Path, excluded: Callable[[str], bool]) -> list[tuple[str, Path]]:
+	"""
+	Lists (path in bundle, file) pairs under basedir, sorted by path in bundle.
+
+	Directories matching an exclude pattern are skipped with everything below them.
+	"""
+	files = []
+	for root, dirnames, filenames in os.walk(basedir):
+		relRoot = PurePosixPath(Path(root).relative_to(basedir).as_posix())
+		dirnames[:] = [d for d in dirnames if not excluded(str(relRoot / d))]
+		for name in filenames:
+			pathInBundle = str(relRoot / name)
+			if not excluded(pathInBundle):
+				files.append((pathInBundle, Path(root, name)))
+	files.sort(key=lambda item: item[0])
+	return files
+
+
+def _loadIndex(dest: Path) -> tuple[dict, bytes]:
+	"""Entries recorded for the bundle at dest and its bytes, or nothing if they do not agree."""
+	try:
+		index = json.loads(Path(str(dest) + INDEX_SUFFIX).read_text(encoding="utf-8"))
+		data = dest.read_bytes()
+	except (OSError, ValueError):
+		return {}, b""
+	if index.get("level") != COMPRESS_LEVEL or index.get("sha256") != _sha256(data):
+		return {}, b""
+	return index.get("entries", {}), data
+
+
+def _prepareEntry(pathInBundle: str, source: Path, previous: dict, previousData: bytes) -> dict:
+	"""Reads one file and returns its entry, reusing the previous bundle's compressed bytes when its hash matches."""
+	data = source.read_bytes()
+	digest = _sha256(data)
+	old = previous.get(pathInBundle)
+	if old and old["sha256"] == digest and old["size"] == len(data):
+		raw = previousData[old["offset"]:old["offset"] + old["compressed_size"]]
+		if len(raw) == old["compressed_size"]:
+			return dict(old, name=pathInBundle, raw=raw, reused=True)
+	compressor = zlib.compressobj(COMPRESS_LEVEL, zlib.DEFLATED, -zlib.MAX_WBITS)
+	raw = compressor.compress(data) + compressor.flush()
+	return {
+		"name": pathInBundle,
+		"sha256": digest,
+		"size": len(data),
+		"crc": zlib.crc32(data),
+		"compress_type": zipfile.ZIP_DEFLATED,
+		"compressed_size": len(raw),
+		"raw": raw,
+		"reused": False,
+	}
+
+
+def _writeZip(dest: Path, entries: list[dict]):
+	"""Writes entries as a zip with fixed timestamps and attributes, recording where each one's data starts."""
+	if len(entries) > 0xFFFF or any(e["size"] >= 0xFFFFFFFF or e["compressed_size"] >= 0xFFFFFFFF for e in entries):
+		raise ValueError(f"{dest} would need ZIP64, which the bundler does not write")
+	central = []
+	with open(dest, "wb") as f:
+		for entry in entries:
+			name = entry["name"].encode("utf-8")
+			flags = 0 if entry["name"].isascii() else _UTF8_FLAG
+			headerOffset = f.tell()
+			f.write(_LOCAL_HEADER.pack(
+				b"PK\x03\x04", _VERSION, flags, entry["compress_type"], _DOS_TIME, _DOS_DATE,
+				entry["crc"], entry["compressed_size"], entry["size"], len(name), 0,
+			))
+			f.write(name)
+			entry["offset"] = f.tell()
+			f.write(entry["raw"])
+			central.append(_CENTRAL_HEADER.pack(
+				b"PK\x01\x02", _VERSION, 3, _VERSION, 0, flags, entry["compress_type"], _DOS_TIME, _DOS_DATE,
+				entry["crc"], entry["compressed_size"], entry["size"], len(name), 0, 0, 0, 0,
+				_EXTERNAL_ATTR, headerOffset,
+			) + name)
+		centralOffset = f.tell()
+		centralDir = b"".join(central)
+		f.write(centralDir)
+		f.write(_END_RECORD.pack(b"PK\x05\x06", 0, 0, len(entries), len(entries), len(centralDir), centralOffset, 0))
+
+
+def createAddonBundleFromPath(
+		path: str | Path,
+		dest: str,
+		excludePatterns: Iterable[str],
+		jobs: int | None = None,
+		extraFiles: Iterable[tuple[str, Path]] = (),
+	):
+	"""
+	Creates a bundle from a directory that contains an addon manifest file.
+
+	Entries are written in path order with fixed timestamps, so unchanged
+	inputs give a byte-identical bundle. Files whose content hash matches the
+	previous build's bundle reuse its compressed bytes; the rest are read and
+	compressed on jobs threads. extraFiles are (path in bundle, file) pairs
+	added from elsewhere, such as compiled bytecode.
+	"""
 	if isinstance(path, str):
 		path = Path(path)
 	basedir = path.absolute()
-	with zipfile.ZipFile(dest, "w", zipfile.ZIP_DEFLATED) as z:
-		for p in basedir.rglob("*"):
-			if p.is_dir():
+	destPath = Path(dest)
+	files = dict(collectFiles(basedir, compilePatterns(excludePatterns)))
+	files.update((pathInBundle, Path(source)) for pathInBundle, source in extraFiles)
+	files = sorted(files.items())
+	previous, previousData = _loadIndex(destPath)
+	prepare = partial(_prepareEntry, previous=previous, previousData=previousData)
+	with ThreadPoolExecutor(jobs or os.cpu_count() or 1) as pool:
+		entries = list(pool.map(prepare, [name for name, _ in files], [source for _, source in files]))
+	# The previous bundle's bytes are not needed while the new one is written
+	del prepare, previousData
+	tempPath = destPath.with_name(destPath.name + ".tmp")
+	_writeZip(tempPath, entries)
+	os.replace(tempPath, destPath)
+	index = {
+		"level": COMPRESS_LEVEL,
+		"sha256": _sha256(destPath.read_bytes()),
+		"entries": {
+			e["name"]: {key: e[key] for key in ("sha256", "size", "crc", "compress_type", "offset", "compressed_size")}
+			for e in entries
+		},
+	}
+	Path(str(destPath) + INDEX_SUFFIX).write_text(json.dumps(index), encoding="utf-8")
+	return dest
+
+
+def _sha256(data: bytes) -> str:
+	return hashlib.sha256(data).hexdigest()
+
+
+def createBundleManifest(bundle: str | Path, dest: str | Path):
+	"""
+	Writes a JSON manifest of the files in a bundle, published next to it.
+
+	Each file is listed with its size and SHA-256, and with the position and
+	length of its compressed data inside the bundle, so an updater holding an
+	older version can fetch just the files that changed with Range requests.
+	"""
+	bundle = Path(bundle)
+	data = bundle.read_bytes()
+	files = []
+	with zipfile.ZipFile(bundle) as z:
+		for info in z.infolist():
+			if info.is_dir():
 				continue
-			pathInBundle = p.relative_to(basedir)
-			if matchesNoPatterns(pathInBundle, excludePatterns):
-				z.write(p, pathInBundle)
+			header = _LOCAL_HEADER.unpack_from(data, info.header_offset)
+			nameLength, extraLength = header[-2], header[-1]
+			files.append({
+				"path": info.filename,
+				"size": info.file_size,
+				"sha256": _sha256(z.read(info)),
+				"compress_type": info.compress_type,
+				"offset": info.header_offset + _LOCAL_HEADER.size + nameLength + extraLength,
+				"compressed_size": info.compress_size,
+			})
+	manifest = {
+		"format": BUNDLE_MANIFEST_FORMAT,
+		"bundle": {"name": bundle.name, "size": len(data), "sha256": _sha256(data)},
+		"files": files,
+	}
+	Path(dest).write_text(json.dumps(manifest, indent=1), encoding="utf-8")
 	return dest
+
+
+def reportBundleSizes(bundles: Iterable[str | Path], dest: str | Path) -> str:
+	"""
+	Writes a table comparing the download size, installed size and file count
+	of bundles to dest, and returns it. The first bundle is the reference the
+	others are compared with.
+	"""
+	rows = []
+	for bundle in bundles:
+		bundle = Path(bundle)
+		with zipfile.ZipFile(bundle) as z:
+			infos = [info for info in z.infolist() if not info.is_dir()]
+		rows.append((bundle.name, bundle.stat().st_size, sum(info.file_size for info in infos), len(infos)))
+	reference = rows[0][1] if rows else 0
+	nameWidth = max([len("Bundle")] + [len(row[0]) for row in rows])
+	lines = [
+		f"{'Bundle':<{nameWidth}}  {'Download':>10}  {'Installed':>10}  {'Files':>5}  {'Size':>6}",
+	]
+	for name, size, installed, count in rows:
+		share = f"{size * 100 / reference:.0f}%" if reference else "-"
+		lines.append(f"{name:<{nameWidth}}  {size:>10}  {installed:>10}  {count:>5}  {share:>6}")
+	report = "\n".join(lines) + "\n"
+	Path(dest).write_text(report, encoding="utf-8")
+	return report
+
@@ -0,0 +1,57 @@
+import json
+import shlex
+import shutil
+import subprocess
+from collections.abc import Iterable
+from pathlib import Path
+
+
+WORKER = Path(__file__).with_name("bytecodeWorker.py")
+
+
+class BytecodeError(Exception):
+	"""An interpreter failed to compile or verify the bundle's bytecode."""
+
+
+def compileBytecode(
+		sources: Iterable[tuple[str, Path]],
+		stagingDir: str | Path,
+		interpreters: Iterable[str],
+		optimizeLevels: Iterable[int] = (0,),
+	) -> list[dict]:
+	"""
+	Compiles checked hash-based .pyc files for every interpreter into stagingDir.
+
+	sources are (path in bundle, file) pairs; the .pyc files are laid out in
+	__pycache__ folders under stagingDir by path in bundle, ready to be added
+	to the bundle. Each interpreter compiles its own files, reusing those
+	whose recorded source hash is still current, and checks every file
+	against its source afterwards. Interpreters that are not installed are
+	skipped. Returns one result per interpreter that ran, whose "files" lists
+	the .pyc paths in the bundle.
+	"""
+	stagingDir = Path(stagingDir)
+	stagingDir.mkdir(parents=True, exist_ok=True)
+	job = {
+		"files": [[str(source), pathInBundle] for pathInBundle, source in sources if pathInBundle.endswith(".py")],
+		"staging": str(stagingDir),
+		"optimize": list(optimizeLevels),
+	}
+	results = []
+	for interpreter in interpreters:
+		command = shlex.split(interpreter)
+		# Launchers such as pyenv shims exist even when their interpreter cannot run
+		if not shutil.which(command[0]) or subprocess.run(command + ["-c", ""], capture_output=True).returncode:
+			print(f"Skipping bytecode for {interpreter}: not installed")
+			continue
+		completed = subprocess.run(
+			command + [str(WORKER)], input=json.dumps(job), capture_output=True, text=True
+		)
+		if completed.returncode != 0:
+			raise BytecodeError(f"{interpreter} failed to compile bytecode:\n{completed.stderr}")
+		result = json.loads(completed.stdout)
+		if result["errors"]:
+			raise BytecodeError(f"{interpreter} produced bad bytecode:\n" + "\n".join(result["errors"]))
+		result["interpreter"] = interpreter
+		results.append(result)
+	return results
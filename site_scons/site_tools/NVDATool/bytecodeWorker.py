@@ -0,0 +1,89 @@
+"""
+Compiles and verifies bytecode for the interpreter running this script.
+
+Run by bytecode.compileBytecode with each configured interpreter, so it must
+stay compatible with the oldest Python NVDA has shipped (3.7). Reads a JSON
+job from stdin and writes a JSON result to stdout.
+"""
+
+import importlib.util
+import json
+import marshal
+import os
+import py_compile
+import sys
+
+# Flags of a checked hash-based pyc (PEP 552)
+CHECKED_HASH_FLAGS = 0b11
+
+
+def cachePath(stagingDir, pathInBundle, optimize):
+	return os.path.join(
+		stagingDir,
+		importlib.util.cache_from_source(pathInBundle, optimization=optimize or ""),
+	)
+
+
+def isCurrent(pycPath, source):
+	"""Whether pycPath is a checked hash-based pyc of this interpreter for source."""
+	try:
+		with open(pycPath, "rb") as f:
+			header = f.read(16)
+	except OSError:
+		return False
+	return (
+		len(header) == 16
+		and header[:4] == importlib.util.MAGIC_NUMBER
+		and int.from_bytes(header[4:8], "little") == CHECKED_HASH_FLAGS
+		and header[8:16] == importlib.util.source_hash(source)
+	)
+
+
+def verify(pycPath, source):
+	"""Error message if pycPath does not hold valid bytecode for source, else None."""
+	if not isCurrent(pycPath, source):
+		return "header does not match the source"
+	try:
+		with open(pycPath, "rb") as f:
+			code = marshal.loads(f.read()[16:])
+	except Exception as e:
+		return "unreadable bytecode: {}".format(e)
+	if type(code).__name__ != "code":
+		return "not a code object"
+	return None
+
+
+def main():
+	job = json.load(sys.stdin)
+	result = {"tag": sys.implementation.cache_tag, "compiled": 0, "reused": 0, "files": [], "errors": []}
+	for sourcePath, pathInBundle in job["files"]:
+		with open(sourcePath, "rb") as f:
+			source = f.read()
+		for optimize in job["optimize"]:
+			pycPath = cachePath(job["staging"], pathInBundle, optimize)
+			if isCurrent(pycPath, source):
+				result["reused"] += 1
+			else:
+				try:
+					py_compile.compile(
+						sourcePath,
+						cfile=pycPath,
+						dfile=pathInBundle,
+						doraise=True,
+						optimize=optimize,
+						invalidation_mode=py_compile.PycInvalidationMode.CHECKED_HASH,
+					)
+				except py_compile.PyCompileError as e:
+					result["errors"].append("{}: {}".format(pathInBundle, e.msg.strip()))
+					continue
+				result["compiled"] += 1
+			error = verify(pycPath, source)
+			if error:
+				result["errors"].append("{}: {}".format(pathInBundle, error))
+			else:
+				result["files"].append(os.path.relpath(pycPath, job["staging"]).replace(os.sep, "/"))
+	json.dump(result, sys.stdout)
+
+
+if __name__ == "__main__":
+	main()
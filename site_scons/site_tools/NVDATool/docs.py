@@ -1,10 +1,10 @@
 
-import gettext
 from pathlib import Path
 
 import markdown
 
 from .typings import AddonInfo
+from .utils import translationsFor
 
 
 
@@ -24,8 +24,7 @@ def md2html(
 		moFile = Path(moFile)
 
 	try:
-		with moFile.open("rb") as f:
-			_ = gettext.GNUTranslations(f).gettext
+		_ = translationsFor(moFile)
 	except Exception:
 		summary = addon_info["addon_summary"]
 	else:
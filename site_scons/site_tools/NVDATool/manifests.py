@@ -1,10 +1,9 @@
 
 import codecs
-import gettext
 from functools import partial
 
 from .typings import AddonInfo, BrailleTables, SymbolDictionaries
-from .utils import format_nested_section
+from .utils import format_nested_section, readTemplate, translationsFor
 
 
 
@@ -16,8 +15,7 @@ def generateManifest(
 		symbolDictionaries: SymbolDictionaries,
 	):
 	# Prepare the root manifest section
-	with codecs.open(source, "r", "utf-8") as f:
-		manifest_template = f.read()
+	manifest_template = readTemplate(source)
 	manifest = manifest_template.format(**addon_info)
 	# Add additional manifest sections such as custom braile tables
 	# Custom braille translation tables
@@ -41,13 +39,11 @@ def generateTranslatedManifest(
 		brailleTables: BrailleTables,
 		symbolDictionaries: SymbolDictionaries,
 	):
-	with open(mo, "rb") as f:
-		_ = gettext.GNUTranslations(f).gettext
+	_ = translationsFor(mo)
 	vars: dict[str, str] = {}
 	for var in ("addon_summary", "addon_description", "addon_changelog"):
 		vars[var] = _(addon_info[var])
-	with codecs.open(source, "r", "utf-8") as f:
-		manifest_template = f.read()
+	manifest_template = readTemplate(source)
 	manifest = manifest_template.format(**vars)
 
 	_format_section_only_with_displayName = partial(
@@ -1,4 +1,7 @@
+import gettext
+import os
 from collections.abc import Callable, Container, Mapping
+from functools import lru_cache
 
 from .typings import Strable
 
@@ -26,3 +29,31 @@ def format_nested_section(
 				continue
 			lines.append(f"{key} = {_(str(val))}")
 	return "\n".join(lines) + "\n"
+
+
+@lru_cache(maxsize=64)
+def _loadTranslations(path: str, size: int, mtime: int) -> Callable[[str], str]:
+	with open(path, "rb") as f:
+		return gettext.GNUTranslations(f).gettext
+
+
+def translationsFor(moFile: str | os.PathLike) -> Callable[[str], str]:
+	"""
+	The gettext function of a .mo file, loaded once per process for as long as
+	the file is unchanged, as a locale's docs and manifest both use it.
+	"""
+	stat = os.stat(moFile)
+	return _loadTranslations(os.fspath(moFile), stat.st_size, stat.st_mtime_ns)
+
+
+@lru_cache(maxsize=16)
+def _readTemplate(path: str, size: int, mtime: int) -> str:
+	# Line endings are kept as they are, as codecs.open kept them
+	with open(path, "r", encoding="utf-8", newline="") as f:
+		return f.read()
+
+
+def readTemplate(path: str | os.PathLike) -> str:
+	"""The text of a manifest template, read once per process for as long as it is unchanged."""
+	stat = os.stat(path)
+	return _readTemplate(os.fspath(path), stat.st_size, stat.st_mtime_ns)
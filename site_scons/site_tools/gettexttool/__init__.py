@@ -3,10 +3,14 @@ and pot files for merging.
 
 Three new builders are added into the constructed environment:
 
-- gettextMoFile: generates .mo file from .pot file using msgfmt.
+- gettextMoFile: generates .mo file from .po file, byte for byte as msgfmt does.
 - gettextPotFile: Generates .pot file from source code files.
 - gettextMergePotFile: Creates a .pot file appropriate for merging into existing .po files.
 
+Both are done in Python (see msgfmt.py and xgettext.py), so neither msgfmt nor xgettext is needed.
+Outputs are built in a process pool, so with parallel jobs independent locales compile in parallel,
+and are cached by the hash of their inputs (see site_scons/buildCache.py).
+
 To properly configure get text, define the following variables:
 
 - gettext_package_bugs_address
@@ -16,20 +20,54 @@ To properly configure get text, define the following variables:
 
 """
 
+from buildCache import buildCached
 from SCons.Action import Action
 
+from . import msgfmt, xgettext
+from .msgfmt import compilePoFile
+from .xgettext import extractPot
+
 
 def exists(env):
 	return True
 
 
-XGETTEXT_COMMON_ARGS = (
-	"--msgid-bugs-address='$gettext_package_bugs_address' "
-	"--package-name='$gettext_package_name' "
-	"--package-version='$gettext_package_version' "
-	"--keyword=pgettext:1c,2 "
-	"-c -o $TARGET $SOURCES"
-)
+# Modules whose code builds the outputs, so that changing them invalidates the cache
+COMPILERS = (msgfmt.__file__, xgettext.__file__)
+POT_VARIABLES = ["gettext_package_bugs_address", "gettext_package_name", "gettext_package_version"]
+
+
+def buildMoFile(target, source, env):
+	buildCached(
+		"gettextMoFile",
+		compilePoFile,
+		target[0].abspath,
+		[source[0].abspath, *COMPILERS],
+		None,
+		source=source[0].abspath,
+	)
+
+
+def buildPotFile(target, source, env, forMerging=False):
+	sources = [s.path for s in source]
+	options = {
+		"packageName": env.subst("$gettext_package_name"),
+		"packageVersion": env.subst("$gettext_package_version"),
+		"bugsAddress": env.subst("$gettext_package_bugs_address"),
+		# Merge templates have neither the header nor the locations, as xgettext --omit-header --no-location
+		"omitHeader": forMerging,
+		"withLocations": not forMerging,
+	}
+	buildCached(
+		"gettextMergePotFile" if forMerging else "gettextPotFile",
+		extractPot,
+		target[0].abspath,
+		[s.abspath for s in source] + list(COMPILERS),
+		# Locations name the sources by path
+		[sources, options],
+		sources=sources,
+		**options,
+	)
 
 
 def generate(env):
@@ -38,18 +76,20 @@ def generate(env):
 	env.SetDefault(gettext_package_version="")
 
 	env["BUILDERS"]["gettextMoFile"] = env.Builder(
-		action=Action("msgfmt -o $TARGET $SOURCE", "Compiling translation $SOURCE"),
+		action=Action(buildMoFile, "Compiling translation $SOURCE"),
 		suffix=".mo",
 		src_suffix=".po",
 	)
 
 	env["BUILDERS"]["gettextPotFile"] = env.Builder(
-		action=Action("xgettext " + XGETTEXT_COMMON_ARGS, "Generating pot file $TARGET"), suffix=".pot"
+		action=Action(buildPotFile, "Generating pot file $TARGET", varlist=POT_VARIABLES), suffix=".pot"
 	)
 
 	env["BUILDERS"]["gettextMergePotFile"] = env.Builder(
 		action=Action(
-			"xgettext " + "--omit-header --no-location " + XGETTEXT_COMMON_ARGS, "Generating pot file $TARGET"
+			lambda target, source, env: buildPotFile(target, source, env, forMerging=True),
+			"Generating pot file $TARGET",
+			varlist=POT_VARIABLES,
 		),
 		suffix=".pot",
 	)
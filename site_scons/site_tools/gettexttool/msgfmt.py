@@ -0,0 +1,254 @@
+"""
+Compiles .po catalogs to .mo files the way GNU msgfmt does.
+
+The output is byte for byte what msgfmt writes with its default options:
+untranslated and fuzzy messages (other than the header) are left out, and
+the strings are laid out after msgfmt's hash table, with no padding. C
+format strings with <inttypes.h> macros, which msgfmt writes as system
+dependent strings, are refused.
+"""
+
+import re
+import struct
+from dataclasses import dataclass, field
+
+
+MO_MAGIC = 0x950412DE
+# Header fields of a revision 0 file, without system dependent strings
+MO_HEADER = struct.Struct("<7I")
+# Separates a message's context from its msgid
+CONTEXT_SEPARATOR = "\x04"
+
+
+class PoError(Exception):
+	"""A .po file cannot be compiled."""
+
+
+@dataclass
+class Message:
+	msgid: str = ""
+	msgctxt: str | None = None
+	msgidPlural: str | None = None
+	msgstr: list[str] = field(default_factory=list)
+	flags: set[str] = field(default_factory=set)
+	obsolete: bool = False
+	line: int = 0
+
+	@property
+	def key(self) -> str:
+		"""The msgid as looked up in the .mo, prefixed by the context if there is one."""
+		return self.msgid if self.msgctxt is None else self.msgctxt + CONTEXT_SEPARATOR + self.msgid
+
+
+_ESCAPES = {"n": "\n", "t": "\t", "b": "\b", "r": "\r", "f": "\f", "v": "\v", "a": "\a", "\\": "\\", '"': '"', "?": "?"}
+_ESCAPE = re.compile(r"\\(x[0-9a-fA-F]+|[0-7]{1,3}|.)")
+_KEYWORD = re.compile(r"(msgctxt|msgid_plural|msgid|msgstr(?:\[(\d+)\])?)\s+(\".*)$")
+
+
+def _unquote(text: str, path: str, line: int) -> str:
+	text = text.strip()
+	if len(text) < 2 or not text.startswith('"') or not text.endswith('"'):
+		raise PoError(f"{path}:{line}: expected a quoted string")
+
+	def replace(match: re.Match[str]) -> str:
+		escape = match.group(1)
+		if escape[0] == "x":
+			return chr(int(escape[1:], 16))
+		if escape[0].isdigit():
+			return chr(int(escape, 8))
+		if escape not in _ESCAPES:
+			raise PoError(f"{path}:{line}: invalid escape sequence \\{escape}")
+		return _ESCAPES[escape]
+
+	return _ESCAPE.sub(replace, text[1:-1])
+
+
+def charsetOf(data: bytes) -> str:
+	"""The charset named in a catalog's header, UTF-8 if there is none."""
+	match = re.search(rb"charset=([\w.:-]+)", data)
+	if match is None or match.group(1) == b"CHARSET":
+		return "utf-8"
+	return match.group(1).decode("ascii")
+
+
+def parsePo(data: bytes, path: str = "<po>") -> tuple[list[Message], str]:
+	"""The messages of a .po file, obsolete ones included, and its charset."""
+	charset = charsetOf(data)
+	try:
+		text = data.decode(charset)
+	except (LookupError, UnicodeDecodeError) as e:
+		raise PoError(f"{path}: cannot be read as {charset}: {e}") from None
+	messages: list[Message] = []
+	current = Message()
+	# The field continuation lines are appended to: a name and, for msgstr[n], an index
+	target: tuple[str, int] | None = None
+
+	def finish():
+		nonlocal current, target
+		if target is not None:
+			messages.append(current)
+		current = Message()
+		target = None
+
+	for number, raw in enumerate(text.splitlines(), 1):
+		line = raw.strip()
+		if line.startswith("#~"):
+			if target is not None and not current.obsolete:
+				finish()
+			current.obsolete = True
+			line = line[2:].strip()
+			if not line or line.startswith("#"):
+				continue
+		elif line.startswith("#"):
+			if target is not None and current.msgstr:
+				finish()
+			if line.startswith("#,"):
+				current.flags.update(flag.strip() for flag in line[2:].split(",") if flag.strip())
+			continue
+		if not line:
+			if target is not None and current.msgstr:
+				finish()
+			continue
+		if line.startswith('"'):
+			if target is None:
+				raise PoError(f"{path}:{number}: string outside of a message")
+			value = _unquote(line, path, number)
+			name, index = target
+			if name == "msgstr":
+				current.msgstr[index] += value
+			else:
+				setattr(current, name, getattr(current, name) + value)
+			continue
+		match = _KEYWORD.match(line)
+		if match is None:
+			raise PoError(f"{path}:{number}: syntax error")
+		keyword, index, quoted = match.groups()
+		value = _unquote(quoted, path, number)
+		if keyword in ("msgctxt", "msgid") and current.msgstr:
+			obsolete = current.obsolete
+			finish()
+			current.obsolete = obsolete
+		if keyword == "msgctxt":
+			current.msgctxt = value
+			current.line = current.line or number
+			target = ("msgctxt", 0)
+		elif keyword == "msgid":
+			current.msgid = value
+			current.line = current.line or number
+			target = ("msgid", 0)
+		elif keyword == "msgid_plural":
+			current.msgidPlural = value
+			target = ("msgidPlural", 0)
+		else:
+			position = int(index) if index is not None else 0
+			if position != len(current.msgstr):
+				raise PoError(f"{path}:{number}: msgstr[{position}] out of order")
+			current.msgstr.append(value)
+			target = ("msgstr", position)
+	if target is not None:
+		messages.append(current)
+	return messages, charset
+
+
+def hashString(key: bytes) -> int:
+	"""The hashpjw variant .mo hash tables are built with, truncated to 32 bits as msgfmt stores it."""
+	value = 0
+	for byte in key:
+		value = ((value << 4) + byte) & 0xFFFFFFFF
+		high = value & 0xF0000000
+		if high:
+			value ^= high >> 24
+			value ^= high
+	return value
+
+
+def _isPrime(candidate: int) -> bool:
+	"""msgfmt's primality test, which is only meant for odd numbers from 5 on (it takes 1 for a prime and 3 for none)."""
+	divisor = 3
+	square = divisor * divisor
+	while square < candidate and candidate % divisor != 0:
+		divisor += 1
+		square += 4 * divisor
+		divisor += 1
+	return candidate % divisor != 0
+
+
+def hashTableSize(count: int) -> int:
+	"""The size msgfmt gives the hash table of count messages."""
+	size = (count * 4) // 3 | 1
+	while not _isPrime(size):
+		size += 2
+	return size if size > 2 else 3
+
+
+def writeMo(entries: list[tuple[bytes, bytes]]) -> bytes:
+	"""
+	A .mo file of (key, translation) pairs, encoded: keys are msgids, or
+	context, \\x04 and msgid, with plural msgids after a NUL; translations
+	of plural messages are their forms separated by NUL.
+	"""
+	# msgfmt sorts with strcmp, which stops at the NUL before a plural msgid
+	entries = sorted(entries, key=lambda entry: entry[0].split(b"\0", 1)[0])
+	count = len(entries)
+	size = hashTableSize(count)
+	originalsOffset = MO_HEADER.size
+	translationsOffset = originalsOffset + 8 * count
+	hashOffset = translationsOffset + 8 * count
+	offset = hashOffset + 4 * size
+
+	table = [0] * size
+	for number, (key, _) in enumerate(entries, 1):
+		value = hashString(key.split(b"\0", 1)[0])
+		index = value % size
+		if table[index]:
+			increment = 1 + value % (size - 2)
+			while table[index]:
+				index = index - (size - increment) if index >= size - increment else index + increment
+		table[index] = number
+
+	descriptors = []
+	for column in (0, 1):
+		for entry in entries:
+			descriptors.append((len(entry[column]), offset))
+			offset += len(entry[column]) + 1
+	parts = [MO_HEADER.pack(MO_MAGIC, 0, count, originalsOffset, translationsOffset, size, hashOffset)]
+	parts.append(b"".join(struct.pack("<2I", *descriptor) for descriptor in descriptors))
+	parts.append(struct.pack(f"<{size}I", *table))
+	for column in (0, 1):
+		parts.extend(entry[column] + b"\0" for entry in entries)
+	return b"".join(parts)
+
+
+def compileMessages(messages: list[Message], charset: str, path: str = "<po>") -> bytes:
+	"""The .mo msgfmt writes for messages, which must not define a message twice."""
+	entries: list[tuple[bytes, bytes]] = []
+	seen: dict[str, int] = {}
+	for message in messages:
+		if message.obsolete:
+			continue
+		if message.key in seen:
+			raise PoError(f"{path}:{message.line}: duplicate message definition (first at line {seen[message.key]})")
+		seen[message.key] = message.line
+		translation = "\0".join(message.msgstr)
+		isHeader = message.msgid == "" and message.msgctxt is None
+		if not message.msgstr or message.msgstr[0] == "" or ("fuzzy" in message.flags and not isHeader):
+			continue
+		if "c-format" in message.flags and "<PRI" in message.msgid:
+			# msgfmt writes those in a revision 1 file, with system dependent strings
+			raise PoError(f"{path}:{message.line}: <inttypes.h> format macros are not supported")
+		key = message.key if message.msgidPlural is None else message.key + "\0" + message.msgidPlural
+		entries.append((key.encode(charset), translation.encode(charset)))
+	return writeMo(entries)
+
+
+def compilePo(data: bytes, path: str = "<po>") -> bytes:
+	"""The .mo msgfmt writes for the .po file data."""
+	messages, charset = parsePo(data, path)
+	return compileMessages(messages, charset, path)
+
+
+def compilePoFile(source: str, dest: str):
+	with open(source, "rb") as f:
+		mo = compilePo(f.read(), source)
+	with open(dest, "wb") as f:
+		f.write(mo)
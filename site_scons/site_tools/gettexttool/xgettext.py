@@ -0,0 +1,273 @@
+"""
+Extracts translatable messages from Python sources into a .pot file, as
+xgettext --language=Python does.
+
+Calls of the gettext keywords whose message arguments are string literals
+are extracted, with the comment block right above them (as with xgettext -c)
+and their locations. Messages found more than once are merged.
+"""
+
+import ast
+import io
+import re
+import time
+import tokenize
+from dataclasses import dataclass, field
+
+
+# xgettext's default Python keywords: the argument positions of the msgid,
+# the plural msgid and the context, counted from 1
+KEYWORDS: dict[str, tuple[int, int | None, int | None]] = {
+	"_": (1, None, None),
+	"gettext": (1, None, None),
+	"ugettext": (1, None, None),
+	"dgettext": (2, None, None),
+	"dcgettext": (2, None, None),
+	"ngettext": (1, 2, None),
+	"ungettext": (1, 2, None),
+	"dngettext": (2, 3, None),
+	"dcngettext": (2, 3, None),
+	"pgettext": (2, None, 1),
+	"dpgettext": (3, None, 2),
+	"npgettext": (2, 3, 1),
+	"dnpgettext": (3, 4, 2),
+}
+WIDTH = 79
+
+_PERCENT_FORMAT = re.compile(r"%(\([^)]*\))?[#0 +-]*(\*|\d+)?(\.(\*|\d+))?[hlL]?[diouxXeEfFgGcrsa]")
+_BRACE_FORMAT = re.compile(r"(?<!\{)\{(\w+(\.\w+|\[[^]]*\])*)?(![rsa])?(:[^{}]*)?\}")
+
+
+@dataclass
+class PotMessage:
+	msgid: str
+	msgctxt: str | None = None
+	msgidPlural: str | None = None
+	comments: list[str] = field(default_factory=list)
+	locations: list[str] = field(default_factory=list)
+	flags: list[str] = field(default_factory=list)
+
+
+def _formatFlags(text: str) -> list[str]:
+	flags = []
+	if _PERCENT_FORMAT.search(text.replace("%%", "")):
+		flags.append("python-format")
+	if _BRACE_FORMAT.search(text.replace("{{", "").replace("}}", "")):
+		flags.append("python-brace-format")
+	return flags
+
+
+def _callArguments(tokens: list[tokenize.TokenInfo], start: int) -> list[str | None]:
+	"""
+	The arguments of the call whose opening parenthesis is tokens[start]:
+	the value of each that is only string literals, None for the others.
+	"""
+	arguments: list[str | None] = []
+	parts: list[str] = []
+	literal = True
+	depth = 0
+	for token in tokens[start:]:
+		if token.type == tokenize.OP and token.string in "([{":
+			depth += 1
+			if depth == 1:
+				continue
+		elif token.type == tokenize.OP and token.string in ")]}":
+			depth -= 1
+			if depth == 0:
+				if parts or not literal:
+					arguments.append("".join(parts) if literal and parts else None)
+				return arguments
+		if token.type in (tokenize.NL, tokenize.NEWLINE, tokenize.COMMENT):
+			continue
+		if depth == 1 and token.type == tokenize.OP and token.string == ",":
+			arguments.append("".join(parts) if literal and parts else None)
+			parts, literal = [], True
+		elif depth == 1 and token.type == tokenize.STRING and literal:
+			try:
+				value = ast.literal_eval(token.string)
+			except (ValueError, SyntaxError):
+				# f-strings, which tokenize reports as strings before Python 3.12
+				value = None
+			if isinstance(value, str):
+				parts.append(value)
+			else:
+				literal = False
+		else:
+			literal = False
+	return arguments
+
+
+def extractMessages(source: str, path: str) -> list[PotMessage]:
+	"""The messages of one Python source, in order of appearance."""
+	tokens = [
+		token for token in tokenize.generate_tokens(io.StringIO(source).readline)
+		if token.type not in (tokenize.INDENT, tokenize.DEDENT)
+	]
+	# Comment lines by line number, to find the block above a call
+	comments: dict[int, str] = {}
+	for token in tokens:
+		if token.type == tokenize.COMMENT:
+			comments[token.start[0]] = token.string[1:].strip()
+	messages = []
+	for index, token in enumerate(tokens[:-1]):
+		spec = KEYWORDS.get(token.string) if token.type == tokenize.NAME else None
+		following = tokens[index + 1]
+		if spec is None or following.type != tokenize.OP or following.string != "(":
+			continue
+		if index and tokens[index - 1].type == tokenize.NAME and tokens[index - 1].string in ("def", "class"):
+			continue
+		arguments = _callArguments(tokens, index + 1)
+		msgidPosition, pluralPosition, contextPosition = spec
+		needed = [position for position in spec if position is not None]
+		if len(arguments) < max(needed) or any(arguments[position - 1] is None for position in needed):
+			continue
+		line = token.start[0]
+		block: list[str] = []
+		above = line - 1 if line not in comments else line
+		while above in comments:
+			block.insert(0, comments[above])
+			above -= 1
+		msgid = arguments[msgidPosition - 1]
+		plural = arguments[pluralPosition - 1] if pluralPosition else None
+		messages.append(PotMessage(
+			msgid=msgid,
+			msgctxt=arguments[contextPosition - 1] if contextPosition else None,
+			msgidPlural=plural,
+			comments=block,
+			locations=[f"{path}:{line}"],
+			flags=_formatFlags(msgid + (plural or "")),
+		))
+	return messages
+
+
+def mergeMessages(messages: list[PotMessage]) -> list[PotMessage]:
+	"""One message per msgid and context, with the comments and locations of all of them."""
+	merged: dict[tuple[str | None, str], PotMessage] = {}
+	for message in messages:
+		key = (message.msgctxt, message.msgid)
+		existing = merged.get(key)
+		if existing is None:
+			merged[key] = message
+			continue
+		existing.msgidPlural = existing.msgidPlural or message.msgidPlural
+		existing.comments.extend(comment for comment in message.comments if comment not in existing.comments)
+		existing.locations.extend(message.locations)
+		existing.flags.extend(flag for flag in message.flags if flag not in existing.flags)
+	return list(merged.values())
+
+
+def _escape(text: str) -> str:
+	return (
+		text.replace("\\", "\\\\").replace('"', '\\"').replace("\t", "\\t").replace("\r", "\\r").replace("\n", "\\n")
+	)
+
+
+def _formatString(keyword: str, text: str) -> list[str]:
+	"""keyword and text as .po lines, wrapped after newlines and at spaces as xgettext does."""
+	escaped = _escape(text)
+	single = f'{keyword} "{escaped}"'
+	if len(single) <= WIDTH and "\\n" not in escaped[:-2]:
+		return [single]
+	lines = [f'{keyword} ""']
+	for chunk in re.findall(r".*?\\n|.+$", escaped):
+		while len(chunk) + 2 > WIDTH:
+			cut = chunk.rfind(" ", 0, WIDTH - 2)
+			if cut <= 0:
+				break
+			lines.append(f'"{chunk[:cut + 1]}"')
+			chunk = chunk[cut + 1:]
+		lines.append(f'"{chunk}"')
+	return lines
+
+
+def _wrapLocations(locations: list[str]) -> list[str]:
+	lines: list[str] = []
+	for location in locations:
+		if lines and len(lines[-1]) + 1 + len(location) <= WIDTH:
+			lines[-1] += " " + location
+		else:
+			lines.append("#: " + location)
+	return lines
+
+
+def formatPot(
+		messages: list[PotMessage],
+		*,
+		packageName: str,
+		packageVersion: str,
+		bugsAddress: str,
+		omitHeader: bool = False,
+		withLocations: bool = True,
+	) -> str:
+	"""The .pot file of messages, with xgettext's header unless omitHeader."""
+	entries = []
+	if not omitHeader:
+		nonAscii = any(not (m.msgid + (m.msgidPlural or "") + (m.msgctxt or "")).isascii() for m in messages)
+		header = [
+			f"Project-Id-Version: {packageName} {packageVersion}".rstrip(),
+			f"Report-Msgid-Bugs-To: {bugsAddress}",
+			"POT-Creation-Date: " + time.strftime("%Y-%m-%d %H:%M%z"),
+			"PO-Revision-Date: YEAR-MO-DA HO:MI+ZONE",
+			"Last-Translator: FULL NAME <EMAIL@ADDRESS>",
+			"Language-Team: LANGUAGE <LL@li.org>",
+			"Language: ",
+			"MIME-Version: 1.0",
+			"Content-Type: text/plain; charset=" + ("UTF-8" if nonAscii else "CHARSET"),
+			"Content-Transfer-Encoding: 8bit",
+		]
+		if any(message.msgidPlural for message in messages):
+			header.append("Plural-Forms: nplurals=INTEGER; plural=EXPRESSION;")
+		entries.append("\n".join([
+			"# SOME DESCRIPTIVE TITLE.",
+			"# Copyright (C) YEAR THE PACKAGE'S COPYRIGHT HOLDER",
+			f"# This file is distributed under the same license as the {packageName or 'PACKAGE'} package.",
+			"# FIRST AUTHOR <EMAIL@ADDRESS>, YEAR.",
+			"#",
+			"#, fuzzy",
+			'msgid ""',
+			'msgstr ""',
+			*(f'"{_escape(field)}\\n"' for field in header),
+		]))
+	for message in messages:
+		lines = [f"#. {comment}".rstrip() for comment in message.comments]
+		if withLocations:
+			lines.extend(_wrapLocations(message.locations))
+		if message.flags:
+			lines.append("#, " + ", ".join(message.flags))
+		if message.msgctxt is not None:
+			lines.extend(_formatString("msgctxt", message.msgctxt))
+		lines.extend(_formatString("msgid", message.msgid))
+		if message.msgidPlural is None:
+			lines.append('msgstr ""')
+		else:
+			lines.extend(_formatString("msgid_plural", message.msgidPlural))
+			lines.extend(['msgstr[0] ""', 'msgstr[1] ""'])
+		entries.append("\n".join(lines))
+	return "\n\n".join(entries) + "\n"
+
+
+def extractPot(
+		sources: list[str],
+		dest: str,
+		*,
+		packageName: str = "",
+		packageVersion: str = "",
+		bugsAddress: str = "",
+		omitHeader: bool = False,
+		withLocations: bool = True,
+	):
+	"""Writes the .pot file of the messages in sources, in the order given; sources listed twice are read once."""
+	messages: list[PotMessage] = []
+	for source in dict.fromkeys(sources):
+		with open(source, "r", encoding="utf-8") as f:
+			messages.extend(extractMessages(f.read(), source))
+	pot = formatPot(
+		mergeMessages(messages),
+		packageName=packageName,
+		packageVersion=packageVersion,
+		bugsAddress=bugsAddress,
+		omitHeader=omitHeader,
+		withLocations=withLocations,
+	)
+	with open(dest, "w", encoding="utf-8", newline="\n") as f:
+		f.write(pot)
@@ -0,0 +1,87 @@
+"""
+Shared pytest setup.
+
+The add-on is imported against the stub NVDA environment from
+benchmarks/nvdaStubs.py, and audio sessions come from the in-memory fake
+backend, so the tests run on any platform without NVDA or Windows.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+import nvdaStubs  # noqa: E402
+import releaseServer  # noqa: E402
+
+nvdaStubs.install()
+
+import globalPlugins.audioVolumeControl as plugin_package  # noqa: E402
+from globalPlugins.audioVolumeControl import foregroundTracker, volumeRamp  # noqa: E402
+from globalPlugins.audioVolumeControl.audioSessionManager import AudioSessionManager  # noqa: E402
+from globalPlugins.audioVolumeControl.fakeBackend import FakeForeground, FakeProcessTable, FakeSessionBackend  # noqa: E402
+from globalPlugins.audioVolumeControl.volumeProfiles import ProfileStore  # noqa: E402
+
+
+@pytest.fixture
+def backend(monkeypatch, tmp_path):
+	"""A fake session backend installed as the session registry's source."""
+	# Profiles saved by one test would otherwise set the volume of the next one's sessions
+	profiles = ProfileStore(str(tmp_path / "profiles.json"))
+	monkeypatch.setattr(AudioSessionManager, "_profiles", profiles)
+	fake = FakeSessionBackend()
+	AudioSessionManager.install_backend(fake)
+	yield fake
+	AudioSessionManager.shutdown()
+	profiles.stop()
+
+
+@pytest.fixture
+def plugin(backend, monkeypatch):
+	"""A GlobalPlugin without its snapshot worker, over the fake backend."""
+	# terminate() stops the fade scheduler for good, so give each plugin its own
+	monkeypatch.setattr(volumeRamp, "scheduler", volumeRamp.RampScheduler())
+	instance = plugin_package.GlobalPlugin()
+	if instance.snapshotWorker:
+		instance.snapshotWorker.stop()
+		instance.snapshotWorker = None
+	yield instance
+	instance.terminate()
+
+
+@pytest.fixture
+def processes(monkeypatch):
+	"""A fake process table installed as the source of process names."""
+	table = FakeProcessTable()
+	monkeypatch.setattr(AudioSessionManager, "_process_info", None)
+	AudioSessionManager.install_process_table(table)
+	return table
+
+
+@pytest.fixture
+def foreground(processes):
+	"""Scripted focus changes for the shared foreground tracker."""
+	return FakeForeground(foregroundTracker.tracker)
+
+
+@pytest.fixture
+def release():
+	"""A local stand-in for the GitHub releases API; yields its ReleaseState."""
+	server, state = releaseServer.start()
+	yield state
+	server.shutdown()
+	server.server_close()
+
+
+def waitFor(condition, timeout: float = 2.0) -> bool:
+	"""Poll condition until it is true or timeout seconds have passed."""
+	import time
+
+	deadline = time.monotonic() + timeout
+	while not condition():
+		if time.monotonic() > deadline:
+			return False
+		time.sleep(0.01)
+	return True
@@ -0,0 +1,57 @@
+from conftest import waitFor
+
+from globalPlugins.audioVolumeControl.audioDucking import DuckingEngine
+from globalPlugins.audioVolumeControl.audioSessionManager import AudioSessionManager, ApplicationGroup
+
+
+def _seeded(engine) -> bool:
+	"""Whether the engine knows the level to restore each session to."""
+	return bool(engine._levels)
+
+
+def _volume(session) -> float:
+	return round(session.volume_interface.GetMasterVolume() * 100.0, 1)
+
+
+def test_user_changes_while_ducked_apply_to_own_volume(backend):
+	backend.add_session("player", volume=0.8)
+	registry = AudioSessionManager.get_registry()
+	engine = DuckingEngine(AudioSessionManager.get_active_sessions, release_delay=0.05, exclude_pids=())
+	registry.add_listener(engine.on_session_change)
+	session = AudioSessionManager.get_active_sessions()[0]
+	engine.enable()
+	try:
+		assert waitFor(lambda: _seeded(engine))
+		engine.speech_started()
+		assert waitFor(lambda: _volume(session) == 24.0)
+
+		# A gesture while ducked works on the application's own volume
+		assert engine.hold()
+		assert _volume(session) == 80.0
+		assert ApplicationGroup("player", [session]).adjust_volume(5) == 85.0
+		engine.release()
+		assert waitFor(lambda: _volume(session) == 25.5)
+
+		engine.speech_stopped()
+		assert waitFor(lambda: _volume(session) == 85.0)
+	finally:
+		engine.stop()
+
+
+def test_hold_keeps_sessions_restored_while_speaking(backend):
+	backend.add_session("player", volume=1.0)
+	registry = AudioSessionManager.get_registry()
+	engine = DuckingEngine(AudioSessionManager.get_active_sessions, exclude_pids=())
+	registry.add_listener(engine.on_session_change)
+	session = AudioSessionManager.get_active_sessions()[0]
+	engine.enable()
+	try:
+		assert waitFor(lambda: _seeded(engine))
+		assert not engine.hold()
+		engine.speech_started()
+		assert not waitFor(lambda: engine.is_ducked, timeout=0.2)
+		assert _volume(session) == 100.0
+		engine.release()
+		assert waitFor(lambda: engine.is_ducked)
+	finally:
+		engine.stop()
@@ -0,0 +1,76 @@
+import json
+import os
+import random
+import zipfile
+
+from globalPlugins.audioVolumeControl import deltaUpdate, updateChecker
+
+import releaseServer
+
+PLUGIN_DIR = os.path.join("globalPlugins", "audioVolumeControl")
+
+
+def _writeSource(root, edited: bool = False) -> str:
+	"""A small add-on folder with a large binary; edited bumps the version and changes one module."""
+	pluginDir = os.path.join(root, PLUGIN_DIR)
+	os.makedirs(os.path.join(pluginDir, "lib"))
+	with open(os.path.join(root, "manifest.ini"), "w", encoding="utf-8") as f:
+		f.write(f"name = audioVolumeControl\nversion = {'2026.02.01' if edited else '2026.01.01'}\n")
+	for number in range(5):
+		with open(os.path.join(pluginDir, f"module{number}.py"), "w", encoding="utf-8") as f:
+			f.write(f"VALUE = {number}\n" * 200)
+			if edited and number == 0:
+				f.write("# Changed in the next release\n")
+	with open(os.path.join(pluginDir, "lib", "native.pyd"), "wb") as f:
+		f.write(random.Random(0).randbytes(512 * 1024))
+	return root
+
+
+def _install(tmp_path) -> str:
+	"""Extract the first release, as NVDA would have installed it."""
+	installed = str(tmp_path / "installed")
+	assets = releaseServer.build_assets(_writeSource(str(tmp_path / "old")), version="2026.01.01")
+	bundle = next(data for name, data in assets.items() if name.endswith(".nvda-addon"))
+	with open(tmp_path / "old.nvda-addon", "wb") as f:
+		f.write(bundle)
+	with zipfile.ZipFile(tmp_path / "old.nvda-addon") as z:
+		z.extractall(installed)
+	return installed
+
+
+def _readBundle(path) -> dict:
+	with zipfile.ZipFile(path) as z:
+		return {name: z.read(name) for name in z.namelist()}
+
+
+def _publish(release, tmp_path) -> dict:
+	release.publish("2026.02.01", releaseServer.build_assets(_writeSource(str(tmp_path / "new"), edited=True)))
+	return updateChecker.parse_release(json.loads(release.document()))
+
+
+def test_delta_update_fetches_only_changed_files(release, tmp_path):
+	installed = _install(tmp_path)
+	info = _publish(release, tmp_path)
+
+	path = deltaUpdate.fetch_update(info, dest_dir=str(tmp_path / "delta"), installed_dir=installed)
+
+	assert path is not None
+	published = tmp_path / "published.nvda-addon"
+	published.write_bytes(release.assets[info["asset_name"]])
+	assert _readBundle(path) == _readBundle(published)
+	stats = deltaUpdate.last_update
+	assert stats["mode"] == "delta"
+	assert stats["files_fetched"] == 2
+	assert stats["transferred"] < info["asset_size"] / 10
+	assert release.bytes_sent < info["asset_size"] / 10
+
+
+def test_update_without_installed_files_downloads_the_bundle(release, tmp_path):
+	info = _publish(release, tmp_path)
+
+	path = deltaUpdate.fetch_update(info, dest_dir=str(tmp_path / "full"), installed_dir=str(tmp_path / "missing"))
+
+	assert path is not None
+	assert deltaUpdate.last_update["mode"] == "full"
+	with open(path, "rb") as f:
+		assert f.read() == release.assets[info["asset_name"]]
@@ -0,0 +1,51 @@
+import statistics
+import time
+
+from globalPlugins.audioVolumeControl.audioSessionManager import AudioSessionManager
+
+import nvdaStubs
+
+# Keypress to announcement, in milliseconds
+LATENCY_BOUND = 10.0
+
+
+def _pressLatencies(script, presses: int = 50) -> list:
+	latencies = []
+	for _ in range(presses):
+		nvdaStubs.spoken.clear()
+		started = time.perf_counter()
+		script(None)
+		latencies.append((time.perf_counter() - started) * 1000.0)
+		assert nvdaStubs.spoken
+	return latencies
+
+
+def test_foreground_gestures_stay_under_the_latency_bound(plugin, backend, processes, foreground):
+	# A busy mixer, with the foreground application behind many others
+	for number in range(40):
+		backend.add_session(f"app{number}", pid=100 + number, volume=0.5)
+	backend.add_session("player", pid=42, volume=0.5)
+	processes.add(42, "player")
+	AudioSessionManager.get_active_sessions()
+	foreground.focus(42)
+
+	plugin.script_lowerForegroundVolume(None)
+	raised = _pressLatencies(plugin.script_raiseForegroundVolume)
+	muted = _pressLatencies(plugin.script_toggleForegroundMute)
+
+	assert statistics.median(raised) < LATENCY_BOUND
+	assert statistics.median(muted) < LATENCY_BOUND
+	assert nvdaStubs.spoken == ["player unmuted"]
+
+
+def test_foreground_gesture_announces_the_new_level(plugin, backend, processes, foreground):
+	backend.add_session("player", pid=42, volume=0.5)
+	processes.add(42, "player")
+	foreground.focus(42)
+	nvdaStubs.spoken.clear()
+
+	plugin.script_raiseForegroundVolume(None)
+	plugin.script_lowerForegroundVolume(None)
+	plugin.script_lowerForegroundVolume(None)
+
+	assert nvdaStubs.spoken == ["player 55%", "player 50%", "player 45%"]
@@ -0,0 +1,38 @@
+import glob
+import importlib.util
+import os
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "gettext")
+
+
+def _loadMsgfmt():
+	# The gettexttool package imports SCons; msgfmt itself does not
+	path = os.path.join(REPO_ROOT, "site_scons", "site_tools", "gettexttool", "msgfmt.py")
+	spec = importlib.util.spec_from_file_location("gettexttoolMsgfmt", path)
+	module = importlib.util.module_from_spec(spec)
+	spec.loader.exec_module(module)
+	return module
+
+
+msgfmt = _loadMsgfmt()
+CATALOGS = sorted(os.path.basename(path)[:-3] for path in glob.glob(os.path.join(FIXTURES, "*.po")))
+
+
+def _read(name: str) -> bytes:
+	with open(os.path.join(FIXTURES, name), "rb") as f:
+		return f.read()
+
+
+@pytest.mark.parametrize("catalog", CATALOGS)
+def test_compilePo_matches_gnu_msgfmt(catalog):
+	assert msgfmt.compilePo(_read(catalog + ".po"), catalog + ".po") == _read(catalog + ".mo")
+
+
+def test_fixtures_cover_contexts_and_plurals():
+	sources = b"".join(_read(catalog + ".po") for catalog in CATALOGS)
+	assert len(CATALOGS) >= 4
+	assert b"\nmsgctxt " in sources
+	assert b"\nmsgid_plural " in sources
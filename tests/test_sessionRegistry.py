@@ -0,0 +1,19 @@
+from globalPlugins.audioVolumeControl.audioSessionManager import AudioSessionManager
+from globalPlugins.audioVolumeControl.sessionRegistry import SESSION_ADDED
+
+
+def test_sessions_added_to_empty_registry_are_tracked(backend):
+	registry = AudioSessionManager.get_registry()
+	events = []
+	registry.add_listener(lambda kind, session: events.append((kind, session.name)))
+	assert len(registry) == 0
+	backend.add_session("player")
+	assert [session.name for session in AudioSessionManager.get_active_sessions()] == ["player"]
+	assert events == [(SESSION_ADDED, "player")]
+
+
+def test_removed_session_leaves_registry(backend):
+	key = backend.add_session("player")
+	backend.add_session("browser")
+	backend.remove_session(key)
+	assert [session.name for session in AudioSessionManager.get_active_sessions()] == ["browser"]
@@ -0,0 +1,160 @@
+import json
+import os
+import random
+
+from globalPlugins.audioVolumeControl import updateChecker
+
+import releaseServer
+
+
+def _cache(tmp_path) -> updateChecker.ReleaseCache:
+	return updateChecker.ReleaseCache(str(tmp_path / "update.json"))
+
+
+def test_unchanged_release_is_answered_with_304(release, tmp_path, monkeypatch):
+	url = releaseServer.release_url(release)
+	cache = _cache(tmp_path)
+
+	first = updateChecker.fetch_latest_release(url, cache)
+	# A 304 reuses the cached release without parsing anything
+	monkeypatch.setattr(updateChecker, "parse_release", None)
+	second = updateChecker.fetch_latest_release(url, _cache(tmp_path))
+
+	assert first["version"] == "2026.02.01"
+	assert second == first
+	assert "If-None-Match" not in release.requests[0]["headers"]
+	assert release.requests[1]["headers"]["If-None-Match"] == release.etag()
+	assert cache.load(url)["etag"] == release.etag()
+
+
+def test_changed_release_is_fetched_again(release, tmp_path):
+	url = releaseServer.release_url(release)
+	cache = _cache(tmp_path)
+	updateChecker.fetch_latest_release(url, cache)
+
+	release.publish("2026.03.01", {"audioVolumeControl-2026.03.01.nvda-addon": b"new"})
+	latest = updateChecker.fetch_latest_release(url, cache)
+
+	assert latest["version"] == "2026.03.01"
+	assert json.loads(cache.load(url)["body"])["tag_name"] == "v2026.03.01"
+
+
+def test_retry_after_skips_requests_until_it_passes(release, tmp_path):
+	url = releaseServer.release_url(release)
+	cache = _cache(tmp_path)
+	release.rate_limit = 1
+	release.retry_after = 600
+
+	first = updateChecker.fetch_latest_release(url, cache)
+	limited = updateChecker.fetch_latest_release(url, cache)
+	skipped = updateChecker.fetch_latest_release(url, cache)
+
+	assert first == limited == skipped
+	assert len(release.requests) == 2
+	assert cache.load(url)["not_before"] >= cache.load(url)["checked_at"] + 590
+
+
+def _publishBundle(release, size: int = 250 * 1024) -> dict:
+	"""Publish a bundle of size random bytes; returns its parsed release."""
+	data = random.Random(0).randbytes(size)
+	release.publish("2026.02.01", {"audioVolumeControl-2026.02.01.nvda-addon": data})
+	return updateChecker.parse_release(json.loads(release.document()))
+
+
+def _download(info: dict, dest_dir, **kwargs):
+	return updateChecker.download_addon(
+		info["download_url"], info["asset_name"], kwargs.pop("expected_size", info["asset_size"]),
+		kwargs.pop("expected_digest", info["asset_digest"]), dest_dir=str(dest_dir), **kwargs
+	)
+
+
+def test_download_resumes_after_dropped_connections(release, tmp_path):
+	info = _publishBundle(release)
+	release.drop_after = 100 * 1024
+	stats = {}
+
+	path = _download(info, tmp_path, stats=stats)
+
+	assert path is not None
+	with open(path, "rb") as f:
+		assert f.read() == release.assets[info["asset_name"]]
+	assert release.drops == 2
+	assert [r["headers"].get("Range") for r in release.requests] == [None, "bytes=102400-", "bytes=204800-"]
+	assert stats == {"transferred": info["asset_size"], "size": info["asset_size"]}
+
+
+def test_download_continues_a_partial_file(release, tmp_path):
+	info = _publishBundle(release)
+	data = release.assets[info["asset_name"]]
+	with open(tmp_path / (info["asset_name"] + ".part"), "wb") as f:
+		f.write(data[:4096])
+
+	path = _download(info, tmp_path)
+
+	assert path is not None
+	assert release.requests[0]["headers"]["Range"] == "bytes=4096-"
+	assert release.bytes_sent == len(data) - 4096
+
+
+def test_download_with_wrong_digest_is_rejected(release, tmp_path):
+	info = _publishBundle(release)
+
+	path = _download(info, tmp_path, expected_digest="sha256:" + "0" * 64)
+
+	assert path is None
+	assert not os.listdir(tmp_path)
+
+
+def test_download_with_wrong_size_is_rejected(release, tmp_path):
+	info = _publishBundle(release)
+
+	path = _download(info, tmp_path, expected_size=info["asset_size"] - 1)
+
+	assert path is None
+	assert not os.listdir(tmp_path)
+
+
+class _ScriptedWaits(updateChecker.CancelToken):
+	"""Records the checker's waits instead of sleeping, running script(waits) before each returns."""
+
+	def __init__(self, script):
+		super().__init__()
+		self.script = script
+		self.waits = []
+
+	def wait(self, timeout: float) -> bool:
+		self.waits.append(timeout)
+		self.script(self.waits)
+		return self.cancelled
+
+
+def test_failed_checks_back_off_until_one_succeeds(release, tmp_path):
+	checker = updateChecker.UpdateChecker(
+		interval=3600, url=release.base_url + "/missing", cache=_cache(tmp_path), first_delay=3.0
+	)
+
+	def script(waits):
+		if len(waits) == 4:
+			checker.url = releaseServer.release_url(release)
+		elif len(waits) == 5:
+			checker._cancel.cancel()
+
+	checker._cancel = _ScriptedWaits(script)
+	checker._run()
+
+	first, *retries, after = checker._cancel.waits
+	assert first == 3.0
+	for delay, base in zip(retries, (60, 120, 240), strict=True):
+		assert base / 2 <= delay <= base
+	assert 3590 <= after <= 3600
+	assert checker.checks == 4
+	assert checker.failures == 0
+
+
+def test_restart_waits_for_the_persisted_check_time(release, tmp_path):
+	url = releaseServer.release_url(release)
+	updateChecker.UpdateChecker(interval=3600, url=url, cache=_cache(tmp_path))._do_check()
+
+	restarted = updateChecker.UpdateChecker(interval=3600, url=url, cache=_cache(tmp_path))
+
+	assert 3590 <= restarted.initial_delay() <= 3600
@@ -0,0 +1,94 @@
+import pytest
+
+import globalPlugins.audioVolumeControl as plugin_package
+from globalPlugins.audioVolumeControl import volumeRamp
+from globalPlugins.audioVolumeControl.audioSessionManager import AudioSession, AudioSessionManager, ApplicationGroup
+from globalPlugins.audioVolumeControl.fakeBackend import FakeAudioSession
+
+import nvdaStubs
+
+
+def _volume(session) -> float:
+	return round(session.volume_interface.GetMasterVolume() * 100.0, 1)
+
+
+def _countReads(session) -> list:
+	"""Count GetMasterVolume calls on session from now on."""
+	reads = []
+	interface = session.volume_interface
+	original = interface.GetMasterVolume
+
+	def counted():
+		reads.append(1)
+		return original()
+
+	interface.GetMasterVolume = counted
+	return reads
+
+
+def test_fade_steps_do_not_read_the_volume():
+	# Sessions without volume notifications have no cache to answer a read
+	session = AudioSession(FakeAudioSession("player-1", 10, "player", volume=0.8), 10, "player")
+	scheduler = volumeRamp.RampScheduler(tick_rate=100.0)
+	try:
+		scheduler.fade(session, 20.0, 0.2)
+		reads = _countReads(session)
+		assert scheduler.wait()
+		assert scheduler.writes > 1
+		assert not reads
+		assert _volume(session) == 20.0
+	finally:
+		scheduler.stop()
+
+
+def test_group_fade_reaches_target_on_every_session(backend, monkeypatch):
+	backend.add_session("player", pid=10, volume=1.0)
+	backend.add_session("player", pid=10, volume=0.5)
+	group = ApplicationGroup("player", AudioSessionManager.get_active_sessions())
+	scheduler = volumeRamp.RampScheduler(tick_rate=100.0)
+	monkeypatch.setattr(volumeRamp, "scheduler", scheduler)
+	try:
+		group.fade(0.0, 0.1, volumeRamp.CURVE_DB)
+		assert scheduler.wait()
+		assert [_volume(s) for s in group.sessions] == [0.0, 0.0]
+	finally:
+		scheduler.stop()
+
+
+@pytest.fixture
+def quickFades(monkeypatch):
+	monkeypatch.setattr(plugin_package, "FOREGROUND_FADE_DURATION", 0.1)
+
+
+def test_fade_gesture_fades_out_and_back_in(plugin, backend, processes, foreground, quickFades):
+	backend.add_session("player", pid=42, volume=0.6)
+	session = AudioSessionManager.get_active_sessions()[0]
+	processes.add(42, "player")
+	foreground.focus(42)
+	nvdaStubs.spoken.clear()
+
+	plugin.script_fadeForeground(None)
+	assert volumeRamp.scheduler.wait()
+	assert _volume(session) == 0.0
+
+	plugin.script_fadeForeground(None)
+	assert volumeRamp.scheduler.wait()
+	assert _volume(session) == 60.0
+	assert nvdaStubs.spoken == ["player fading out", "player fading in"]
+
+
+def test_volume_gesture_stops_a_fade(plugin, backend, processes, foreground, quickFades):
+	backend.add_session("player", pid=42, volume=0.5)
+	session = AudioSessionManager.get_active_sessions()[0]
+	processes.add(42, "player")
+	foreground.focus(42)
+
+	plugin.script_fadeForeground(None)
+	plugin.script_raiseForegroundVolume(None)
+	assert not volumeRamp.scheduler.is_fading(session)
+	assert volumeRamp.scheduler.wait()
+	raised = _volume(session)
+	plugin.script_fadeForeground(None)
+	plugin.script_fadeForeground(None)
+	assert volumeRamp.scheduler.wait()
+	assert _volume(session) == raised
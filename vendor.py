@@ -0,0 +1,469 @@
+"""
+Vendors the add-on's third-party code into the plugin's lib folder.
+
+Fetches psutil's Windows wheels for every interpreter NVDA has shipped, the
+stable ABI python3.dll helpers from Python's embeddable packages and pycaw,
+and lays them out in lib/: psutil with one extension per interpreter and a
+helper per architecture, and pycaw renamed to avc_pycaw so it cannot clash
+with a pycaw loaded by NVDA or another add-on.
+
+Fetched files are kept in a content-addressed cache and are not fetched
+again; missing ones are fetched in parallel. Only the files of lib/ whose
+content changed are written. With --offline nothing is fetched from the
+network: files come from the cache, or from the wheels and archives in the
+--from folder.
+
+Usage:
+	python vendor.py [--offline] [--from DIR] [--refresh] [--cache DIR] [--jobs 8]
+"""
+
+import argparse
+import ast
+import hashlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tokenize
+import urllib.request
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+
+REPO_ROOT = Path(__file__).resolve().parent
+LIB_DIR = REPO_ROOT / "addon" / "globalPlugins" / "audioVolumeControl" / "lib"
+CACHE_DIR = REPO_ROOT / ".vendorcache"
+INDEX_FORMAT = 1
+
+# Pinned so that every build vendors the same files; 7.1.1 is the last psutil release with win32 wheels
+PSUTIL_VERSION = "7.1.1"
+PYCAW_VERSION = "20260927"
+# (platform, Python version, ABI) of each psutil wheel; pip picks the best wheel matching each
+PSUTIL_WHEELS = (
+	[("win32", "37", "abi3"), ("win32", "37", "cp37m")]
+	+ [("win32", version, "abi3") for version in ("38", "39", "310", "311", "312")]
+	+ [("win32", "313", "cp313t")]
+	+ [("win_amd64", version, "abi3") for version in ("37", "311", "312")]
+	+ [("win_amd64", "313", "cp313t")]
+)
+# Embeddable packages the stable ABI python3.dll is taken from, per architecture
+PYTHON3_DLL_ARCHIVES = {
+	"win32": "https://www.python.org/ftp/python/3.13.1/python-3.13.1-embed-win32.zip",
+	"win_amd64": "https://www.python.org/ftp/python/3.13.1/python-3.13.1-embed-amd64.zip",
+}
+PYCAW_NAME = "avc_pycaw"
+# Folders of lib/ written by this script; anything else in lib/ is left alone
+MANAGED_DIRS = ("psutil", PYCAW_NAME)
+# Left by builds that vendored pycaw under its own name
+OBSOLETE_DIRS = ("pycaw",)
+
+
+class VendorError(Exception):
+	"""A dependency could not be fetched, verified or laid out."""
+
+
+@dataclass(frozen=True)
+class Artifact:
+	"""A file to fetch: a wheel resolved by pip download, or the file at a URL."""
+
+	pipArgs: tuple[str, ...] = ()
+	url: str | None = None
+	required: bool = True
+
+	@property
+	def key(self) -> str:
+		return self.url or "pip " + " ".join(self.pipArgs)
+
+
+def psutilArtifact(platform: str, version: str, abi: str) -> Artifact:
+	return Artifact(
+		pipArgs=(
+			f"psutil=={PSUTIL_VERSION}", "--no-deps", "--only-binary=:all:", "--implementation", "cp",
+			"--platform", platform, "--python-version", version, "--abi", abi,
+		),
+		# Not every interpreter has a wheel of its own; the others load an abi3 one
+		required=False,
+	)
+
+
+PSUTIL = [psutilArtifact(*target) for target in PSUTIL_WHEELS]
+PYTHON3_DLL = {arch: Artifact(url=url) for arch, url in PYTHON3_DLL_ARCHIVES.items()}
+PYCAW = Artifact(pipArgs=(f"pycaw=={PYCAW_VERSION}", "--no-deps", "--only-binary=:all:"))
+
+
+def sha256(data: bytes) -> str:
+	return hashlib.sha256(data).hexdigest()
+
+
+class ArtifactCache:
+	"""
+	Fetched files stored under the SHA-256 of their content, with an index
+	from each artifact's key to the name and hash of the file it resolved to.
+	"""
+
+	def __init__(self, directory: Path):
+		self.directory = directory
+		self.indexPath = directory / "index.json"
+		self._lock = threading.Lock()
+		try:
+			index = json.loads(self.indexPath.read_text(encoding="utf-8"))
+		except (OSError, ValueError):
+			index = {}
+		self.entries: dict[str, dict] = index.get("artifacts", {}) if index.get("format") == INDEX_FORMAT else {}
+
+	def _blob(self, digest: str) -> Path:
+		return self.directory / "sha256" / digest[:2] / digest
+
+	def get(self, artifact: Artifact) -> tuple[str, bytes] | None:
+		"""Name and content of the cached file for artifact, if it is cached and intact."""
+		entry = self.entries.get(artifact.key)
+		if entry is None:
+			return None
+		try:
+			data = self._blob(entry["sha256"]).read_bytes()
+		except OSError:
+			return None
+		if sha256(data) != entry["sha256"]:
+			return None
+		return entry["name"], data
+
+	def put(self, artifact: Artifact, name: str, data: bytes):
+		digest = sha256(data)
+		blob = self._blob(digest)
+		if not blob.is_file():
+			blob.parent.mkdir(parents=True, exist_ok=True)
+			part = blob.with_name(f"{digest}.{os.getpid()}.{threading.get_ident()}.part")
+			part.write_bytes(data)
+			os.replace(part, blob)
+		with self._lock:
+			self.entries[artifact.key] = {"name": name, "sha256": digest}
+
+	def save(self, keep: set[str]):
+		"""Writes the index of the artifacts in keep, deleting files no artifact resolves to any more."""
+		self.entries = {key: entry for key, entry in self.entries.items() if key in keep}
+		referenced = {entry["sha256"] for entry in self.entries.values()}
+		for blob in self.directory.glob("sha256/*/*"):
+			if blob.name not in referenced:
+				blob.unlink()
+		self.directory.mkdir(parents=True, exist_ok=True)
+		part = self.indexPath.with_suffix(".part")
+		part.write_text(
+			json.dumps({"format": INDEX_FORMAT, "artifacts": self.entries}, indent=1, sort_keys=True),
+			encoding="utf-8",
+		)
+		os.replace(part, self.indexPath)
+
+
+def fetch(artifact: Artifact, offline: bool, sourceDir: Path | None) -> tuple[str, bytes] | None:
+	"""Name and content of the file artifact resolves to, or None if there is none."""
+	if offline and sourceDir is None:
+		return None
+	if artifact.url:
+		name = PurePosixPath(artifact.url).name
+		if sourceDir is not None:
+			local = sourceDir / name
+			if local.is_file():
+				return name, local.read_bytes()
+		if offline:
+			return None
+		try:
+			with urllib.request.urlopen(artifact.url, timeout=60) as response:
+				return name, response.read()
+		except OSError as e:
+			if artifact.required:
+				raise VendorError(f"Could not fetch {artifact.url}: {e}") from None
+			return None
+	with tempfile.TemporaryDirectory(prefix="avc-vendor-") as downloadDir:
+		command = [
+			sys.executable, "-m", "pip", "download", *artifact.pipArgs,
+			"--dest", downloadDir, "--quiet", "--disable-pip-version-check",
+		]
+		if sourceDir is not None:
+			command += ["--find-links", str(sourceDir)]
+		if offline:
+			command.append("--no-index")
+		completed = subprocess.run(command, capture_output=True, text=True)
+		files = sorted(Path(downloadDir).iterdir())
+		if completed.returncode != 0 or len(files) != 1:
+			if artifact.required:
+				raise VendorError(f"pip could not fetch {artifact.key}:\n{completed.stderr.strip()}")
+			return None
+		return files[0].name, files[0].read_bytes()
+
+
+def resolveAll(
+		artifacts: list[Artifact],
+		cache: ArtifactCache,
+		offline: bool,
+		sourceDir: Path | None,
+		refresh: bool,
+		jobs: int,
+	) -> dict[Artifact, tuple[str, bytes] | None]:
+	"""Resolves every artifact from the cache, fetching the missing ones in parallel."""
+	resolved: dict[Artifact, tuple[str, bytes] | None] = {}
+	missing = []
+	for artifact in dict.fromkeys(artifacts):
+		cached = None if refresh else cache.get(artifact)
+		if cached is None:
+			missing.append(artifact)
+		else:
+			resolved[artifact] = cached
+	start = time.perf_counter()
+
+	def fetchOne(artifact: Artifact):
+		result = fetch(artifact, offline, sourceDir)
+		if result is not None:
+			cache.put(artifact, *result)
+		return result
+
+	with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+		for artifact, result in zip(missing, executor.map(fetchOne, missing)):
+			resolved[artifact] = result
+	fetched = [result for artifact, result in resolved.items() if artifact in missing and result]
+	print(
+		f"{len(resolved) - len(missing)} artifacts from the cache, {len(fetched)} fetched"
+		f" ({sum(len(data) for _, data in fetched) / 1024:.0f} KB) in {time.perf_counter() - start:.1f} s"
+	)
+	unavailable = [artifact.key for artifact in missing if resolved[artifact] is None and artifact.required]
+	if unavailable:
+		raise VendorError("Not available" + (" offline" if offline else "") + ":\n" + "\n".join(unavailable))
+	return resolved
+
+
+def isExcluded(path: PurePosixPath) -> bool:
+	return "tests" in path.parts or "__pycache__" in path.parts or path.suffix == ".pyc"
+
+
+def wheelTags(name: str) -> tuple[str, tuple, str, str]:
+	"""Project, version, Python tag and platform tag of a wheel file name."""
+	parts = name[:-len(".whl")].split("-")
+	version = tuple(int(part) if part.isdigit() else part for part in parts[1].split("."))
+	return parts[0], version, parts[-3], parts[-1]
+
+
+def layoutPsutil(wheels: list[tuple[str, bytes]], files: dict[str, bytes]):
+	"""
+	Adds psutil: the Python files once, and each wheel's extension named
+	after the interpreter and architecture it is for.
+	"""
+	if not wheels:
+		raise VendorError("No psutil wheel is available")
+	wheels = sorted(dict(wheels).items())
+	# psutil refuses to import an extension of another version
+	versions = {wheelTags(name)[1] for name, _ in wheels}
+	if len(versions) > 1:
+		raise VendorError("psutil wheels of several versions: " + ", ".join(name for name, _ in wheels))
+	for index, (name, data) in enumerate(wheels):
+		_, _, pythonTag, platformTag = wheelTags(name)
+		with zipfile.ZipFile(io.BytesIO(data)) as wheel:
+			for member in wheel.namelist():
+				path = PurePosixPath(member)
+				if path.parts[0] != "psutil" or member.endswith("/") or isExcluded(path):
+					continue
+				if path.suffix == ".pyd":
+					files[f"psutil/_psutil_windows.{pythonTag}-{platformTag}.pyd"] = wheel.read(member)
+				elif index == 0:
+					files[member] = wheel.read(member)
+
+
+def layoutPython3Dll(archives: dict[str, tuple[str, bytes]], files: dict[str, bytes]):
+	"""Adds the python3.dll of each architecture's embeddable package, in a folder named after it."""
+	for arch, (name, data) in archives.items():
+		with zipfile.ZipFile(io.BytesIO(data)) as archive:
+			try:
+				files[f"psutil/{arch}/python3.dll"] = archive.read("python3.dll")
+			except KeyError:
+				raise VendorError(f"{name} has no python3.dll") from None
+
+
+def _charColumn(line: str, byteColumn: int) -> int:
+	"""ast reports columns in UTF-8 bytes, tokenize in characters."""
+	return len(line.encode("utf-8")[:byteColumn].decode("utf-8"))
+
+
+def _isModule(name: str | None, package: str) -> bool:
+	return name is not None and (name == package or name.startswith(package + "."))
+
+
+class _ImportRenamer(ast.NodeTransformer):
+	"""What renameImports should produce, as a tree, to verify its output against."""
+
+	def __init__(self, old: str, new: str, renameNames: bool):
+		self.old, self.new, self.renameNames = old, new, renameNames
+
+	def _rename(self, name: str) -> str:
+		return self.new + name[len(self.old):]
+
+	def visit_Import(self, node: ast.Import):
+		for alias in node.names:
+			if _isModule(alias.name, self.old):
+				alias.name = self._rename(alias.name)
+		return node
+
+	def visit_ImportFrom(self, node: ast.ImportFrom):
+		if node.level == 0 and _isModule(node.module, self.old):
+			node.module = self._rename(node.module)
+		return node
+
+	def visit_Name(self, node: ast.Name):
+		if self.renameNames and node.id == self.old:
+			node.id = self.new
+		return node
+
+
+def _textAt(lines: list[str], start: tuple[int, int], length: int) -> str:
+	line, column = start
+	return lines[line - 1][column:column + length]
+
+
+def renameImports(source: str, old: str, new: str) -> str:
+	"""
+	Rewrites absolute imports of package old, and its submodules, to import
+	new instead. When a plain "import old..." binds the name old, uses of that
+	name are renamed too. Strings, comments and relative imports are left as
+	they are. Raises VendorError unless the result differs from source in
+	exactly those names.
+	"""
+	tree = ast.parse(source)
+	lines = source.splitlines(keepends=True)
+	# (line, character column) of each name to rename
+	positions: set[tuple[int, int]] = set()
+	fromStatements: set[tuple[int, int]] = set()
+	bindsOld = False
+	for node in ast.walk(tree):
+		if isinstance(node, ast.Import):
+			for alias in node.names:
+				if _isModule(alias.name, old):
+					positions.add((alias.lineno, _charColumn(lines[alias.lineno - 1], alias.col_offset)))
+					bindsOld = bindsOld or alias.asname is None
+		elif isinstance(node, ast.ImportFrom) and node.level == 0 and _isModule(node.module, old):
+			fromStatements.add((node.lineno, _charColumn(lines[node.lineno - 1], node.col_offset)))
+	if bindsOld:
+		for node in ast.walk(tree):
+			if isinstance(node, ast.Name) and node.id == old:
+				positions.add((node.lineno, _charColumn(lines[node.lineno - 1], node.col_offset)))
+
+	tokens = list(tokenize.generate_tokens(io.StringIO(source).readline))
+	for index, token in enumerate(tokens):
+		if token.type == tokenize.NAME and token.string == "from" and token.start in fromStatements:
+			# The module follows the keyword, possibly after a line continuation
+			module = next(t for t in tokens[index + 1:] if t.type == tokenize.NAME)
+			positions.add(module.start)
+	edits = [token.start for token in tokens if token.type == tokenize.NAME and token.start in positions]
+	if len(edits) != len(positions) or any(_textAt(lines, edit, len(old)) != old for edit in edits):
+		raise VendorError(f"Could not locate every import of {old}")
+	for line, column in sorted(edits, reverse=True):
+		text = lines[line - 1]
+		lines[line - 1] = text[:column] + new + text[column + len(old):]
+	rewritten = "".join(lines)
+
+	expected = _ImportRenamer(old, new, bindsOld).visit(ast.parse(source))
+	try:
+		actual = ast.parse(rewritten)
+	except SyntaxError as e:
+		raise VendorError(f"Renaming {old} produced invalid code: {e}") from None
+	if ast.dump(actual) != ast.dump(expected):
+		raise VendorError(f"Renaming {old} changed more than its imports")
+	for node in ast.walk(actual):
+		if isinstance(node, ast.Import) and any(_isModule(alias.name, old) for alias in node.names) or (
+			isinstance(node, ast.ImportFrom) and node.level == 0 and _isModule(node.module, old)
+		):
+			raise VendorError(f"An import of {old} is left after renaming it")
+	return rewritten
+
+
+def layoutPycaw(wheel: tuple[str, bytes], files: dict[str, bytes]):
+	"""Adds pycaw as avc_pycaw, with its imports of itself renamed."""
+	name, data = wheel
+	renamed = 0
+	with zipfile.ZipFile(io.BytesIO(data)) as archive:
+		for member in archive.namelist():
+			path = PurePosixPath(member)
+			if path.parts[0] != "pycaw" or member.endswith("/") or isExcluded(path):
+				continue
+			content = archive.read(member)
+			if path.suffix == ".py":
+				source = content.decode("utf-8")
+				rewritten = renameImports(source, "pycaw", PYCAW_NAME)
+				renamed += rewritten != source
+				content = rewritten.encode("utf-8")
+			files[PurePosixPath(PYCAW_NAME, *path.parts[1:]).as_posix()] = content
+	print(f"{name}: vendored as {PYCAW_NAME}, imports renamed in {renamed} modules")
+
+
+def syncLib(libDir: Path, files: dict[str, bytes]) -> tuple[int, int, int]:
+	"""
+	Makes the managed folders of libDir hold exactly files, writing only
+	those whose content changed. Returns the files written, unchanged and removed.
+	"""
+	written = unchanged = removed = 0
+	for relative, data in sorted(files.items()):
+		path = libDir / relative
+		try:
+			if sha256(path.read_bytes()) == sha256(data):
+				unchanged += 1
+				continue
+		except OSError:
+			pass
+		path.parent.mkdir(parents=True, exist_ok=True)
+		part = path.with_name(path.name + ".part")
+		part.write_bytes(data)
+		os.replace(part, path)
+		written += 1
+	for top in MANAGED_DIRS + OBSOLETE_DIRS:
+		root = libDir / top
+		if not root.is_dir():
+			continue
+		for path in sorted(root.rglob("*"), reverse=True):
+			if path.is_dir():
+				if not any(path.iterdir()):
+					path.rmdir()
+			elif path.relative_to(libDir).as_posix() not in files:
+				path.unlink()
+				removed += 1
+		if not any(root.iterdir()):
+			root.rmdir()
+	return written, unchanged, removed
+
+
+def run(offline: bool, sourceDir: Path | None, refresh: bool, cacheDir: Path, jobs: int) -> dict[str, bytes]:
+	cache = ArtifactCache(cacheDir)
+	artifacts = PSUTIL + list(PYTHON3_DLL.values()) + [PYCAW]
+	try:
+		resolved = resolveAll(artifacts, cache, offline, sourceDir, refresh, jobs)
+	finally:
+		cache.save({artifact.key for artifact in artifacts})
+	files: dict[str, bytes] = {}
+	layoutPsutil([resolved[artifact] for artifact in PSUTIL if resolved[artifact]], files)
+	layoutPython3Dll({arch: resolved[artifact] for arch, artifact in PYTHON3_DLL.items()}, files)
+	layoutPycaw(resolved[PYCAW], files)
+	written, unchanged, removed = syncLib(LIB_DIR, files)
+	print(f"{LIB_DIR.relative_to(REPO_ROOT)}: {written} written, {unchanged} unchanged, {removed} removed")
+	return files
+
+
+def main(argv: list[str] | None = None) -> int:
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument("--offline", action="store_true", help="Never use the network")
+	parser.add_argument("--from", dest="sourceDir", type=Path, help="Folder of wheels and archives to use first")
+	parser.add_argument("--refresh", action="store_true", help="Fetch everything again, ignoring the cache")
+	parser.add_argument("--cache", type=Path, default=CACHE_DIR, help="Cache folder (default: .vendorcache)")
+	parser.add_argument("--jobs", type=int, default=8, help="Artifacts fetched at once")
+	args = parser.parse_args(argv)
+	if args.offline and args.refresh:
+		parser.error("--refresh cannot be used with --offline")
+	try:
+		run(args.offline, args.sourceDir, args.refresh, args.cache, args.jobs)
+	except VendorError as e:
+		print(f"Error: {e}", file=sys.stderr)
+		return 1
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())